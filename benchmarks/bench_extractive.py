@@ -0,0 +1,63 @@
+"""
+Benchmark for the extractive pre-summarization pass
+
+Measures input tokens saved and latency per item on the bundled subtitle
+files (subtitulos_*.txt in the project root).
+
+Usage:
+    python benchmarks/bench_extractive.py [--budget 1200] [--repeat 20]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.extractive import estimate_tokens, extractive_summary, INPUT_TOKEN_BUDGET
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=int, default=INPUT_TOKEN_BUDGET)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--method', choices=['textrank', 'tfidf'], default='textrank')
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(project_root, 'subtitulos_*.txt')))
+    if not files:
+        print("No subtitle files found")
+        return 1
+
+    print(f"method={args.method} budget={args.budget} tokens repeat={args.repeat}")
+    print(f"{'file':<32}{'tokens in':>10}{'tokens out':>11}{'saved':>8}{'median ms':>11}")
+
+    total_in = total_out = 0
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            extract = extractive_summary(text, args.budget, args.method)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        tokens_in = estimate_tokens(text)
+        tokens_out = estimate_tokens(extract)
+        total_in += tokens_in
+        total_out += tokens_out
+        print(f"{os.path.basename(path):<32}{tokens_in:>10}{tokens_out:>11}"
+              f"{1 - tokens_out / tokens_in:>8.0%}{statistics.median(timings):>11.1f}")
+
+    print(f"{'total':<32}{total_in:>10}{total_out:>11}{1 - total_out / total_in:>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Benchmark and accuracy check for the generic content extractor
+
+Runs the text-density extractor on the saved article pages in
+benchmarks/fixtures/ and compares its output with the hand-checked body
+text next to each page (token F1), cold (no domain hint) and warm (with
+the hint learned on the first pass). The old generic fallback, paragraphs
+of the first <article> or <main> element, is measured alongside.
+
+Usage:
+    python benchmarks/bench_readability.py [--repeat 50] [--min-f1 0.9]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from bs4 import BeautifulSoup
+from src.readability import extract_main_text, HintCache
+from src.scraper import extract_paragraph_text
+
+FIXTURES = os.path.join(project_root, 'benchmarks', 'fixtures')
+
+
+def token_f1(predicted, expected):
+    """Bag-of-words F1 between extracted and expected text."""
+    pred = Counter(re.findall(r'\w+', predicted.lower()))
+    gold = Counter(re.findall(r'\w+', expected.lower()))
+    overlap = sum((pred & gold).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(pred.values())
+    recall = overlap / sum(gold.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def article_fallback(html):
+    """The previous generic fallback: paragraphs of <article> or <main>."""
+    soup = BeautifulSoup(html, 'html.parser')
+    container = soup.find('article') or soup.find('main')
+    return extract_paragraph_text(container) if container else ''
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--min-f1', type=float, default=0.9,
+                        help="Exit with status 1 if any warm extraction scores below this")
+    args = parser.parse_args()
+
+    pages = sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    if not pages:
+        print("No fixtures found")
+        return 1
+    with open(os.path.join(FIXTURES, 'urls.json'), encoding='utf-8') as f:
+        urls = json.load(f)
+
+    print(f"repeat={args.repeat}")
+    print(f"{'fixture':<16}{'cold F1':>9}{'warm F1':>9}{'old F1':>8}"
+          f"{'cold ms':>9}{'warm ms':>9}{'old ms':>8}  hint")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in pages:
+            name = os.path.splitext(os.path.basename(path))[0]
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            with open(os.path.splitext(path)[0] + '.txt', encoding='utf-8') as f:
+                expected = f.read()
+            url = urls.get(name, f"https://{name}.example/")
+
+            cache = HintCache(os.path.join(tmp, f"{name}.json"))
+            cold_text = extract_main_text(html, url, cache=cache)
+            _, cold_ms = timed(lambda: extract_main_text(
+                html, url, cache=HintCache(os.path.join(tmp, 'none.json'))), args.repeat)
+            warm_text, warm_ms = timed(lambda: extract_main_text(html, url, cache=cache), args.repeat)
+            old_text, old_ms = timed(lambda: article_fallback(html), args.repeat)
+
+            cold_f1 = token_f1(cold_text, expected)
+            warm_f1 = token_f1(warm_text, expected)
+            failed |= warm_f1 < args.min_f1
+            hint = cache.get(url.split('/')[2]) or '-'
+            print(f"{name:<16}{cold_f1:>9.3f}{warm_f1:>9.3f}{token_f1(old_text, expected):>8.3f}"
+                  f"{cold_ms:>9.2f}{warm_ms:>9.2f}{old_ms:>8.2f}  {hint}")
+
+    if failed:
+        print(f"FAILED: warm F1 below {args.min_f1}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,13 @@ Main entry point for AI News Scraper
 
 #!/usr/bin/env python3
 from dotenv import load_dotenv
+import argparse
 import os
 import sys
 import json 
 from src.process_all_news import process_all_news
+from src.job_queue import open_queue, JOB_QUEUE_URL
+from src.distributed import run_coordinator, run_worker
 from src.utils import setup_logging
 
 # Load environment variables from the .env file
@@ -24,6 +27,30 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
 
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="AI News Scraper")
+    parser.add_argument('target_date', nargs='?', default='2025-03-16',
+                        help='Last day of the week to process (YYYY-MM-DD)')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='Resume a failed run from its last completed stage')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--coordinator', action='store_true',
+                      help='Split the run into jobs on the job queue and wait for workers '
+                           '(--resume continues a queued run)')
+    mode.add_argument('--worker', action='store_true',
+                      help='Execute jobs from the job queue until interrupted')
+    mode.add_argument('--daemon', action='store_true',
+                      help='Stay running: poll sources continuously and send the weekly report on schedule')
+    parser.add_argument('--queue', default=JOB_QUEUE_URL,
+                        help='Job queue URL: sqlite:///path, redis://host:port/db or memory://')
+    parser.add_argument('--kinds', type=lambda v: v.split(','),
+                        help='Comma-separated job kinds a worker accepts (default: all)')
+    parser.add_argument('--local-work', action='store_true',
+                        help='Let the coordinator execute jobs too')
+    return parser.parse_args(argv)
+
+
 def main():
     """Main function to run the AI News Scraper"""
     # Setup logging
@@ -32,14 +59,24 @@ def main():
     try:
         logger.info("Starting AI News Scraper")
         
-        # Check for command line args (target date)
-        target_date = '2025-03-16'
-        if len(sys.argv) > 1:
-            target_date = sys.argv[1]
-            logger.info(f"Target date provided: {target_date}")
+        # Check for command line args (target date, resume)
+        args = parse_args()
+        if args.resume:
+            logger.info(f"Resuming run: {args.resume}")
+        else:
+            logger.info(f"Target date: {args.target_date}")
             
         # Process news
-        process_all_news(RECIPIENT_EMAIL, target_date)
+        if args.daemon:
+            from src.daemon import run_daemon
+            run_daemon(RECIPIENT_EMAIL)
+        elif args.worker:
+            run_worker(open_queue(args.queue), kinds=args.kinds)
+        elif args.coordinator:
+            run_coordinator(open_queue(args.queue), RECIPIENT_EMAIL, args.target_date,
+                            run_id=args.resume, work=args.local_work)
+        else:
+            process_all_news(RECIPIENT_EMAIL, args.target_date, resume_run_id=args.resume)
         
         logger.info("AI News Scraper completed successfully")
         return 0
@@ -11,26 +11,88 @@ from .scraper import (
     scrape_mit_articles, 
     get_mit_article_content, 
     scrape_stanford_articles, 
-    get_stanford_article_content
+    get_stanford_article_content,
+    scrape_source,
+    get_source_content
 )
-from .summarizer import summarize_with_openai
+from .async_fetcher import AsyncFetcher, fetch_contents_async
+from .sources import SourceSpec, ListingRule, JsonListing, SOURCES
+from .models import Article, Transcript, TranscriptSegment
+from .checkpoint import RunCheckpoint
+from .run_budget import RunBudget, priority
+from .job_queue import open_queue, SQLiteQueue, MemoryQueue, RedisQueue
+from .distributed import run_coordinator, run_worker
+from .politeness import HostScheduler, scheduler, CircuitOpenError
+from .streaming import stream_html, DownloadRejected
+from .readability import extract_main_text
+from .embedded_state import find_attribute_json, find_script_json
+from .feeds import discover_articles, parse_feed
+from .archive import append_to_archive, read_archive
+from .raw_archive import RawArchive, archive_raw, reextract_articles
+from .search_index import index_articles, search, load_articles
+from .report_site import update_site, build_site, week_page
+from .dedup import collapse_duplicates, find_duplicate_groups
+from .relevance import filter_relevant, score_texts
+from .summarizer import summarize_with_openai, summarize_texts, get_backend, SummarizerBackend
+from .extractive import extractive_summary
+from .openai_batch import summarize_with_batch_api, MockBatchClient
 from .email_sender import send_combined_email_report
 from .utils import parse_article_date, safe_str, setup_http_session
 from .youtube_scraper import (
     build_youtube_client,
+    get_youtube_client,
     get_channel_id,
     get_recent_videos,
+    annotate_videos,
+    screen_videos,
     download_subtitles,
     get_video_transcript,
+    fetch_transcript,
     process_youtube_channels
 )
 
 __all__ = [
+    'Article',
+    'Transcript',
+    'TranscriptSegment',
+    'RunCheckpoint',
+    'RunBudget',
+    'priority',
+    'open_queue',
+    'SQLiteQueue',
+    'MemoryQueue',
+    'RedisQueue',
+    'run_coordinator',
+    'run_worker',
     'send_combined_email_report',
     'summarize_with_openai',
+    'summarize_texts',
+    'get_backend',
+    'SummarizerBackend',
+    'extractive_summary',
+    'summarize_with_batch_api',
+    'MockBatchClient',
     'parse_article_date',
     'safe_str',
     'setup_http_session',
+    'HostScheduler',
+    'scheduler',
+    'CircuitOpenError',
+    'append_to_archive',
+    'read_archive',
+    'RawArchive',
+    'archive_raw',
+    'reextract_articles',
+    'index_articles',
+    'search',
+    'load_articles',
+    'update_site',
+    'build_site',
+    'week_page',
+    'collapse_duplicates',
+    'find_duplicate_groups',
+    'filter_relevant',
+    'score_texts',
     
     # Web scrapers
     'scrape_articles_AI_news',
@@ -39,12 +101,31 @@ __all__ = [
     'get_mit_article_content',
     'scrape_stanford_articles',
     'get_stanford_article_content',
+    'scrape_source',
+    'get_source_content',
+    'AsyncFetcher',
+    'fetch_contents_async',
+    'stream_html',
+    'DownloadRejected',
+    'extract_main_text',
+    'SourceSpec',
+    'ListingRule',
+    'JsonListing',
+    'SOURCES',
+    'find_attribute_json',
+    'find_script_json',
+    'discover_articles',
+    'parse_feed',
     
     # YouTube scraper
     'build_youtube_client',
+    'get_youtube_client',
     'get_channel_id',
     'get_recent_videos',
+    'annotate_videos',
+    'screen_videos',
     'download_subtitles',
     'get_video_transcript',
+    'fetch_transcript',
     'process_youtube_channels'
 ]
\ No newline at end of file
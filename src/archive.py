@@ -0,0 +1,138 @@
+"""
+Columnar Parquet archive of processed articles
+Each run is appended to a dataset partitioned by week and source, so
+historical queries only touch the partitions and columns they need
+"""
+
+import logging
+from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.archive')
+
+ARCHIVE_DIR = "data/archive"
+
+ARCHIVE_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('link', pa.string()),
+    ('date', pa.date32()),
+    ('summary', pa.string()),
+    ('language', pa.string()),
+    ('content', pa.string()),
+    ('week', pa.string()),
+    ('source', pa.string()),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('week', pa.string()), ('source', pa.string())]),
+    flavor='hive'
+)
+
+
+def week_start(day):
+    """
+    Returns the Monday of the week containing ``day`` as YYYY-MM-DD.
+
+    Args:
+        day (date): Any date
+
+    Returns:
+        str: ISO date of the week's Monday
+    """
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def append_to_archive(articles, root=ARCHIVE_DIR):
+    """
+    Appends articles to the partitioned Parquet archive.
+
+    Each call writes new files (one per week/source partition) named after
+    the run timestamp, so earlier runs are never rewritten.
+
+    Args:
+        articles (list[Article]): Articles to archive
+        root (str): Root directory of the dataset
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = [a for a in articles if a.date]
+    if len(rows) < len(articles):
+        logger.warning(f"Skipping {len(articles) - len(rows)} articles without a date")
+    if not rows:
+        return 0
+
+    table = pa.table({
+        'title': [a.title for a in rows],
+        'link': [a.link for a in rows],
+        'date': [a.date for a in rows],
+        'summary': [a.summary for a in rows],
+        'language': [a.language for a in rows],
+        'content': [a.content for a in rows],
+        'week': [week_start(a.date) for a in rows],
+        'source': [a.source for a in rows],
+    }, schema=ARCHIVE_SCHEMA)
+
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    ds.write_dataset(
+        table,
+        root,
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template=f"run_{run_stamp}_{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    logger.info(f"Archived {len(rows)} articles to {root}")
+    return len(rows)
+
+
+def read_archive(columns=None, start_date=None, end_date=None, sources=None,
+                 root=ARCHIVE_DIR, dedupe=True):
+    """
+    Loads articles from the archive, reading only the requested data.
+
+    Date bounds are applied both to the ``week`` partition key (whole
+    directories are skipped) and to the ``date`` column (row groups are
+    skipped using Parquet statistics).
+
+    Args:
+        columns (list, optional): Columns to load (default: all but content)
+        start_date (date, optional): Earliest article date, inclusive
+        end_date (date, optional): Latest article date, inclusive
+        sources (list, optional): Only load these sources
+        root (str): Root directory of the dataset
+        dedupe (bool): Keep only the latest copy of each link across runs
+
+    Returns:
+        DataFrame: Matching articles
+    """
+    if columns is None:
+        columns = [name for name in ARCHIVE_SCHEMA.names if name != 'content']
+
+    dataset = ds.dataset(root, format='parquet', partitioning=PARTITIONING,
+                         schema=ARCHIVE_SCHEMA)
+
+    conditions = []
+    if start_date:
+        conditions.append(ds.field('week') >= week_start(start_date))
+        conditions.append(ds.field('date') >= pa.scalar(start_date, pa.date32()))
+    if end_date:
+        conditions.append(ds.field('week') <= week_start(end_date))
+        conditions.append(ds.field('date') <= pa.scalar(end_date, pa.date32()))
+    if sources:
+        conditions.append(ds.field('source').isin(list(sources)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    load_columns = list(columns)
+    if dedupe and 'link' not in load_columns:
+        load_columns.append('link')
+
+    df = dataset.to_table(columns=load_columns, filter=expression).to_pandas()
+    if dedupe:
+        df = df.drop_duplicates(subset='link', keep='last')[list(columns)]
+    return df.reset_index(drop=True)
@@ -0,0 +1,265 @@
+"""
+Asyncio-native fetch layer
+Fetches listing and article pages with a shared httpx.AsyncClient
+(HTTP/2 when the h2 package is installed), so hundreds of article
+downloads can run concurrently on a single thread
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+import httpx
+from .scraper import (DEFAULT_HEADERS, parse_listing, extract_content, content_stop_selector,
+                      refetch_full_page, scrape_source)
+from .sources import AI_NEWS, MIT_NEWS, STANFORD_NEWS
+from .politeness import scheduler, parse_retry_after, CircuitOpenError
+from .utils import CONNECT_TIMEOUT, READ_TIMEOUT
+from .streaming import BoundedReader, check_content_type, CHUNK_SIZE, MAX_CONTENT_BYTES
+from .raw_archive import archive_raw
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.async_fetcher')
+
+# Upper bound on simultaneous requests across all hosts
+MAX_CONCURRENCY = 200
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+class AsyncFetcher:
+    """
+    Shared connection pool for async page downloads.
+
+    Use as an async context manager:
+
+        async with AsyncFetcher() as fetcher:
+            articles = await fetcher.scrape_source(MIT_NEWS)
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY,
+                 timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency,
+                                max_keepalive_connections=max_concurrency // 4)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def fetch_page(self, url):
+        """
+        Downloads a page, gated by the per-host scheduler.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            bytes: Raw response body
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses
+        """
+        # Host slot first: tasks waiting on a slow host must not hold global permits
+        async with scheduler.async_slot(url) as slot, self._semaphore:
+            response = await self._client.get(url)
+            slot.record(response.status_code,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After')))
+            response.raise_for_status()
+            return response.content
+
+    async def stream_html(self, url, stop_after=None, max_bytes=MAX_CONTENT_BYTES):
+        """
+        Streams an HTML page with a size cap (see ``streaming.stream_html``).
+
+        Returns:
+            str: Decoded (possibly partial) page
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses
+            DownloadRejected: If the response is not HTML
+        """
+        async with scheduler.async_slot(url) as slot, self._semaphore:
+            async with self._client.stream('GET', url) as response:
+                slot.record(response.status_code,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After')))
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type')
+                check_content_type(content_type)
+                reader = BoundedReader(content_type, max_bytes, stop_after)
+                try:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        if reader.feed(chunk):
+                            break
+                except httpx.TransportError:
+                    # Failed mid-body: not a success despite the 2xx status
+                    slot.error = True
+                    raise
+        return reader.text(url)
+
+    async def scrape_source(self, spec, url=None, since=None):
+        """
+        Async counterpart of ``scraper.scrape_source``.
+
+        Feed discovery (small, conditional requests) runs in a worker thread;
+        HTML listings are fetched on the event loop.
+
+        Returns:
+            list[Article]: Articles found for the source
+        """
+        if url is None and (spec.feed_url or spec.sitemap_url):
+            return await asyncio.to_thread(scrape_source, spec, None, since)
+        try:
+            return parse_listing(spec, await self.fetch_page(url or spec.url))
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            logger.error(f"Request error scraping {spec.name}: {e}")
+            return []
+
+    async def get_source_content(self, spec, url):
+        """
+        Async counterpart of ``scraper.get_source_content``.
+
+        Returns:
+            str: Extracted article content or empty string if extraction fails
+        """
+        try:
+            stop_after = content_stop_selector(spec, url)
+            page = await self.stream_html(url, stop_after)
+            # Parsing and zstd archiving are CPU work: keep them off the event loop
+            content = await asyncio.to_thread(extract_content, spec, page, url)
+            if not content and refetch_full_page(spec, url, stop_after):
+                page = await self.stream_html(url)
+                content = await asyncio.to_thread(extract_content, spec, page, url)
+            await asyncio.to_thread(archive_raw, spec.name, url, page)
+            return content
+        except Exception as e:
+            logger.error(f"Error fetching {spec.name} article content: {e}")
+            return ""
+
+
+async def fetch_contents_async(jobs, on_result=None, max_concurrency=MAX_CONCURRENCY,
+                               deadlines=None, fetcher=None):
+    """
+    Fetches many articles concurrently over one connection pool.
+
+    Args:
+        jobs (list[tuple]): (SourceSpec, url) pairs
+        on_result (callable, optional): Called as ``on_result(index, content)``
+            as each download finishes
+        max_concurrency (int): Maximum simultaneous requests
+        deadlines (dict, optional): ``time.monotonic()`` deadline per source
+            name; downloads still pending at their source's deadline are
+            abandoned
+        fetcher (AsyncFetcher, optional): Open fetcher to reuse; a new one
+            is created (and closed) otherwise
+
+    Returns:
+        list[str]: Content per job, in input order (None if abandoned)
+    """
+    if fetcher is None:
+        async with AsyncFetcher(max_concurrency) as fetcher:
+            return await fetch_contents_async(jobs, on_result, max_concurrency, deadlines, fetcher)
+
+    async def run(index, spec, url):
+        timeout = None
+        if deadlines and spec.name in deadlines:
+            timeout = deadlines[spec.name] - time.monotonic()
+            if timeout <= 0:
+                return None
+        try:
+            content = await asyncio.wait_for(fetcher.get_source_content(spec, url), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if on_result:
+            on_result(index, content)
+        return content
+
+    return await asyncio.gather(*(run(i, spec, url) for i, (spec, url) in enumerate(jobs)))
+
+
+def fetch_contents_sync(jobs, on_result=None, max_concurrency=MAX_CONCURRENCY, deadlines=None):
+    """
+    Synchronous wrapper around ``fetch_contents_async`` for non-async callers.
+
+    Args:
+        jobs (list[tuple]): (SourceSpec, url) pairs
+        on_result (callable, optional): Called as ``on_result(index, content)``
+        max_concurrency (int): Maximum simultaneous requests
+        deadlines (dict, optional): ``time.monotonic()`` deadline per source name
+
+    Returns:
+        list[str]: Content per job, in input order (None if abandoned)
+    """
+    return asyncio.run(fetch_contents_async(jobs, on_result, max_concurrency, deadlines))
+
+
+class PersistentFetcher:
+    """
+    Synchronous front end to one AsyncFetcher and one event loop kept open
+    between calls, so a long-running process (the daemon) reuses its
+    connection pools instead of opening new ones for every batch.
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY):
+        self._runner = asyncio.Runner()
+        self._fetcher = self._runner.run(self._open(max_concurrency))
+
+    @staticmethod
+    async def _open(max_concurrency):
+        # Created inside the runner's loop, which its client is bound to
+        return AsyncFetcher(max_concurrency)
+
+    def fetch_contents(self, jobs, on_result=None, deadlines=None):
+        """
+        Same as ``fetch_contents_sync``, over the persistent connection pool.
+
+        Returns:
+            list[str]: Content per job, in input order (None if abandoned)
+        """
+        return self._runner.run(fetch_contents_async(jobs, on_result, deadlines=deadlines,
+                                                     fetcher=self._fetcher))
+
+    def close(self):
+        self._runner.run(self._fetcher.aclose())
+        self._runner.close()
+
+
+async def scrape_articles_AI_news_async(url, fetcher):
+    """Async variant of ``scrape_articles_AI_news``."""
+    return await fetcher.scrape_source(AI_NEWS, url)
+
+
+async def get_article_content_async(url, fetcher):
+    """Async variant of ``get_article_content``."""
+    return await fetcher.get_source_content(AI_NEWS, url)
+
+
+async def scrape_mit_articles_async(url, fetcher):
+    """Async variant of ``scrape_mit_articles``."""
+    return await fetcher.scrape_source(MIT_NEWS, url)
+
+
+async def get_mit_article_content_async(url, fetcher):
+    """Async variant of ``get_mit_article_content``."""
+    return await fetcher.get_source_content(MIT_NEWS, url)
+
+
+async def scrape_stanford_articles_async(url, fetcher):
+    """Async variant of ``scrape_stanford_articles``."""
+    return await fetcher.scrape_source(STANFORD_NEWS, url)
+
+
+async def get_stanford_article_content_async(url, fetcher):
+    """Async variant of ``get_stanford_article_content``."""
+    return await fetcher.get_source_content(STANFORD_NEWS, url)
@@ -0,0 +1,161 @@
+"""
+Run checkpointing for resumable processing
+Persists the output of each pipeline stage (and of each finished item
+within a stage) under data/runs/<run_id>/ so a failed run can continue
+where it stopped
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from .models import Article
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.checkpoint')
+
+RUNS_DIR = "data/runs"
+
+# Pipeline stages, in execution order
+STAGES = ['discovery', 'fetch', 'summarize', 'render', 'email']
+
+
+class RunCheckpoint:
+    """
+    Stage and item checkpoints for one run.
+
+    Layout of the run directory:
+        manifest.json         run parameters and completed stages
+        <stage>.json          articles produced by a completed stage
+        <stage>.items.jsonl   per-item results appended as they finish
+    """
+
+    def __init__(self, run_id, root=RUNS_DIR):
+        self.run_id = run_id
+        self.directory = os.path.join(root, run_id)
+        self._manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.manifest = {}
+        self._items_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, params, root=RUNS_DIR):
+        """
+        Starts a new run.
+
+        Args:
+            params (dict): Run parameters to restore on resume (e.g. target date)
+            root (str): Directory holding all runs
+
+        Returns:
+            RunCheckpoint: Checkpoint for the new run
+        """
+        # The random suffix keeps runs started in the same second apart
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        checkpoint = cls(run_id, root)
+        os.makedirs(root, exist_ok=True)
+        os.makedirs(checkpoint.directory)
+        checkpoint.manifest = {
+            'run_id': run_id,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'params': params,
+            'completed_stages': [],
+        }
+        checkpoint._save_manifest()
+        logger.info(f"Started run {run_id} (resume with --resume {run_id})")
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id, root=RUNS_DIR):
+        """
+        Opens an existing run for resuming.
+
+        Args:
+            run_id (str): Identifier printed when the run started
+            root (str): Directory holding all runs
+
+        Returns:
+            RunCheckpoint: Checkpoint with its manifest loaded
+        """
+        checkpoint = cls(run_id, root)
+        if not os.path.exists(checkpoint._manifest_path):
+            raise ValueError(f"No checkpoint found for run {run_id}")
+        with open(checkpoint._manifest_path, encoding='utf-8') as f:
+            checkpoint.manifest = json.load(f)
+        logger.info(f"Resuming run {run_id}; completed stages: "
+                    f"{', '.join(checkpoint.manifest['completed_stages']) or 'none'}")
+        return checkpoint
+
+    @property
+    def params(self):
+        return self.manifest.get('params', {})
+
+    def _save_manifest(self):
+        # Write-then-rename so a crash never leaves a truncated manifest
+        tmp_path = self._manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+    def is_done(self, stage):
+        return stage in self.manifest['completed_stages']
+
+    def mark_done(self, stage, articles=None):
+        """
+        Records a stage as completed, saving the articles it produced.
+
+        Args:
+            stage (str): One of STAGES
+            articles (list[Article], optional): Stage output to persist
+        """
+        if articles is not None:
+            path = os.path.join(self.directory, f"{stage}.json")
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump([a.to_dict() for a in articles], f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        if stage not in self.manifest['completed_stages']:
+            self.manifest['completed_stages'].append(stage)
+        self._save_manifest()
+        logger.info(f"Run {self.run_id}: stage '{stage}' completed")
+
+    def load_articles(self, stage):
+        """
+        Returns:
+            list[Article]: Articles saved by a completed stage
+        """
+        with open(os.path.join(self.directory, f"{stage}.json"), encoding='utf-8') as f:
+            return [Article.from_dict(d) for d in json.load(f)]
+
+    def record_item(self, stage, key, value):
+        """
+        Appends one finished item of a stage (e.g. an article's summary).
+
+        Args:
+            stage (str): Stage the item belongs to
+            key (str): Item identifier, typically the article link
+            value: JSON-serializable result
+        """
+        path = os.path.join(self.directory, f"{stage}.items.jsonl")
+        line = json.dumps({'key': key, 'value': value}, ensure_ascii=False) + '\n'
+        with self._items_lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def completed_items(self, stage):
+        """
+        Returns:
+            dict: Results recorded with ``record_item``, keyed by item
+        """
+        path = os.path.join(self.directory, f"{stage}.items.jsonl")
+        items = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Last line may be cut short by a crash
+                        continue
+                    items[entry['key']] = entry['value']
+        return items
@@ -0,0 +1,233 @@
+"""
+Long-running daemon mode
+Keeps one process alive with warm HTTP connection pools, the YouTube API
+client, robots.txt and feed caches, and polls every source on a fixed
+cadence. New items are fetched, summarized and stored in the search index
+as they appear, so the weekly report only renders what is already there
+
+Usage:
+    python main.py --daemon
+"""
+
+import logging
+import os
+from datetime import date, timedelta
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
+from .sources import SOURCES
+from .dedup import collapse_duplicates
+from .search_index import index_articles, load_articles
+from .relevance import filter_relevant
+from .email_sender import send_combined_email_report, report_url_for
+from .report_site import week_page
+from .youtube_scraper import (get_youtube_client, get_channel_id, get_recent_videos, screen_videos,
+                              get_video_transcript)
+from .process_all_news import discover_source, fetch_contents, summarize_articles, render_outputs, week_range
+from config.config import YOUTUBE_API_KEY, YOUTUBE_CHANNELS
+try:
+    from .async_fetcher import PersistentFetcher
+except ImportError:  # httpx not installed: polls use the threaded fetcher
+    PersistentFetcher = None
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.daemon')
+
+# Minutes between source polls
+POLL_MINUTES = int(os.getenv('DAEMON_POLL_MINUTES', '60'))
+
+# When the weekly report is rendered and emailed (cron day-of-week and hour)
+REPORT_DAY = os.getenv('DAEMON_REPORT_DAY', 'sun')
+REPORT_HOUR = int(os.getenv('DAEMON_REPORT_HOUR', '8'))
+
+# How far back each poll looks for items
+LOOKBACK_DAYS = 7
+
+# Polls a video's transcript is attempted in before it is given up on
+TRANSCRIPT_MAX_ATTEMPTS = 3
+
+
+class NewsDaemon:
+    """
+    Incremental ingestion state kept in memory between polls.
+
+    ``seen`` holds the links already stored (or given up on), so each poll
+    only fetches and summarizes new items; channel ids are resolved once
+    per channel. Article downloads go through one persistent connection
+    pool when httpx is available.
+    """
+
+    def __init__(self, recipients):
+        self.recipients = recipients
+        self.seen = set()
+        self.channel_ids = {}
+        self.transcript_attempts = {}
+        self.fetcher = None
+
+    def load_seen(self):
+        """Restores the set of stored links after a restart."""
+        since = date.today() - timedelta(days=LOOKBACK_DAYS + 1)
+        self.seen = {a.link for a in load_articles(since) if a.content}
+        logger.info(f"Loaded {len(self.seen)} already ingested items")
+
+    def _new_videos(self, since):
+        """
+        Lists recent videos of every channel and fetches transcripts of
+        unseen ones that pass the relevance and duration/live screens.
+        """
+        if not (YOUTUBE_API_KEY and YOUTUBE_CHANNELS):
+            return []
+        youtube = get_youtube_client(YOUTUBE_API_KEY)
+        candidates = []
+        for channel in YOUTUBE_CHANNELS:
+            try:
+                if channel not in self.channel_ids:
+                    self.channel_ids[channel] = get_channel_id(youtube, channel)
+                if not self.channel_ids[channel]:
+                    continue
+                recent = [v for v in get_recent_videos(youtube, self.channel_ids[channel], 10)
+                          if v.link not in self.seen and v.date and v.date >= since]
+                for video in filter_relevant(recent):
+                    video.source = channel
+                    candidates.append(video)
+            except Exception as e:
+                logger.error(f"Error polling channel {channel}: {e}")
+
+        videos = []
+        for video in screen_videos(youtube, candidates):
+            try:
+                full_text, language = get_video_transcript(video.video_id)
+            except Exception as e:
+                logger.error(f"Error getting transcript for {video.video_id}: {e}")
+                full_text, language = None, None
+            if full_text:
+                video.content = full_text
+                video.language = language
+                videos.append(video)
+                self.transcript_attempts.pop(video.link, None)
+                continue
+            # Retried on later polls, up to TRANSCRIPT_MAX_ATTEMPTS in total
+            attempts = self.transcript_attempts.get(video.link, 0) + 1
+            self.transcript_attempts[video.link] = attempts
+            if attempts >= TRANSCRIPT_MAX_ATTEMPTS:
+                logger.warning(f"Giving up on transcript for {video.video_id} after {attempts} attempts")
+                self.seen.add(video.link)
+                del self.transcript_attempts[video.link]
+        return videos
+
+    def _summarize_stories(self, items, since, today):
+        """
+        Summarizes each new story once. New items are grouped with each
+        other and with the items already stored for the window; an item
+        whose story is already summarized reuses that summary, otherwise
+        one summary is made per group and shared by its members.
+        """
+        new_links = {a.link for a in items}
+        stored = [a for a in load_articles(since, today) if a.summary and a.link not in new_links]
+        try:
+            stories = collapse_duplicates(items + stored)
+        except Exception as e:
+            logger.error(f"Error collapsing duplicate articles: {e}")
+            stories = items
+
+        to_summarize = []
+        for story in stories:
+            members = [story] + story.duplicates
+            if not any(m.link in new_links for m in members):
+                continue
+            done = next((m for m in members if m.link not in new_links), None)
+            if done:
+                for member in members:
+                    if member.link in new_links:
+                        member.summary = done.summary
+            else:
+                to_summarize.append(story)
+
+        reused = len(items) - sum(1 + len(s.duplicates) for s in to_summarize)
+        if reused:
+            logger.info(f"{reused} new items reuse the summary of an already stored story")
+        summarize_articles(to_summarize)
+        for story in to_summarize:
+            for duplicate in story.duplicates:
+                duplicate.summary = story.summary
+
+    def poll(self):
+        """
+        Ingests items published since the last poll.
+
+        Returns:
+            int: Number of new items stored
+        """
+        today = date.today()
+        since = today - timedelta(days=LOOKBACK_DAYS)
+        new_articles = []
+        for spec in SOURCES:
+            try:
+                new_articles += [a for a in discover_source(spec, since, today)
+                                 if a.link not in self.seen]
+            except Exception as e:
+                logger.error(f"Error polling {spec.name}: {e}")
+
+        fetch_contents(new_articles, fetcher=self.fetcher)
+        # Pages that failed to download are retried on the next poll
+        items = [a for a in new_articles if a.content] + self._new_videos(since)
+        if not items:
+            logger.info("Poll finished: no new items")
+            return 0
+
+        self._summarize_stories(items, since, today)
+        index_articles(items)
+        self.seen.update(a.link for a in items)
+        logger.info(f"Poll finished: {len(items)} new items ingested")
+        return len(items)
+
+    def send_weekly_report(self, target_date=None):
+        """Renders the week's report from stored items and emails it."""
+        start_date, end_date, date_str = week_range(target_date)
+        articles = load_articles(start_date, end_date)
+        if not articles:
+            logger.info(f"No articles found for date range: {date_str}")
+            return
+        try:
+            articles = collapse_duplicates(articles)
+        except Exception as e:
+            logger.error(f"Error collapsing duplicate articles: {e}")
+        render_outputs(articles, date_str, end_date)
+        report_url = report_url_for(week_page(end_date))
+        send_combined_email_report(articles, date_str, self.recipients, report_url)
+        logger.info(f"Weekly report for {date_str} sent ({len(articles)} articles)")
+
+
+def run_daemon(recipients):
+    """
+    Polls sources every POLL_MINUTES and sends the weekly report on
+    REPORT_DAY at REPORT_HOUR, until interrupted.
+
+    Args:
+        recipients (str or list): Email recipient(s)
+    """
+    daemon = NewsDaemon(recipients)
+    if PersistentFetcher is not None:
+        daemon.fetcher = PersistentFetcher()
+    daemon.load_seen()
+    # Like the scheduled polls, a failed first poll is logged, not fatal
+    try:
+        daemon.poll()
+    except Exception:
+        logger.exception("Initial poll failed")
+
+    scheduler = BlockingScheduler()
+    # A slow poll is never run twice at once; missed runs are merged
+    scheduler.add_job(daemon.poll, 'interval', minutes=POLL_MINUTES,
+                      max_instances=1, coalesce=True, id='poll')
+    scheduler.add_job(daemon.send_weekly_report,
+                      CronTrigger(day_of_week=REPORT_DAY, hour=REPORT_HOUR),
+                      max_instances=1, coalesce=True, misfire_grace_time=3600, id='report')
+    logger.info(f"Daemon started: polling every {POLL_MINUTES} min, "
+                f"report on {REPORT_DAY} at {REPORT_HOUR}:00")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Daemon stopped")
+    finally:
+        if daemon.fetcher is not None:
+            daemon.fetcher.close()
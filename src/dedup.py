@@ -0,0 +1,153 @@
+"""
+Near-duplicate story detection across sources
+Uses word shingles, MinHash signatures and LSH banding so candidate pairs
+are found without comparing every article against every other one
+"""
+
+import logging
+import re
+import zlib
+import numpy as np
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.dedup')
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingle_hashes(text, k=5):
+    """
+    Hashes the word k-shingles of a text.
+
+    Args:
+        text (str): Text to shingle
+        k (int): Number of words per shingle
+
+    Returns:
+        numpy.ndarray: Unique 32-bit shingle hashes
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < k:
+        words = words + [''] * (k - len(words))
+    hashes = {
+        zlib.crc32(' '.join(words[i:i + k]).encode('utf-8'))
+        for i in range(len(words) - k + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with universal hashing, vectorized over
+    all permutations at once.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        """
+        Args:
+            hashes (numpy.ndarray): Shingle hashes from ``shingle_hashes``
+
+        Returns:
+            numpy.ndarray: MinHash signature of length ``num_perm``
+        """
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        values = hashes % _MERSENNE_PRIME
+        permuted = (np.outer(self._a, values) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+def _lsh_candidates(signatures, bands):
+    """Yields index pairs that share at least one LSH band bucket."""
+    rows = signatures.shape[1] // bands
+    seen = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, chunk)):
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pair = (members[x], members[y])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+
+def find_duplicate_groups(texts, threshold=0.5, num_perm=128, bands=32, k=5):
+    """
+    Groups texts whose estimated Jaccard similarity reaches the threshold.
+
+    Args:
+        texts (list[str]): Texts to compare
+        threshold (float): Minimum estimated Jaccard similarity
+        num_perm (int): MinHash signature length
+        bands (int): Number of LSH bands (must divide ``num_perm``)
+        k (int): Words per shingle
+
+    Returns:
+        list[list[int]]: Groups of indices into ``texts``, singletons included
+    """
+    if not texts:
+        return []
+
+    hasher = MinHasher(num_perm)
+    signatures = np.vstack([hasher.signature(shingle_hashes(t, k)) for t in texts])
+
+    # Union-find over verified candidate pairs
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in _lsh_candidates(signatures, bands):
+        similarity = np.mean(signatures[i] == signatures[j])
+        if similarity >= threshold:
+            parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def collapse_duplicates(articles, threshold=0.5):
+    """
+    Collapses near-duplicate articles into a single entry.
+
+    The article with the longest content represents each group; the others
+    are attached to it as ``duplicates`` so reports can list every link
+    while the story is summarized only once.
+
+    Args:
+        articles (list[Article]): Articles with content already fetched
+        threshold (float): Minimum estimated Jaccard similarity
+
+    Returns:
+        list[Article]: One article per story, in original order
+    """
+    texts = [a.content or a.title for a in articles]
+    groups = find_duplicate_groups(texts, threshold)
+
+    representatives = []
+    for group in sorted(groups, key=min):
+        members = [articles[i] for i in group]
+        primary = max(members, key=lambda a: len(a.content))
+        primary.duplicates = [a for a in members if a is not primary]
+        representatives.append(primary)
+
+    collapsed = len(articles) - len(representatives)
+    if collapsed:
+        logger.info(f"Collapsed {collapsed} near-duplicate articles into {len(representatives)} stories")
+    return representatives
@@ -0,0 +1,254 @@
+"""
+Distributed run mode
+A coordinator splits a run into discovery, fetch, transcript and summarize
+jobs on the durable job queue (see src.job_queue); any number of worker
+processes, on this or other machines, execute them. The CSV/HTML/email
+steps run last as a single aggregation job
+
+Usage:
+    python main.py 2025-03-16 --coordinator      # enqueue and wait
+    python main.py --worker                      # run in as many processes as needed
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import date
+from .models import Article
+from .sources import SOURCES
+from .scraper import get_source_content
+from .dedup import collapse_duplicates
+from .relevance import filter_relevant
+from .summarizer import summarize_texts
+from .email_sender import send_combined_email_report, report_url_for
+from .report_site import week_page
+from .youtube_scraper import (get_youtube_client, get_channel_id, get_recent_videos, screen_videos,
+                              get_video_transcript)
+from .process_all_news import discover_source, render_outputs, week_range, SUMMARIZE_CHUNK
+from .job_queue import LEASE_SECONDS, QUEUED, LEASED, FAILED
+from config.config import YOUTUBE_API_KEY, YOUTUBE_CHANNELS
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.distributed')
+
+# Seconds between queue polls of idle workers and the coordinator
+POLL_INTERVAL = 2
+
+# Videos listed per YouTube channel
+YOUTUBE_MAX_VIDEOS = 10
+
+_SPECS = {spec.name: spec for spec in SOURCES}
+
+
+def _handle_discover(queue, job):
+    """Scrapes one source listing and enqueues a fetch job per article."""
+    spec = _SPECS[job.payload['source']]
+    articles = discover_source(spec, date.fromisoformat(job.payload['start']),
+                               date.fromisoformat(job.payload['end']))
+    for article in articles:
+        queue.enqueue(job.run_id, 'fetch', article.link, {'article': article.to_dict()})
+    return {'articles': len(articles)}
+
+
+def _handle_fetch(queue, job):
+    """Downloads one article's content."""
+    article = Article.from_dict(job.payload['article'])
+    article.content = get_source_content(_SPECS[article.source], article.link) or ''
+    return article.to_dict()
+
+
+def _handle_youtube(queue, job):
+    """Lists one channel's recent videos and enqueues a transcript job per video."""
+    youtube = get_youtube_client(YOUTUBE_API_KEY)
+    channel = job.payload['channel']
+    channel_id = get_channel_id(youtube, channel)
+    if not channel_id:
+        logger.warning(f"Channel not found: {channel}")
+        return {'videos': 0}
+    videos = filter_relevant(get_recent_videos(youtube, channel_id, YOUTUBE_MAX_VIDEOS))
+    # Live streams, shorts etc. never get a transcript job
+    videos = screen_videos(youtube, videos)
+    for video in videos:
+        video.source = channel
+        queue.enqueue(job.run_id, 'transcript', video.video_id, {'article': video.to_dict()})
+    return {'videos': len(videos)}
+
+
+def _handle_transcript(queue, job):
+    """Downloads one video's transcript; videos without one are dropped."""
+    video = Article.from_dict(job.payload['article'])
+    full_text, language = get_video_transcript(video.video_id)
+    if not full_text:
+        return None
+    video.content = full_text
+    video.language = language
+    return video.to_dict()
+
+
+def _handle_summarize(queue, job):
+    """Summarizes a chunk of (deduplicated) articles."""
+    articles = [Article.from_dict(d) for d in job.payload['articles']]
+    with_content = [a for a in articles if a.content]
+    for article, summary in zip(with_content, summarize_texts([a.content for a in with_content])):
+        article.summary = summary
+    return [a.to_dict() for a in articles]
+
+
+def _handle_aggregate(queue, job):
+    """Renders the reports and sends the email from all summarized chunks."""
+    _, end_date, date_str = week_range(job.payload['target_date'])
+    articles = [Article.from_dict(d)
+                for chunk in queue.results(job.run_id, 'summarize').values()
+                for d in chunk]
+    if not articles:
+        logger.info(f"No articles found for date range: {date_str}")
+        return {'articles': 0}
+    render_outputs(articles, date_str, end_date)
+    report_url = report_url_for(week_page(end_date))
+    send_combined_email_report(articles, date_str, job.payload['recipients'], report_url)
+    return {'articles': len(articles)}
+
+
+HANDLERS = {
+    'discover': _handle_discover,
+    'fetch': _handle_fetch,
+    'youtube': _handle_youtube,
+    'transcript': _handle_transcript,
+    'summarize': _handle_summarize,
+    'aggregate': _handle_aggregate,
+}
+
+
+def _heartbeat(queue, job, stop):
+    """Renews a job's lease until ``stop`` is set."""
+    while not stop.wait(LEASE_SECONDS / 3):
+        if not queue.extend(job):
+            logger.warning(f"Lost lease on {job.kind} job {job.key}")
+            return
+
+
+def run_worker(queue, kinds=None, idle_exit=None):
+    """
+    Executes jobs from the queue until stopped.
+
+    Args:
+        queue: Queue returned by ``job_queue.open_queue``
+        kinds (list[str], optional): Only run jobs of these kinds
+        idle_exit (float, optional): Return after this many idle seconds
+
+    Returns:
+        int: Number of jobs completed
+    """
+    if idle_exit is None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        logger.info(f"Worker {worker} started ({', '.join(kinds) if kinds else 'all job kinds'})")
+    completed = 0
+    idle_since = time.monotonic()
+    while True:
+        job = queue.lease(kinds)
+        if job is None:
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                return completed
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat, args=(queue, job, stop), daemon=True)
+        heartbeat.start()
+        try:
+            result = HANDLERS[job.kind](queue, job)
+            if queue.complete(job, result):
+                completed += 1
+        except Exception as e:
+            logger.error(f"{job.kind} job {job.key} failed (attempt {job.attempts}): {e}")
+            queue.fail(job, e)
+        finally:
+            stop.set()
+        idle_since = time.monotonic()
+
+
+def _wait(queue, run_id, label, work=False):
+    """
+    Blocks until no job of the run is queued or leased.
+
+    Args:
+        work (bool): Execute jobs in this process while waiting
+    """
+    last_counts = None
+    while True:
+        counts = queue.counts(run_id)
+        if not counts.get(QUEUED) and not counts.get(LEASED):
+            if counts.get(FAILED):
+                logger.warning(f"Run {run_id}: {counts[FAILED]} jobs failed permanently")
+            return
+        if counts != last_counts:
+            logger.info(f"Run {run_id} waiting for {label}: {counts}")
+            last_counts = counts
+        # Jobs may be leased elsewhere or waiting out a retry backoff
+        if not (work and run_worker(queue, idle_exit=0)):
+            time.sleep(POLL_INTERVAL)
+
+
+def run_coordinator(queue, recipients, target_date=None, run_id=None, work=False):
+    """
+    Runs one weekly report through the job queue.
+
+    Enqueueing is idempotent, so restarting the coordinator with the same
+    ``run_id`` continues the run without repeating finished jobs. The
+    target date of a continued run is the one saved when it was created.
+
+    Args:
+        queue: Queue returned by ``job_queue.open_queue``
+        recipients (str or list): Email recipient(s)
+        target_date (str, optional): Target date in YYYY-MM-DD format
+            (ignored when continuing a run)
+        run_id (str, optional): Run to continue; a new one is created otherwise
+        work (bool): Also execute jobs in the coordinator process
+
+    Returns:
+        str: The run id
+    """
+    if run_id:
+        params = queue.run_params(run_id)
+        if params is None:
+            raise ValueError(f"No run {run_id} in the job queue")
+        target_date = params['target_date']
+    else:
+        # Random suffix: coordinators started in the same second get distinct runs
+        run_id = (f"{target_date or date.today().isoformat()}_{int(time.time())}_"
+                  f"{uuid.uuid4().hex[:6]}")
+        queue.save_run(run_id, {'target_date': target_date})
+    start_date, end_date, date_str = week_range(target_date)
+    logger.info(f"Run {run_id}: processing {date_str} through the job queue")
+
+    # Discovery enqueues fetch and transcript jobs as it finds items
+    for spec in SOURCES:
+        queue.enqueue(run_id, 'discover', spec.name, {
+            'source': spec.name, 'start': start_date.isoformat(), 'end': end_date.isoformat()})
+    if YOUTUBE_API_KEY and YOUTUBE_CHANNELS:
+        for channel in YOUTUBE_CHANNELS:
+            queue.enqueue(run_id, 'youtube', channel, {'channel': channel})
+    _wait(queue, run_id, 'discovery and downloads', work)
+
+    # Summaries are generated once per story, after collapsing duplicates
+    articles = [Article.from_dict(d)
+                for kind in ('fetch', 'transcript')
+                for d in queue.results(run_id, kind).values() if d]
+    try:
+        articles = collapse_duplicates(articles)
+    except Exception as e:
+        logger.error(f"Error collapsing duplicate articles: {e}")
+    for i in range(0, len(articles), SUMMARIZE_CHUNK):
+        queue.enqueue(run_id, 'summarize', f"{i // SUMMARIZE_CHUNK:06d}",
+                      {'articles': [a.to_dict() for a in articles[i:i + SUMMARIZE_CHUNK]]})
+    _wait(queue, run_id, 'summaries', work)
+
+    queue.enqueue(run_id, 'aggregate', 'report', {'target_date': target_date, 'recipients': recipients})
+    _wait(queue, run_id, 'report', work)
+    if 'report' not in queue.results(run_id, 'aggregate'):
+        raise RuntimeError(f"Run {run_id}: report job failed")
+    logger.info(f"Run {run_id} completed")
+    return run_id
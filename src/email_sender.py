@@ -4,23 +4,44 @@
 Email functionality for sending news summaries
 """
 
+import json
 import logging
+import os
 import smtplib
+from html import escape
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Union
+from typing import List, Union
 from config.config import EMAIL, PASSWORD
+from .models import Article
 
-def send_combined_email_report(articles: List[Dict], date_str: str, recipients: Union[str, List[str]]) -> None:
+# Public location of the saved HTML reports, used for "more" links
+REPORT_BASE_URL = os.getenv('REPORT_BASE_URL', '')
+
+# Articles listed per source before linking to the full report
+EMAIL_MAX_ITEMS_PER_SOURCE = int(os.getenv('EMAIL_MAX_ITEMS_PER_SOURCE', '10'))
+
+# Summaries longer than this are shortened in the email
+EMAIL_SUMMARY_CHARS = 400
+
+def send_combined_email_report(articles: List[Article], date_str: str, recipients: Union[str, List[str]],
+                               report_url: str = None) -> None:
     """
     Sends email report with summarized articles.
+
+    Args:
+        articles (list[Article]): Articles to report
+        date_str (str): Date range string for the subject
+        recipients (str | list[str]): Recipient address(es)
+        report_url (str, optional): Hosted full report linked from capped sections
     """
     try:
         if not recipients:
             raise ValueError("No recipients provided")
 
-        # Generate HTML content 
-        html_content = generate_email_html(articles, date_str)
+        # Generate HTML content and its plain-text alternative
+        html_content = generate_email_html(articles, date_str, report_url)
+        text_content = generate_email_text(articles, date_str, report_url)
         
         with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
             server.login(EMAIL, PASSWORD)
@@ -47,9 +68,10 @@ def send_combined_email_report(articles: List[Dict], date_str: str, recipients:
                     continue
                     
                 try:
-                    msg = _create_email_message(recipient.strip(), date_str, html_content)
+                    msg = _create_email_message(recipient.strip(), date_str, html_content, text_content)
+                    size_kb = len(msg.as_bytes()) / 1024
                     server.send_message(msg)
-                    logging.info(f"Email sent successfully to {recipient}")
+                    logging.info(f"Email sent successfully to {recipient} ({size_kb:.1f} KB)")
                 except Exception as e:
                     logging.error(f"Error sending email to {recipient}: {e}")
                     
@@ -60,161 +82,119 @@ def send_combined_email_report(articles: List[Dict], date_str: str, recipients:
         logging.error(f"Error in email sending process: {e}")
         raise
 
-def generate_email_html(articles, date_str):
+def report_url_for(page):
     """
-    Generate HTML content for email from articles.
-    
+    Builds the public URL of a report site page.
+
+    Args:
+        page (str): Path of the page relative to the site root
+            (see ``report_site.week_page``)
+
+    Returns:
+        str: URL under REPORT_BASE_URL, or None if no base URL is configured
+    """
+    if not REPORT_BASE_URL:
+        return None
+    return f"{REPORT_BASE_URL.rstrip('/')}/{page.lstrip('/')}"
+
+def _shorten(text, limit=EMAIL_SUMMARY_CHARS):
+    """Cuts text at a word boundary so it fits in ``limit`` characters."""
+    text = ' '.join((text or '').split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0] + '\u2026'
+
+def _sections(articles, max_items):
+    """Yields (source, shown articles, number omitted) in source order."""
+    by_source = {}
+    for article in articles:
+        by_source.setdefault(article.source, []).append(article)
+    for source in sorted(by_source):
+        source_articles = by_source[source]
+        yield source, source_articles[:max_items], max(0, len(source_articles) - max_items)
+
+def generate_email_html(articles, date_str, report_url=None, max_items=EMAIL_MAX_ITEMS_PER_SOURCE):
+    """
+    Generate compact HTML content for email from articles.
+
+    A single small style block is used instead of per-cell CSS, summaries
+    are shortened, and each source lists at most ``max_items`` articles
+    followed by a link to the full report.
+
     Args:
-        articles (list): List of processed articles
+        articles (list[Article]): List of processed articles
         date_str (str): Date range string for the title
-        
+        report_url (str, optional): Hosted full HTML report for "more" links
+        max_items (int): Articles shown per source
+
     Returns:
         str: HTML content for the email
     """
     try:
-        import pandas as pd
-        
         if not articles:
             logging.warning("No articles to include in the email")
             return "<p>No articles found for this period.</p>"
 
-        # Define function to make links clickable
-        def make_clickable(val):
-            return f'<a href="{val}" target="_blank">{val}</a>'
-
-        # Define CSS styles - modified for email compatibility
-        styles = [
-            # Header style
-            dict(selector="th", props=[
-                ("background-color", "#914048"),
-                ("color", "white"),
-                ("font-weight", "bold"),
-                ("text-align", "center"),
-                ("padding", "10px"),
-                ("border", "1px solid #ddd")
-            ]),
-            # Cell style
-            dict(selector="td", props=[
-                ("border", "1px solid #ddd"),
-                ("padding", "8px"),
-                ("text-align", "left")
-            ]),
-            # Table style
-            dict(selector="", props=[
-                ("border-collapse", "collapse"),
-                ("width", "100%"),
-                ("margin", "20px 0"),
-                ("font-family", "Arial, sans-serif")
-            ]),
-            # Row hover style
-            dict(selector="tr:hover", props=[
-                ("background-color", "#f5f5f5")
-            ]),
-            # Even rows
-            dict(selector="tr:nth-child(even)", props=[
-                ("background-color", "#f9f9f9")
-            ])
+        parts = [
+            '<html><head><meta charset="UTF-8">'
+            '<style>body{font-family:Arial,sans-serif;color:#333}'
+            'h1{border-bottom:2px solid #914048}'
+            'h2{border-left:4px solid #914048;padding-left:8px;font-size:1.1em}'
+            'a{color:#914048}small{color:#777}</style></head><body>',
+            f'<h1>AI News Summary - {escape(date_str)}</h1>',
         ]
+        for source, shown, omitted in _sections(articles, max_items):
+            parts.append(f'<h2>{escape(source)}</h2>')
+            for a in shown:
+                also = ''.join(f' <small>Also: <a href="{escape(d.link)}">{escape(d.source)}</a></small>'
+                               for d in a.duplicates)
+                parts.append(f'<p><a href="{escape(a.link)}"><b>{escape(a.title)}</b></a> '
+                             f'<small>{a.date_str}</small>{also}<br>{escape(_shorten(a.summary))}</p>')
+            if omitted:
+                more = f'{omitted} more from {escape(source)}'
+                parts.append(f'<p><a href="{escape(report_url)}">{more} &raquo;</a></p>'
+                             if report_url else f'<p><small>{more} in the full report</small></p>')
+        parts.append('</body></html>')
+        return ''.join(parts)
 
-        # Create HTML template
-        html_template = f"""
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>AI News Summary - {date_str}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    margin: 20px;
-                    background-color: #f8f9fa;
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 20px;
-                }}
-                h1 {{
-                    color: #333;
-                    text-align: center;
-                    padding-bottom: 20px;
-                    border-bottom: 2px solid #914048;
-                }}
-                .source-section {{
-                    margin-top: 30px;
-                }}
-                .source-header {{
-                    background-color: #f5f5f5;
-                    padding: 10px;
-                    margin: 20px 0 10px 0;
-                    font-size: 1.2em;
-                    font-weight: bold;
-                    border-left: 4px solid #914048;
-                }}
-                a {{
-                    color: #914048;
-                    text-decoration: none;
-                }}
-                a:hover {{
-                    text-decoration: underline;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>AI News Summary - {date_str}</h1>
-        """
-
-        # Group articles by source
-        sources = sorted(set(article['Source'] for article in articles))
-        
-        for source in sources:
-            source_articles = [a for a in articles if a['Source'] == source]
-            if source_articles:
-                # Create DataFrame for this source
-                df_source = pd.DataFrame(source_articles)
-                
-                # Select and reorder columns for email
-                # Note: Changed to include only the columns you want in the email
-                columns_to_display = ['Title', 'Date', 'Summary']
-                df_display = df_source[columns_to_display].copy()
-                
-                # Format the date column
-                df_display['Date'] = df_display['Date'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else '')
-                
-                # Add the link to the title instead of showing it separately
-                if 'Link' in df_source.columns:
-                    # Create a new Title column with embedded links
-                    df_display['Title'] = df_source.apply(
-                        lambda row: f'<a href="{row["Link"]}" target="_blank">{row["Title"]}</a>',
-                        axis=1
-                    )
-                
-                # Style the DataFrame
-                df_styled = df_display.style.set_table_styles(styles)
-                
-                # Add source section to HTML
-                html_template += f"""
-                    <div class="source-section">
-                        <div class="source-header">{source}</div>
-                        {df_styled.to_html(escape=False)}
-                    </div>
-                """
-
-        html_template += """
-            </div>
-        </body>
-        </html>
-        """
-
-        return html_template
-            
     except Exception as e:
         logging.error(f"Error generating email HTML: {e}")
         # Return a simple error message if something goes wrong
         return f"<p>Error generating email content: {str(e)}</p>"
 
-def _create_email_message(recipient: str, date_str: str, html_content: str) -> MIMEMultipart:
+def generate_email_text(articles, date_str, report_url=None, max_items=EMAIL_MAX_ITEMS_PER_SOURCE):
+    """
+    Generate the plain-text alternative of the email.
+
+    Args:
+        articles (list[Article]): List of processed articles
+        date_str (str): Date range string for the title
+        report_url (str, optional): Hosted full HTML report for "more" links
+        max_items (int): Articles shown per source
+
+    Returns:
+        str: Plain-text content for the email
+    """
+    if not articles:
+        return "No articles found for this period.\n"
+
+    lines = [f"AI News Summary - {date_str}", ""]
+    for source, shown, omitted in _sections(articles, max_items):
+        lines += [source, '=' * len(source)]
+        for a in shown:
+            lines.append(f"* {a.title} ({a.date_str})")
+            lines.append(f"  {a.link}")
+            lines += [f"  Also: {d.link}" for d in a.duplicates]
+            if a.summary:
+                lines.append(f"  {_shorten(a.summary)}")
+        if omitted:
+            lines.append(f"{omitted} more: {report_url}" if report_url
+                         else f"{omitted} more in the full report")
+        lines.append("")
+    return '\n'.join(lines)
+
+def _create_email_message(recipient: str, date_str: str, html_content: str,
+                          text_content: str = None) -> MIMEMultipart:
     """
     Creates email message with proper headers.
     
@@ -222,6 +202,8 @@ def _create_email_message(recipient: str, date_str: str, html_content: str) -> M
         recipient (str): Email recipient
         date_str (str): Date range string for the subject
         html_content (str): HTML content of the email
+        text_content (str, optional): Plain-text alternative, attached first
+            so clients that render HTML prefer the last (HTML) part
         
     Returns:
         MIMEMultipart: Formatted email message
@@ -230,5 +212,7 @@ def _create_email_message(recipient: str, date_str: str, html_content: str) -> M
     msg['Subject'] = f'Weekly AI News Summary - {date_str}'
     msg['From'] = EMAIL
     msg['To'] = recipient
+    if text_content:
+        msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
     msg.attach(MIMEText(html_content, 'html', 'utf-8'))
     return msg
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Fast extraction of JSON state embedded in HTML pages
+Locates hydration payloads (element attributes or <script> blocks) with a
+targeted byte scan instead of a full HTML parse, and caches the decoded
+result by content hash
+"""
+
+import hashlib
+import html
+import json
+import logging
+from collections import OrderedDict
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.embedded_state')
+
+# Decoded payloads kept in memory, keyed by (page hash, locator)
+_CACHE_SIZE = 64
+_cache = OrderedDict()
+
+
+def _cached(raw, locator, decode):
+    key = (hashlib.blake2b(raw, digest_size=16).digest(), locator)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    value = decode()
+    if value is not None:
+        _cache[key] = value
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return value
+
+
+def _scan_attribute(raw, attribute, marker):
+    """Returns the raw bytes of ``attribute`` on the tag containing ``marker``."""
+    position = raw.find(marker)
+    if position < 0:
+        return None
+
+    tag_start = raw.rfind(b'<', 0, position)
+    if tag_start < 0:
+        return None
+
+    needle = attribute + b'='
+    attr_pos = raw.find(needle, tag_start)
+    # The attribute must belong to the same tag as the marker
+    if attr_pos < 0 or raw.find(b'<', tag_start + 1, attr_pos) >= 0:
+        return None
+
+    quote_pos = attr_pos + len(needle)
+    quote = raw[quote_pos:quote_pos + 1]
+    if quote not in (b'"', b"'"):
+        return None
+    end = raw.find(quote, quote_pos + 1)
+    if end < 0:
+        return None
+    return raw[quote_pos + 1:end]
+
+
+def find_attribute_json(raw, attribute, marker=None):
+    """
+    Decodes JSON stored in an HTML attribute without parsing the page.
+
+    Args:
+        raw (bytes): Raw HTML
+        attribute (str): Attribute holding the JSON, e.g. 'data-hydration-props'
+        marker (str, optional): Text identifying the element, e.g.
+            'data-component="topic-subtopic-listing"'; defaults to the
+            first occurrence of the attribute
+
+    Returns:
+        object: Decoded JSON, or None if the payload is not found or invalid
+    """
+    attribute_bytes = attribute.encode('ascii')
+    marker_bytes = marker.encode('utf-8') if marker else attribute_bytes + b'='
+
+    def decode():
+        value = _scan_attribute(raw, attribute_bytes, marker_bytes)
+        if value is None:
+            return None
+        try:
+            return json.loads(html.unescape(value.decode('utf-8', errors='replace')))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON in {attribute} attribute: {e}")
+            return None
+
+    return _cached(raw, ('attr', attribute, marker), decode)
+
+
+def find_script_json(raw, script_id):
+    """
+    Decodes JSON state stored in a ``<script id="...">`` block, such as
+    Next.js ``__NEXT_DATA__``, without parsing the page.
+
+    Args:
+        raw (bytes): Raw HTML
+        script_id (str): Value of the script element's id attribute
+
+    Returns:
+        object: Decoded JSON, or None if the payload is not found or invalid
+    """
+    def decode():
+        for quote in (b'"', b"'"):
+            position = raw.find(b'id=' + quote + script_id.encode('utf-8') + quote)
+            if position >= 0:
+                break
+        else:
+            return None
+
+        start = raw.find(b'>', position)
+        end = raw.find(b'</script>', start)
+        if start < 0 or end < 0:
+            return None
+        try:
+            return json.loads(raw[start + 1:end])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON in script #{script_id}: {e}")
+            return None
+
+    return _cached(raw, ('script', script_id), decode)
@@ -0,0 +1,128 @@
+"""
+Local extractive pre-summarization
+Selects the highest-ranked sentences of an article or transcript up to a
+token budget, so only the most informative part is sent to the LLM
+"""
+
+import logging
+import re
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.extractive')
+
+# Default number of input tokens sent to the model per item
+INPUT_TOKEN_BUDGET = 1200
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=["\'(\[¿¡]?[A-ZÁÉÍÓÚÑ0-9])')
+
+# Transcripts often lack punctuation; long runs are split into word windows
+_MAX_SENTENCE_WORDS = 40
+
+
+def estimate_tokens(text):
+    """
+    Estimates the number of model tokens in a text (~4 characters per token).
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text):
+    """
+    Splits text into sentences, chunking unpunctuated runs into word windows.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list[str]: Sentences in original order
+    """
+    sentences = []
+    for sentence in _SENTENCE_RE.split(text.strip()):
+        words = sentence.split()
+        for i in range(0, len(words), _MAX_SENTENCE_WORDS):
+            sentences.append(' '.join(words[i:i + _MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def rank_sentences(sentences, method='textrank', damping=0.85, iterations=50):
+    """
+    Scores sentences by importance.
+
+    Args:
+        sentences (list[str]): Sentences to score
+        method (str): 'textrank' (PageRank over TF-IDF cosine similarity) or
+            'tfidf' (sum of TF-IDF weights per sentence)
+        damping (float): TextRank damping factor
+        iterations (int): Maximum power-iteration steps
+
+    Returns:
+        numpy.ndarray: One score per sentence
+    """
+    matrix = TfidfVectorizer(sublinear_tf=True).fit_transform(sentences)
+
+    if method == 'tfidf':
+        return np.asarray(matrix.sum(axis=1)).ravel()
+
+    # Rows are L2-normalized, so the dot product is the cosine similarity
+    similarity = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    row_sums[row_sums == 0] = 1.0
+    transition = similarity / row_sums
+
+    n = len(sentences)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+
+def extractive_summary(text, token_budget=INPUT_TOKEN_BUDGET, method='textrank'):
+    """
+    Shrinks a text to the top-ranked sentences that fit the token budget.
+
+    Texts already within the budget are returned unchanged. Selected
+    sentences keep their original order so the excerpt still reads naturally.
+
+    Args:
+        text (str): Article or transcript text
+        token_budget (int): Maximum estimated tokens to keep
+        method (str): Ranking method, see ``rank_sentences``
+
+    Returns:
+        str: Extract of the text within the budget
+    """
+    if not text or estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) < 2:
+        return text[:token_budget * 4]
+
+    try:
+        scores = rank_sentences(sentences, method)
+    except ValueError:
+        # Empty vocabulary (e.g. only stop words or symbols)
+        return text[:token_budget * 4]
+
+    lengths = np.fromiter((estimate_tokens(s) + 1 for s in sentences), dtype=np.int64,
+                          count=len(sentences))
+    selected = []
+    used = 0
+    for index in np.argsort(-scores, kind='stable'):
+        if used + lengths[index] <= token_budget:
+            selected.append(index)
+            used += lengths[index]
+
+    return ' '.join(sentences[i] for i in sorted(selected))
@@ -0,0 +1,195 @@
+"""
+Feed-based article discovery
+Reads RSS/Atom feeds and XML sitemaps with a streaming parser, using
+conditional GETs so unchanged feeds are not downloaded again
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import iterparse, ParseError
+from requests.exceptions import RequestException
+from .models import Article
+from .politeness import scheduler, parse_retry_after
+from .utils import HTTP_TIMEOUT
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.feeds')
+
+FEED_CACHE_DIR = "data/feeds"
+
+_ITEM_TAGS = {'item', 'entry', 'url'}
+
+
+class _TeeReader(io.RawIOBase):
+    """File-like wrapper that keeps a copy of everything read from a stream."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.buffer = bytearray()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self._stream.read(len(b))
+        n = len(chunk)
+        b[:n] = chunk
+        self.buffer += chunk
+        return n
+
+
+def _local(tag):
+    """Strips the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_feed_date(value):
+    """Parses RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) dates."""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        if value[:4].isdigit():
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        return parsedate_to_datetime(value).date()
+    except (ValueError, TypeError):
+        logger.warning(f"Unrecognized feed date: {value}")
+        return None
+
+
+def _entry_fields(element):
+    """Returns (title, link, date) for an RSS item, Atom entry or sitemap url."""
+    title = link = raw_date = None
+    for child in element.iter():
+        name = _local(child.tag)
+        if name == 'title' and title is None:
+            title = (child.text or '').strip()
+        elif name == 'link' and link is None:
+            # Atom links carry the URL in href; RSS links in the text
+            if child.get('rel', 'alternate') == 'alternate':
+                link = (child.get('href') or child.text or '').strip()
+        elif name == 'loc' and link is None:
+            link = (child.text or '').strip()
+        elif name in ('pubDate', 'published', 'publication_date', 'updated', 'lastmod', 'date'):
+            # Prefer publication over modification dates
+            if raw_date is None or name in ('pubDate', 'published', 'publication_date'):
+                raw_date = child.text
+    return title, link, _parse_feed_date(raw_date)
+
+
+def parse_feed(stream, since=None, source='', ordered=True):
+    """
+    Streams entries out of an RSS, Atom or sitemap document.
+
+    Args:
+        stream: Binary file-like object with the XML document
+        since (date, optional): Skip entries older than this date
+        source (str): Source name for the returned articles
+        ordered (bool): Entries are newest first, so stop at the first one
+            older than ``since`` (true for feeds, not for sitemaps)
+
+    Yields:
+        Article: One record per entry with title, link and date
+    """
+    for _, element in iterparse(stream, events=('end',)):
+        if _local(element.tag) not in _ITEM_TAGS:
+            continue
+        title, link, date = _entry_fields(element)
+        element.clear()
+
+        if since and date and date < since:
+            if ordered:
+                return
+            continue
+        if link:
+            # Sitemap entries without a news:title fall back to the URL slug
+            if not title:
+                title = link.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ')
+            yield Article(title=title, link=link, date=date, source=source)
+
+
+def _cache_paths(url):
+    name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return (os.path.join(FEED_CACHE_DIR, f"{name}.json"),
+            os.path.join(FEED_CACHE_DIR, f"{name}.xml"))
+
+
+def discover_articles(session, url, since=None, source='', ordered=True, headers=None):
+    """
+    Discovers articles from a feed or sitemap with a conditional GET.
+
+    The ETag/Last-Modified validators and the downloaded body are cached
+    under FEED_CACHE_DIR; a 304 response re-reads the cached body instead
+    of downloading the feed again. A body that was cut short at a date
+    cutoff is only replayed for requests that need no older entries.
+
+    Args:
+        session (requests.Session): HTTP session
+        url (str): Feed or sitemap URL
+        since (date, optional): Stop at (or skip) entries older than this date
+        source (str): Source name for the returned articles
+        ordered (bool): Whether entries are newest first
+        headers (dict, optional): Extra request headers
+
+    Returns:
+        list[Article]: Discovered articles, or None if the feed is unusable
+    """
+    state_path, body_path = _cache_paths(url)
+    request_headers = dict(headers or {})
+    if os.path.exists(state_path) and os.path.exists(body_path):
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        covers_since = state.get('covers_since')
+        if covers_since and (not since or since.isoformat() < covers_since):
+            state = {}
+        if state.get('etag'):
+            request_headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            request_headers['If-Modified-Since'] = state['last_modified']
+
+    try:
+        # The slot is held until the body has been read
+        with scheduler.slot(url) as slot:
+            response = session.get(url, timeout=HTTP_TIMEOUT, headers=request_headers, stream=True)
+            slot.record(response.status_code,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After')))
+            with response:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    reader = _TeeReader(response.raw)
+                    articles = []
+                    covers_since = None
+                    for article in parse_feed(reader, None, source, ordered=False):
+                        if since and article.date and article.date < since:
+                            if ordered:
+                                covers_since = since.isoformat()
+                                break
+                            continue
+                        articles.append(article)
+        if response.status_code == 304:
+            logger.info(f"Feed not modified, using cached copy: {url}")
+            with open(body_path, 'rb') as f:
+                return list(parse_feed(f, since, source, ordered))
+    except (RequestException, ParseError, OSError) as e:
+        logger.warning(f"Feed discovery failed for {url}: {e}")
+        return None
+
+    if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+        os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+        with open(body_path, 'wb') as f:
+            f.write(reader.buffer)
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'covers_since': covers_since,
+            }, f)
+
+    logger.info(f"Discovered {len(articles)} articles from feed {url}")
+    return articles
@@ -0,0 +1,479 @@
+"""
+Durable job queue for distributed runs
+Jobs are leased to workers for a limited time; a job whose worker dies is
+handed out again when its lease expires, failed jobs are retried with
+backoff, and results are written once per job. Each run's parameters
+are stored with its jobs so a restarted coordinator can pick them up.
+SQLite is the default store, Redis can be used across machines and an
+in-memory queue stands in for both in tests
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.job_queue')
+
+QUEUE_DB_PATH = "data/jobs.db"
+
+# Queue location: sqlite:///path, redis://host:port/db or memory://
+JOB_QUEUE_URL = os.getenv('JOB_QUEUE_URL', f"sqlite:///{QUEUE_DB_PATH}")
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 10
+
+# Job states
+QUEUED, LEASED, DONE, FAILED = 'queued', 'leased', 'done', 'failed'
+
+
+@dataclass(slots=True)
+class Job:
+    """A leased unit of work."""
+    id: str
+    run_id: str
+    kind: str
+    key: str
+    payload: dict
+    attempts: int
+    token: str
+
+
+def _backoff(attempts):
+    return RETRY_BACKOFF * 2 ** (attempts - 1)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    token TEXT,
+    result TEXT,
+    error TEXT,
+    UNIQUE (run_id, kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(status, available_at);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    params TEXT NOT NULL
+);
+"""
+
+
+class SQLiteQueue:
+    """
+    Job queue stored in a SQLite database shared by all local workers.
+
+    Leasing runs in an IMMEDIATE transaction so two workers never receive
+    the same job; enqueueing the same (run, kind, key) twice is a no-op.
+    """
+
+    def __init__(self, db_path=QUEUE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, run_id, kind, key, payload, max_attempts=MAX_ATTEMPTS):
+        """
+        Adds a job unless the same (run_id, kind, key) was already queued.
+
+        Returns:
+            bool: True if a new job was added
+        """
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO jobs (run_id, kind, key, payload, max_attempts, available_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, kind, key, json.dumps(payload, ensure_ascii=False), max_attempts, time.time()))
+        return cursor.rowcount == 1
+
+    def lease(self, kinds=None, lease_seconds=LEASE_SECONDS):
+        """
+        Hands out the oldest ready job (queued, or leased with an expired lease).
+
+        Args:
+            kinds (list[str], optional): Only lease jobs of these kinds
+            lease_seconds (float): Time before the job is handed out again
+
+        Returns:
+            Job: The leased job, or None if nothing is ready
+        """
+        now = time.time()
+        kind_filter = ''
+        params = [QUEUED, now, LEASED, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})"
+            params += list(kinds)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A worker died holding the job's last attempt
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'lease expired' "
+                "WHERE status = ? AND lease_until < ? AND attempts >= max_attempts",
+                (FAILED, LEASED, now))
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE ((status = ? AND available_at <= ?) "
+                f"OR (status = ? AND lease_until < ?)){kind_filter} ORDER BY id LIMIT 1",
+                params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, token = ? "
+                "WHERE id = ?", (LEASED, now + lease_seconds, token, row['id']))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return Job(str(row['id']), row['run_id'], row['kind'], row['key'],
+                   json.loads(row['payload']), row['attempts'] + 1, token)
+
+    def extend(self, job, lease_seconds=LEASE_SECONDS):
+        """
+        Renews a lease that is still held.
+
+        Returns:
+            bool: False if the lease was lost to another worker
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND token = ? AND status = ?",
+            (time.time() + lease_seconds, job.id, job.token, LEASED))
+        return cursor.rowcount == 1
+
+    def complete(self, job, result):
+        """
+        Stores a job's result. Only the first completion is kept, so a
+        worker that finishes after its lease expired cannot overwrite it.
+
+        Returns:
+            bool: True if this call stored the result
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL "
+            "WHERE id = ? AND status != ?",
+            (DONE, json.dumps(result, ensure_ascii=False), job.id, DONE))
+        return cursor.rowcount == 1
+
+    def fail(self, job, error):
+        """Records a failed attempt; the job is retried with backoff until it runs out of attempts."""
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "available_at = ?, lease_until = NULL, error = ? "
+            "WHERE id = ? AND token = ? AND status = ?",
+            (FAILED, QUEUED, time.time() + _backoff(job.attempts), str(error),
+             job.id, job.token, LEASED))
+
+    def counts(self, run_id):
+        """dict: Number of jobs of a run per status."""
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,))
+        return dict(rows.fetchall())
+
+    def results(self, run_id, kind):
+        """
+        Returns:
+            dict: Results of the finished jobs of one kind, keyed by job key
+        """
+        rows = self._connect().execute(
+            "SELECT key, result FROM jobs WHERE run_id = ? AND kind = ? AND status = ? ORDER BY id",
+            (run_id, kind, DONE))
+        return {key: json.loads(result) for key, result in rows}
+
+    def save_run(self, run_id, params):
+        """
+        Stores a new run's parameters (e.g. its target date); the first
+        save of a run wins.
+
+        Returns:
+            bool: True if the parameters were stored
+        """
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO runs (run_id, params) VALUES (?, ?)",
+            (run_id, json.dumps(params, ensure_ascii=False)))
+        return cursor.rowcount == 1
+
+    def run_params(self, run_id):
+        """
+        Returns:
+            dict: Parameters saved with ``save_run``, or None for an unknown run
+        """
+        row = self._connect().execute(
+            "SELECT params FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row['params']) if row else None
+
+
+class MemoryQueue:
+    """In-process queue with the same behaviour as SQLiteQueue, for tests."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._runs = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, run_id, kind, key, payload, max_attempts=MAX_ATTEMPTS):
+        with self._lock:
+            if (run_id, kind, key) in self._jobs:
+                return False
+            self._next_id += 1
+            self._jobs[(run_id, kind, key)] = {
+                'id': str(self._next_id), 'run_id': run_id, 'kind': kind, 'key': key,
+                'payload': json.loads(json.dumps(payload)), 'status': QUEUED, 'attempts': 0,
+                'max_attempts': max_attempts, 'available_at': time.time(),
+                'lease_until': None, 'token': None, 'result': None, 'error': None,
+            }
+            return True
+
+    def _find(self, job):
+        return self._jobs[(job.run_id, job.kind, job.key)]
+
+    def lease(self, kinds=None, lease_seconds=LEASE_SECONDS):
+        now = time.time()
+        with self._lock:
+            for entry in sorted(self._jobs.values(), key=lambda e: int(e['id'])):
+                if kinds and entry['kind'] not in kinds:
+                    continue
+                if entry['status'] == LEASED and entry['lease_until'] < now \
+                        and entry['attempts'] >= entry['max_attempts']:
+                    entry.update(status=FAILED, error='lease expired')
+                    continue
+                ready = (entry['status'] == QUEUED and entry['available_at'] <= now) or \
+                    (entry['status'] == LEASED and entry['lease_until'] < now)
+                if ready:
+                    entry.update(status=LEASED, attempts=entry['attempts'] + 1,
+                                 lease_until=now + lease_seconds, token=uuid.uuid4().hex)
+                    return Job(entry['id'], entry['run_id'], entry['kind'], entry['key'],
+                               json.loads(json.dumps(entry['payload'])), entry['attempts'],
+                               entry['token'])
+        return None
+
+    def extend(self, job, lease_seconds=LEASE_SECONDS):
+        with self._lock:
+            entry = self._find(job)
+            if entry['status'] != LEASED or entry['token'] != job.token:
+                return False
+            entry['lease_until'] = time.time() + lease_seconds
+            return True
+
+    def complete(self, job, result):
+        with self._lock:
+            entry = self._find(job)
+            if entry['status'] == DONE:
+                return False
+            entry.update(status=DONE, result=json.loads(json.dumps(result)),
+                         error=None, lease_until=None)
+            return True
+
+    def fail(self, job, error):
+        with self._lock:
+            entry = self._find(job)
+            if entry['status'] != LEASED or entry['token'] != job.token:
+                return
+            entry.update(status=FAILED if entry['attempts'] >= entry['max_attempts'] else QUEUED,
+                         available_at=time.time() + _backoff(job.attempts),
+                         lease_until=None, error=str(error))
+
+    def counts(self, run_id):
+        with self._lock:
+            counts = {}
+            for entry in self._jobs.values():
+                if entry['run_id'] == run_id:
+                    counts[entry['status']] = counts.get(entry['status'], 0) + 1
+            return counts
+
+    def results(self, run_id, kind):
+        with self._lock:
+            entries = sorted((e for e in self._jobs.values()
+                              if e['run_id'] == run_id and e['kind'] == kind and e['status'] == DONE),
+                             key=lambda e: int(e['id']))
+            return {e['key']: e['result'] for e in entries}
+
+    def save_run(self, run_id, params):
+        with self._lock:
+            if run_id in self._runs:
+                return False
+            self._runs[run_id] = json.loads(json.dumps(params))
+            return True
+
+    def run_params(self, run_id):
+        with self._lock:
+            params = self._runs.get(run_id)
+            return json.loads(json.dumps(params)) if params is not None else None
+
+
+# Moves expired leases back to the ready set, then pops the oldest ready job
+_REDIS_LEASE = """
+local now = tonumber(ARGV[1])
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    redis.call('ZREM', KEYS[2], id)
+    local job = KEYS[3] .. id
+    if tonumber(redis.call('HGET', job, 'attempts')) >= tonumber(redis.call('HGET', job, 'max_attempts')) then
+        redis.call('HSET', job, 'status', 'failed', 'error', 'lease expired')
+    else
+        redis.call('ZADD', KEYS[1], now, id)
+    end
+end
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now)
+for _, id in ipairs(ids) do
+    local job = KEYS[3] .. id
+    local kind = redis.call('HGET', job, 'kind')
+    if ARGV[4] == '' or string.find(ARGV[4], '|' .. kind .. '|', 1, true) then
+        redis.call('ZREM', KEYS[1], id)
+        redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), id)
+        redis.call('HINCRBY', job, 'attempts', 1)
+        redis.call('HSET', job, 'status', 'leased', 'token', ARGV[3])
+        return id
+    end
+end
+return false
+"""
+
+
+class RedisQueue:
+    """
+    Job queue in Redis, for workers on several machines.
+
+    Requires the ``redis`` package. Ready jobs live in a sorted set scored
+    by availability time, leased jobs in one scored by lease expiry; each
+    job is a hash holding its payload, state and result.
+    """
+
+    def __init__(self, url, prefix='ai_news:jobs:'):
+        import redis
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+        self._ready = prefix + 'ready'
+        self._leased = prefix + 'leased'
+        self._lease_script = self._redis.register_script(_REDIS_LEASE)
+
+    def _job_key(self, job_id):
+        return f"{self._prefix}job:{job_id}"
+
+    def _id(self, run_id, kind, key):
+        return f"{run_id}|{kind}|{key}"
+
+    def enqueue(self, run_id, kind, key, payload, max_attempts=MAX_ATTEMPTS):
+        job_id = self._id(run_id, kind, key)
+        added = self._redis.hsetnx(self._job_key(job_id), 'payload', json.dumps(payload, ensure_ascii=False))
+        if not added:
+            return False
+        pipe = self._redis.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={
+            'run_id': run_id, 'kind': kind, 'key': key, 'status': QUEUED,
+            'attempts': 0, 'max_attempts': max_attempts})
+        pipe.sadd(f"{self._prefix}run:{run_id}", job_id)
+        pipe.zadd(self._ready, {job_id: time.time()})
+        pipe.execute()
+        return True
+
+    def lease(self, kinds=None, lease_seconds=LEASE_SECONDS):
+        token = uuid.uuid4().hex
+        kind_filter = '|' + '|'.join(kinds) + '|' if kinds else ''
+        job_id = self._lease_script(keys=[self._ready, self._leased, self._prefix + 'job:'],
+                                    args=[time.time(), lease_seconds, token, kind_filter])
+        if not job_id:
+            return None
+        data = self._redis.hgetall(self._job_key(job_id))
+        return Job(job_id, data['run_id'], data['kind'], data['key'],
+                   json.loads(data['payload']), int(data['attempts']), token)
+
+    def extend(self, job, lease_seconds=LEASE_SECONDS):
+        if self._redis.hget(self._job_key(job.id), 'token') != job.token:
+            return False
+        self._redis.zadd(self._leased, {job.id: time.time() + lease_seconds}, xx=True)
+        return True
+
+    def complete(self, job, result):
+        job_key = self._job_key(job.id)
+        # HSETNX on 'result' makes the first completion win
+        if not self._redis.hsetnx(job_key, 'result', json.dumps(result, ensure_ascii=False)):
+            return False
+        pipe = self._redis.pipeline()
+        pipe.hset(job_key, 'status', DONE)
+        pipe.zrem(self._leased, job.id)
+        pipe.execute()
+        return True
+
+    def fail(self, job, error):
+        job_key = self._job_key(job.id)
+        data = self._redis.hgetall(job_key)
+        if data.get('token') != job.token or data.get('status') != LEASED:
+            return
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._leased, job.id)
+        if int(data['attempts']) >= int(data['max_attempts']):
+            pipe.hset(job_key, mapping={'status': FAILED, 'error': str(error)})
+        else:
+            pipe.hset(job_key, mapping={'status': QUEUED, 'error': str(error)})
+            pipe.zadd(self._ready, {job.id: time.time() + _backoff(job.attempts)})
+        pipe.execute()
+
+    def counts(self, run_id):
+        counts = {}
+        for job_id in self._redis.smembers(f"{self._prefix}run:{run_id}"):
+            status = self._redis.hget(self._job_key(job_id), 'status')
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def results(self, run_id, kind):
+        results = {}
+        for job_id in sorted(self._redis.smembers(f"{self._prefix}run:{run_id}")):
+            data = self._redis.hgetall(self._job_key(job_id))
+            if data.get('kind') == kind and data.get('status') == DONE:
+                results[data['key']] = json.loads(data['result'])
+        return results
+
+    def save_run(self, run_id, params):
+        return bool(self._redis.hsetnx(f"{self._prefix}runs", run_id,
+                                       json.dumps(params, ensure_ascii=False)))
+
+    def run_params(self, run_id):
+        params = self._redis.hget(f"{self._prefix}runs", run_id)
+        return json.loads(params) if params is not None else None
+
+
+def open_queue(url=JOB_QUEUE_URL):
+    """
+    Opens the job queue named by a URL.
+
+    Args:
+        url (str): ``sqlite:///path/to/jobs.db``, ``redis://host:port/db``
+            or ``memory://``
+
+    Returns:
+        SQLiteQueue | RedisQueue | MemoryQueue: The queue
+    """
+    if url.startswith('sqlite:///'):
+        return SQLiteQueue(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisQueue(url)
+    if url == 'memory://':
+        return MemoryQueue()
+    raise ValueError(f"Unsupported job queue URL: {url}")
@@ -0,0 +1,145 @@
+"""
+Record types shared across the AI News Scraper pipeline
+"""
+
+from dataclasses import dataclass, field
+from datetime import date as _date
+from typing import Optional
+
+# Column order used by the CSV and HTML writers
+CSV_FIELDS = ['Title', 'Date', 'Link', 'Summary', 'Source']
+
+
+@dataclass(slots=True)
+class Article:
+    """
+    A single news article or video moving through the pipeline.
+
+    Every scraper, the YouTube processor, the CSV/HTML writers and the
+    email renderer exchange these records instead of ad-hoc dicts, so
+    field names and types are the same everywhere: ``date`` is always a
+    ``datetime.date`` (or None) and ``link`` is always an absolute URL.
+    ``duplicates`` holds near-duplicate copies of the same story found on
+    other sources (see ``src.dedup``). ``description`` is the listing
+    blurb, when there is one, and ``relevance`` the topic score given by
+    ``src.relevance`` before content is fetched. Videos also carry their
+    ``duration`` in seconds and ``has_captions`` (uploaded captions), from
+    ``youtube_scraper.annotate_videos``.
+    """
+    title: str
+    link: str
+    date: Optional[_date] = None
+    source: str = ''
+    summary: str = ''
+    content: str = ''
+    language: Optional[str] = None
+    video_id: Optional[str] = None
+    duplicates: list = field(default_factory=list)
+    description: str = ''
+    relevance: Optional[float] = None
+    duration: Optional[int] = None
+    has_captions: Optional[bool] = None
+
+    @property
+    def date_str(self):
+        """str: Date formatted as YYYY-MM-DD, or empty string if unknown."""
+        return self.date.isoformat() if self.date else ''
+
+    def to_row(self):
+        """
+        Convert the article to a report row keyed by the CSV column names.
+
+        Returns:
+            dict: Row with Title, Date, Link, Summary and Source keys
+        """
+        return {
+            'Title': self.title,
+            'Date': self.date_str,
+            'Link': self.link,
+            'Summary': self.summary,
+            'Source': self.source,
+        }
+
+    def to_dict(self):
+        """
+        Convert the article to a JSON-serializable dict.
+
+        Returns:
+            dict: All fields, with the date as an ISO string
+        """
+        return {
+            'title': self.title,
+            'link': self.link,
+            'date': self.date_str or None,
+            'source': self.source,
+            'summary': self.summary,
+            'content': self.content,
+            'language': self.language,
+            'video_id': self.video_id,
+            'duplicates': [d.to_dict() for d in self.duplicates],
+            'description': self.description,
+            'relevance': self.relevance,
+            'duration': self.duration,
+            'has_captions': self.has_captions,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an article from ``to_dict`` output.
+
+        Args:
+            data (dict): Serialized article
+
+        Returns:
+            Article: The restored record
+        """
+        fields = dict(data)
+        fields['date'] = _date.fromisoformat(fields['date']) if fields.get('date') else None
+        fields['duplicates'] = [cls.from_dict(d) for d in fields.get('duplicates', [])]
+        return cls(**fields)
+
+
+@dataclass(slots=True)
+class TranscriptSegment:
+    """One timed caption line of a video transcript."""
+    text: str
+    start: float
+    duration: float
+
+
+@dataclass(slots=True)
+class Transcript:
+    """
+    A video transcript as returned by ``youtube_scraper.fetch_transcript``.
+
+    ``language_code`` is the language of ``segments``; when the captions
+    were machine-translated by YouTube, ``translated_from`` holds the code
+    of the original track.
+    """
+    video_id: str
+    language: str
+    language_code: str
+    is_generated: bool
+    segments: list = field(default_factory=list)
+    translated_from: Optional[str] = None
+
+    @property
+    def text(self):
+        """str: Segment texts joined by spaces."""
+        return ' '.join(s.text for s in self.segments if s.text).strip()
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serializable transcript with its segments
+        """
+        return {
+            'video_id': self.video_id,
+            'language': self.language,
+            'language_code': self.language_code,
+            'is_generated': self.is_generated,
+            'translated_from': self.translated_from,
+            'segments': [{'text': s.text, 'start': s.start, 'duration': s.duration}
+                         for s in self.segments],
+        }
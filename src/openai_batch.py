@@ -0,0 +1,354 @@
+"""
+OpenAI Batch API summarization
+Writes every pending summarization request to a JSONL file, submits it
+through the Batch API, polls until the batch finishes and merges the
+results back by custom_id. Meant for weekly digests and backfills, where
+throughput and cost matter more than latency
+
+Includes ``MockBatchClient``, a local stand-in for the files and batches
+endpoints (OPENAI_BATCH_MOCK=1) so the whole flow can run offline
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from types import SimpleNamespace
+import openai
+from .extractive import extractive_summary, INPUT_TOKEN_BUDGET
+from .summarizer import SYSTEM_PROMPT, USER_PROMPT, SUMMARY_MAX_TOKENS
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.openai_batch')
+
+# Where request files and batch manifests are kept until results are merged
+BATCH_DIR = "data/batches"
+
+BATCH_MODEL = os.getenv("OPENAI_BATCH_MODEL", "gpt-4")
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Seconds between status checks, and how long to wait before giving up
+BATCH_POLL_SECONDS = float(os.getenv("OPENAI_BATCH_POLL_SECONDS", "60"))
+BATCH_MAX_WAIT_HOURS = float(os.getenv("OPENAI_BATCH_MAX_WAIT_HOURS", "24"))
+
+# Use the local mock instead of the OpenAI endpoints
+BATCH_MOCK = os.getenv("OPENAI_BATCH_MOCK", "") not in ("", "0")
+
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_request(custom_id, text, max_input_tokens=INPUT_TOKEN_BUDGET):
+    """
+    Builds one line of a batch input file.
+
+    Args:
+        custom_id (str): Identifier used to match the result to its item
+        text (str): Text to summarize
+        max_input_tokens (int): Input token budget, None to send the full text
+
+    Returns:
+        dict: Batch request for the chat completions endpoint
+    """
+    if max_input_tokens:
+        text = extractive_summary(text, max_input_tokens)
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": BATCH_MODEL,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": USER_PROMPT.format(text=text)}
+            ],
+            "temperature": 0.1,
+            "max_tokens": SUMMARY_MAX_TOKENS
+        }
+    }
+
+
+def write_batch_file(items, path, max_input_tokens=INPUT_TOKEN_BUDGET):
+    """
+    Writes a batch input file.
+
+    Args:
+        items (dict): custom_id -> text
+        path (str): JSONL file to write
+
+    Returns:
+        int: Number of requests written
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for custom_id, text in items.items():
+            f.write(json.dumps(build_request(custom_id, text, max_input_tokens),
+                               ensure_ascii=False) + '\n')
+    return len(items)
+
+
+def submit_batch(client, path, metadata=None):
+    """
+    Uploads a batch input file and creates the batch.
+
+    Args:
+        client: ``openai`` module, ``openai.OpenAI`` instance or MockBatchClient
+        path (str): JSONL input file
+        metadata (dict, optional): Stored with the batch
+
+    Returns:
+        str: Batch id
+    """
+    with open(path, 'rb') as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+        metadata=metadata
+    )
+    logger.info(f"Submitted batch {batch.id} ({path})")
+    return batch.id
+
+
+def wait_for_batch(client, batch_id, poll_seconds=BATCH_POLL_SECONDS,
+                   max_wait=BATCH_MAX_WAIT_HOURS * 3600):
+    """
+    Polls a batch until it reaches a terminal status.
+
+    Returns:
+        Batch: Last retrieved batch (its status may not be terminal on timeout)
+    """
+    waited = 0
+    last_status = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status != last_status:
+            counts = getattr(batch, 'request_counts', None)
+            progress = f" ({counts.completed}/{counts.total})" if counts and counts.total else ""
+            logger.info(f"Batch {batch_id}: {batch.status}{progress}")
+            last_status = batch.status
+        if batch.status in TERMINAL_STATUSES or waited >= max_wait:
+            return batch
+        time.sleep(poll_seconds)
+        waited += poll_seconds
+
+
+def _read_lines(client, file_id):
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def read_results(client, batch):
+    """
+    Collects the summaries of a finished (or expired) batch.
+
+    Args:
+        client: Batch API client
+        batch: Batch returned by ``wait_for_batch``
+
+    Returns:
+        dict: custom_id -> summary, for requests that succeeded
+    """
+    results = {}
+    for line in _read_lines(client, batch.output_file_id):
+        response = line.get('response') or {}
+        if line.get('error') or response.get('status_code') != 200:
+            logger.error(f"Batch request {line.get('custom_id')} failed: "
+                         f"{line.get('error') or response.get('body')}")
+            continue
+        try:
+            results[line['custom_id']] = response['body']['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            logger.error(f"Malformed batch result for {line.get('custom_id')}: {e}")
+    for line in _read_lines(client, getattr(batch, 'error_file_id', None)):
+        logger.error(f"Batch request {line.get('custom_id')} failed: "
+                     f"{line.get('error') or (line.get('response') or {}).get('body')}")
+    return results
+
+
+_mock_client = None
+
+
+def get_batch_client():
+    """Returns the OpenAI module client, or the local mock when OPENAI_BATCH_MOCK is set."""
+    global _mock_client
+    if not BATCH_MOCK:
+        return openai
+    # One mock per process, so batches outlive a single call
+    if _mock_client is None:
+        _mock_client = MockBatchClient()
+    return _mock_client
+
+
+def summarize_with_batch_api(texts, client=None, batch_dir=BATCH_DIR,
+                             poll_seconds=BATCH_POLL_SECONDS,
+                             max_wait=BATCH_MAX_WAIT_HOURS * 3600):
+    """
+    Summarizes texts through one Batch API job.
+
+    The job is keyed by a digest of the texts: a run restarted with the same
+    pending items resumes polling the batch it already submitted instead of
+    paying for a second one. Manifests record which client submitted them;
+    a batch submitted to a mock that no longer exists (another process) is
+    submitted again rather than resumed.
+
+    Args:
+        texts (list[str]): Texts to summarize
+        client: Batch API client, defaults to ``get_batch_client()``
+
+    Returns:
+        list[str]: One summary per text, empty for requests that failed
+    """
+    if not texts:
+        return []
+    client = client or get_batch_client()
+    # Item ids are position + text digest, so results map back unambiguously
+    ids = [f"{i:06d}-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+           for i, text in enumerate(texts)]
+    key = hashlib.sha1('\n'.join(ids).encode('utf-8')).hexdigest()[:16]
+    input_path = os.path.join(batch_dir, f"{key}.jsonl")
+    manifest_path = os.path.join(batch_dir, f"{key}.json")
+
+    # None for the OpenAI endpoints, a per-instance id for mocks
+    client_id = getattr(client, 'client_id', None)
+
+    try:
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('client_id') != client_id:
+                logger.warning(f"Batch {manifest['batch_id']} was submitted to another client; "
+                               f"submitting again")
+                manifest = None
+        if manifest:
+            batch_id = manifest['batch_id']
+            logger.info(f"Resuming batch {batch_id} for {len(texts)} texts")
+        else:
+            write_batch_file(dict(zip(ids, texts)), input_path)
+            batch_id = submit_batch(client, input_path, metadata={'items': str(len(texts))})
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({'batch_id': batch_id, 'items': len(texts), 'client_id': client_id}, f)
+
+        batch = wait_for_batch(client, batch_id, poll_seconds, max_wait)
+        if batch.status not in TERMINAL_STATUSES:
+            # The manifest is kept so the next attempt picks the batch up again
+            logger.error(f"Batch {batch_id} still {batch.status} after {max_wait:.0f}s")
+            return [""] * len(texts)
+        results = read_results(client, batch)
+    except Exception as e:
+        logger.error(f"OpenAI Batch API error: {e}")
+        return [""] * len(texts)
+
+    for path in (input_path, manifest_path):
+        if os.path.exists(path):
+            os.remove(path)
+    logger.info(f"Batch {batch_id} {batch.status}: {len(results)}/{len(texts)} summaries")
+    return [results.get(custom_id, "") for custom_id in ids]
+
+
+class _MockFiles:
+    def __init__(self, store):
+        self._store = store
+
+    def create(self, file, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self._store[file_id] = file.read()
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    def content(self, file_id):
+        data = self._store[file_id]
+        return SimpleNamespace(content=data, text=data.decode('utf-8'))
+
+
+class _MockBatches:
+    def __init__(self, client):
+        self._client = client
+        self._batches = {}
+
+    def create(self, input_file_id, endpoint, completion_window, metadata=None):
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        self._batches[batch_id] = {'input_file_id': input_file_id, 'polls': 0, 'metadata': metadata,
+                                   'status': 'validating', 'output_file_id': None,
+                                   'error_file_id': None, 'completed': 0, 'total': 0}
+        return self.retrieve(batch_id, advance=False)
+
+    def retrieve(self, batch_id, advance=True):
+        state = self._batches[batch_id]
+        if advance and state['status'] not in TERMINAL_STATUSES:
+            state['polls'] += 1
+            if state['polls'] >= self._client.polls_to_complete:
+                self._client._run(state)
+            else:
+                state['status'] = 'in_progress'
+        return SimpleNamespace(
+            id=batch_id, status=state['status'], metadata=state['metadata'],
+            input_file_id=state['input_file_id'], output_file_id=state['output_file_id'],
+            error_file_id=state['error_file_id'],
+            request_counts=SimpleNamespace(total=state['total'], completed=state['completed'],
+                                           failed=state['total'] - state['completed']))
+
+
+class MockBatchClient:
+    """
+    In-memory stand-in for the OpenAI files and batches endpoints.
+
+    Batches complete after ``polls_to_complete`` status checks. Each request
+    is answered by ``responder(body) -> str``; exceptions it raises become
+    failed requests in the error file. The default responder returns an
+    extractive summary of the user message. Batches only exist in memory,
+    so ``client_id`` tells manifests of different instances apart.
+    """
+
+    def __init__(self, responder=None, polls_to_complete=2):
+        self.client_id = f"mock-{uuid.uuid4().hex[:12]}"
+        self.responder = responder or self._extractive_responder
+        self.polls_to_complete = polls_to_complete
+        self._store = {}
+        self.files = _MockFiles(self._store)
+        self.batches = _MockBatches(self)
+
+    @staticmethod
+    def _extractive_responder(body):
+        text = body['messages'][-1]['content']
+        prefix = USER_PROMPT.format(text='')
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+        return extractive_summary(text, SUMMARY_MAX_TOKENS)
+
+    def _save(self, lines):
+        if not lines:
+            return None
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self._store[file_id] = ''.join(json.dumps(line) + '\n' for line in lines).encode('utf-8')
+        return file_id
+
+    def _run(self, state):
+        outputs, errors = [], []
+        for line in self._store[state['input_file_id']].decode('utf-8').splitlines():
+            request = json.loads(line)
+            request_id = f"req_{uuid.uuid4().hex[:16]}"
+            try:
+                content = self.responder(request['body'])
+            except Exception as e:
+                errors.append({'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                               'custom_id': request['custom_id'],
+                               'response': {'status_code': 500, 'request_id': request_id,
+                                            'body': {'error': {'message': str(e)}}},
+                               'error': None})
+                continue
+            outputs.append({'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                            'custom_id': request['custom_id'],
+                            'response': {'status_code': 200, 'request_id': request_id, 'body': {
+                                'object': 'chat.completion', 'model': request['body']['model'],
+                                'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {
+                                    'role': 'assistant', 'content': content}}]}},
+                            'error': None})
+        state.update(status='completed', output_file_id=self._save(outputs),
+                     error_file_id=self._save(errors), completed=len(outputs),
+                     total=len(outputs) + len(errors))
@@ -0,0 +1,397 @@
+"""
+Adaptive per-host politeness scheduler
+Limits concurrent requests per host, adjusting each host's limit with
+AIMD (additive increase, multiplicative decrease) from observed latency,
+errors and 429s, honours robots.txt crawl-delay, and fails fast through
+a per-host circuit breaker while a host is down
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import requests
+from .utils import HTTP_TIMEOUT
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.politeness')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Statuses that mean "slow down"
+_BACKOFF_STATUSES = {429, 503}
+_ROBOTS_TTL = 24 * 3600
+_EWMA_ALPHA = 0.2
+
+# Consecutive failures that open a host's circuit, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+
+# Circuit states
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class HostState:
+    """Concurrency limit and health statistics for one host."""
+
+    __slots__ = ('limit', 'in_flight', 'next_allowed', 'crawl_delay',
+                 'latency', 'baseline_latency', 'error_rate', 'throttle_rate',
+                 'circuit', 'failures', 'opened_at')
+
+    def __init__(self, limit, crawl_delay):
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.next_allowed = 0.0
+        self.crawl_delay = crawl_delay
+        self.latency = None
+        self.baseline_latency = None
+        self.error_rate = 0.0
+        self.throttle_rate = 0.0
+        self.circuit = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+
+class RequestSlot:
+    """Handle for one in-flight request; call ``record`` with the outcome."""
+
+    __slots__ = ('status', 'error', 'retry_after')
+
+    def __init__(self):
+        self.status = None
+        self.error = False
+        self.retry_after = None
+
+    def record(self, status=None, error=False, retry_after=None):
+        self.status = status
+        self.error = error
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header (seconds or HTTP date).
+
+    Returns:
+        float: Seconds to wait, or None if absent or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class HostScheduler:
+    """
+    Gates requests per host.
+
+    Each host starts at ``initial_limit`` concurrent requests. Every
+    successful request adds ``1 / limit`` (about +1 per round trip of the
+    whole window) unless latency has doubled over the host's baseline;
+    429/503 responses, server errors and timeouts multiply the limit by
+    ``decrease``. Requests to a host are also spaced by its robots.txt
+    crawl-delay and by any Retry-After it sends.
+
+    After ``breaker_threshold`` consecutive failures (errors, timeouts,
+    5xx) a host's circuit opens and requests to it raise CircuitOpenError
+    at once. After ``breaker_cooldown`` seconds one probe request is let
+    through (half-open); its success closes the circuit, its failure
+    opens it again.
+    """
+
+    def __init__(self, initial_limit=2, min_limit=1, max_limit=16, decrease=0.5,
+                 user_agent=USER_AGENT, respect_robots=True,
+                 breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._hosts = {}
+        # host -> (fetched at, Future of its RobotFileParser)
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+        self._condition = threading.Condition()
+
+    def _robots_entry(self, host):
+        """
+        Returns the host's robots.txt future and whether the caller owns it.
+        Only the owner fetches (``_fetch_robots``); concurrent callers for
+        the same host wait on the same future.
+        """
+        with self._robots_lock:
+            cached = self._robots.get(host)
+            if cached and (not cached[1].done() or time.time() - cached[0] < _ROBOTS_TTL):
+                return cached[1], False
+            future = Future()
+            self._robots[host] = (time.time(), future)
+            return future, True
+
+    def _fetch_robots(self, scheme, host, future):
+        """Downloads a host's robots.txt and resolves its future."""
+        parser = RobotFileParser()
+        try:
+            response = requests.get(f"{scheme}://{host}/robots.txt", timeout=HTTP_TIMEOUT,
+                                    headers={'User-Agent': self.user_agent})
+            if response.status_code == 200:
+                parser.parse(response.text.splitlines())
+            else:
+                parser.parse([])
+        except requests.RequestException as e:
+            logger.warning(f"Could not fetch robots.txt for {host}: {e}")
+            parser.parse([])
+        finally:
+            if not parser.mtime():
+                # Unexpected error: treat the host as having no rules
+                parser.parse([])
+            with self._robots_lock:
+                self._robots[host] = (time.time(), future)
+            future.set_result(parser)
+
+    def _robots_stale(self, host):
+        """bool: Whether the host's robots.txt was never fetched or has expired."""
+        with self._robots_lock:
+            cached = self._robots.get(host)
+            return cached is None or (cached[1].done() and time.time() - cached[0] >= _ROBOTS_TTL)
+
+    def _robots_for(self, scheme, host):
+        """Returns the cached robots.txt parser for a host, fetching it if stale."""
+        future, owner = self._robots_entry(host)
+        if owner:
+            self._fetch_robots(scheme, host, future)
+        return future.result()
+
+    def crawl_delay(self, url):
+        """float: robots.txt crawl-delay for the URL's host (0 if none)."""
+        if not self.respect_robots:
+            return 0.0
+        parts = urlsplit(url)
+        parser = self._robots_for(parts.scheme or 'https', parts.netloc)
+        delay = parser.crawl_delay(self.user_agent)
+        return float(delay) if delay else 0.0
+
+    def _state(self, url):
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None or (self.respect_robots and self._robots_stale(host)):
+            # Resolve robots.txt outside the lock (fetched once per host, and
+            # again when it expires so long-running processes see changes)
+            self._condition.release()
+            try:
+                delay = self.crawl_delay(url)
+            finally:
+                self._condition.acquire()
+            state = self._hosts.setdefault(host, HostState(self.initial_limit, delay))
+            state.crawl_delay = delay
+        return host, state
+
+    def _check_circuit(self, host, state):
+        """
+        Raises CircuitOpenError unless the host may be contacted. Must be
+        called with the lock held.
+        """
+        if state.circuit == OPEN:
+            if time.monotonic() - state.opened_at < self.breaker_cooldown:
+                raise CircuitOpenError(f"Circuit open for {host}")
+            state.circuit = HALF_OPEN
+            logger.info(f"Circuit half-open for {host}: sending a probe request")
+        elif state.circuit == HALF_OPEN and state.in_flight:
+            # Only the probe may be in flight; others fail fast
+            raise CircuitOpenError(f"Circuit half-open for {host}, probe in flight")
+
+    def acquire(self, url):
+        """
+        Blocks until a request to the URL's host may start.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        with self._condition:
+            host, state = self._state(url)
+            while True:
+                self._check_circuit(host, state)
+                wait = state.next_allowed - time.monotonic()
+                if state.in_flight < int(state.limit) and wait <= 0:
+                    break
+                self._condition.wait(timeout=wait if wait > 0 else None)
+            state.in_flight += 1
+            state.next_allowed = time.monotonic() + state.crawl_delay
+            return host
+
+    def try_acquire(self, url):
+        """
+        Non-blocking variant of ``acquire`` for event loops.
+
+        Returns:
+            tuple: (host, 0.0) if the request may start, else (None, seconds to wait)
+        """
+        with self._condition:
+            host, state = self._state(url)
+            self._check_circuit(host, state)
+            wait = state.next_allowed - time.monotonic()
+            if state.in_flight < int(state.limit) and wait <= 0:
+                state.in_flight += 1
+                state.next_allowed = time.monotonic() + state.crawl_delay
+                return host, 0.0
+            return None, max(wait, 0.05)
+
+    def release(self, host, latency, slot):
+        """Records a finished request and adapts the host's limit."""
+        with self._condition:
+            state = self._hosts[host]
+            state.in_flight -= 1
+
+            throttled = slot.status in _BACKOFF_STATUSES
+            failed = slot.error or (slot.status is not None and slot.status >= 500)
+            self._update_circuit(host, state, failed)
+            state.throttle_rate += _EWMA_ALPHA * (throttled - state.throttle_rate)
+            state.error_rate += _EWMA_ALPHA * (failed - state.error_rate)
+
+            if throttled or failed:
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+                pause = slot.retry_after if slot.retry_after is not None else state.crawl_delay
+                state.next_allowed = max(state.next_allowed, time.monotonic() + pause)
+                logger.info(f"Backing off {host}: limit {state.limit:.1f}, "
+                            f"status {slot.status}, pause {pause:.1f}s")
+            else:
+                state.latency = latency if state.latency is None else \
+                    state.latency + _EWMA_ALPHA * (latency - state.latency)
+                if state.baseline_latency is None or latency < state.baseline_latency:
+                    state.baseline_latency = latency
+                if state.latency < 2 * state.baseline_latency:
+                    state.limit = min(self.max_limit, state.limit + 1.0 / state.limit)
+
+            self._condition.notify_all()
+
+    def _update_circuit(self, host, state, failed):
+        """Counts consecutive failures and opens or closes the host's circuit."""
+        if not failed:
+            if state.circuit != CLOSED:
+                logger.info(f"Circuit closed for {host}")
+            state.circuit = CLOSED
+            state.failures = 0
+            return
+        state.failures += 1
+        if state.circuit == HALF_OPEN or state.failures >= self.breaker_threshold:
+            if state.circuit != OPEN:
+                logger.warning(f"Circuit opened for {host} after {state.failures} failures; "
+                               f"failing fast for {self.breaker_cooldown}s")
+            state.circuit = OPEN
+            state.opened_at = time.monotonic()
+
+    @contextmanager
+    def slot(self, url):
+        """
+        Context manager around one request to ``url``.
+
+        Exceptions raised inside the block are recorded as errors unless an
+        outcome was already recorded (e.g. a "not found" that is not the
+        host's fault). A transport error after a 2xx status (a body read
+        that fails) has to set ``slot.error`` itself.
+
+        Yields:
+            RequestSlot: Call ``record(status, retry_after=...)`` with the outcome
+        """
+        host = self.acquire(url)
+        slot = RequestSlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception:
+            if slot.status is None:
+                slot.error = True
+            raise
+        finally:
+            self.release(host, time.monotonic() - start, slot)
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        """
+        Async counterpart of ``slot`` that waits without blocking the event loop.
+        A request cancelled inside the block (e.g. by a deadline) counts as
+        an error, whatever status was recorded.
+
+        Yields:
+            RequestSlot: Call ``record(status, retry_after=...)`` with the outcome
+        """
+        parts = urlsplit(url)
+        if self.respect_robots and (parts.netloc not in self._hosts
+                                    or self._robots_stale(parts.netloc)):
+            # First request to the host (or robots.txt expired): fetch it off
+            # the event loop, once, however many requests to the host start together
+            future, owner = self._robots_entry(parts.netloc)
+            if owner:
+                await asyncio.to_thread(self._fetch_robots, parts.scheme or 'https',
+                                        parts.netloc, future)
+            else:
+                await asyncio.wrap_future(future)
+        while True:
+            host, wait = self.try_acquire(url)
+            if host:
+                break
+            await asyncio.sleep(wait)
+
+        slot = RequestSlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            # Deadline hit while holding the slot, also after a 2xx status
+            slot.error = True
+            raise
+        except Exception:
+            if slot.status is None:
+                slot.error = True
+            raise
+        finally:
+            self.release(host, time.monotonic() - start, slot)
+
+    def get(self, session, url, **kwargs):
+        """
+        Performs ``session.get`` through the scheduler.
+
+        Returns:
+            requests.Response: The response (status not checked)
+        """
+        with self.slot(url) as slot:
+            response = session.get(url, **kwargs)
+            slot.record(response.status_code,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After')))
+            return response
+
+    def stats(self):
+        """dict: Per-host limit, in-flight count, latency and error/429 rates."""
+        with self._condition:
+            return {
+                host: {
+                    'limit': round(state.limit, 2),
+                    'in_flight': state.in_flight,
+                    'latency': state.latency,
+                    'error_rate': round(state.error_rate, 3),
+                    'throttle_rate': round(state.throttle_rate, 3),
+                    'crawl_delay': state.crawl_delay,
+                    'circuit': state.circuit,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+# Scheduler shared by every fetch in the process
+scheduler = HostScheduler()
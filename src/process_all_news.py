@@ -4,31 +4,60 @@ Contains functions to scrape articles from various news sources
 """
 
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from .summarizer import summarize_with_openai
-from config.config import AI_NEWS_URL, MIT_NEWS_URL, STANFORD_NEWS_URL, YOUTUBE_API_KEY, YOUTUBE_CHANNELS
-from .email_sender import send_combined_email_report
-from .scraper import scrape_articles_AI_news, get_article_content, scrape_mit_articles, get_mit_article_content, scrape_stanford_articles, get_stanford_article_content
+from .summarizer import summarize_with_openai, summarize_texts, submits_whole_input
+from config.config import YOUTUBE_API_KEY, YOUTUBE_CHANNELS
+from .email_sender import send_combined_email_report, report_url_for
+from .scraper import scrape_source, get_source_content
+from .sources import SOURCES
 from .youtube_scraper import process_youtube_channels
+from .models import CSV_FIELDS
+from .archive import append_to_archive
+from .search_index import index_articles
+from .report_site import update_site, week_page
+from .dedup import collapse_duplicates
+from .checkpoint import RunCheckpoint
+from .relevance import filter_relevant
+from .run_budget import (RunBudget, priority, save_deferred, load_deferred, clear_deferred,
+                         LLM, EXTRACTIVE, DEFERRED)
 import csv
+from concurrent.futures import ThreadPoolExecutor, wait
+try:
+    from .async_fetcher import fetch_contents_sync
+except ImportError:  # httpx not installed: fall back to the threaded fetcher
+    fetch_contents_sync = None
 
 # Get logger
 logger = logging.getLogger('ai_news_scraper.processor')
 
+# Concurrent article downloads (per-host limits are enforced by src.politeness)
+# Thread pool size used only when httpx is unavailable
+FETCH_WORKERS = 8
+
+# Seconds each source may spend in discovery and, separately, in content
+# downloads before its remaining work is abandoned for this run
+SOURCE_DEADLINE = float(os.getenv('SOURCE_DEADLINE', '120'))
+
+# Articles summarized between checkpoint writes
+SUMMARIZE_CHUNK = 16
+
 def save_to_csv(articles, filename) -> None:
     """
     Save articles to CSV file.
     
     Args:
-        articles (List[Dict]): List of articles to save
+        articles (List[Article]): List of articles to save
         filename (str): Path to save the CSV file
     """
     try:
-        keys = ['Title', 'Date', 'Link','Summary', 'Source']
         with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=keys, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(articles)
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(
+                (a.title, a.date_str, a.link, a.summary, a.source) for a in articles
+            )
         logger.info(f"Articles saved to CSV: {filename}")
     except Exception as e:
         logging.error(f"Error saving to CSV: {e}")
@@ -39,7 +68,7 @@ def save_to_html(articles, date_str, filename):
     Save articles to a styled HTML file.
     
     Args:
-        articles (list): List of processed articles
+        articles (list[Article]): List of processed articles
         date_str (str): Date range string for the title
         filename (str): Path to save the HTML file
     """
@@ -50,9 +79,6 @@ def save_to_html(articles, date_str, filename):
             logging.warning("No articles to save to HTML")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame(articles)
-        
         # Define function to make links clickable
         def make_clickable(val):
             return f'<a href="{val}" target="_blank">{val}</a>'
@@ -134,25 +160,30 @@ def save_to_html(articles, date_str, filename):
         """
 
         # Group articles by source
-        sources = sorted(set(article['Source'] for article in articles))
+        by_source = {}
+        for article in articles:
+            by_source.setdefault(article.source, []).append(article)
         
-        for source in sources:
-            source_articles = [a for a in articles if a['Source'] == source]
+        for source in sorted(by_source):
+            source_articles = by_source[source]
             if source_articles:
-                # Create DataFrame for this source
-                df_source = pd.DataFrame(source_articles)
-                
-                # Select and reorder columns
+                # Create DataFrame for this source (dates already formatted by to_row)
                 columns_to_display = ['Title', 'Date', 'Link', 'Summary']
-                df_display = df_source[columns_to_display].copy()
+                df_display = pd.DataFrame(
+                    [a.to_row() for a in source_articles], columns=CSV_FIELDS
+                )[columns_to_display]
                 
-                # Format the date column
-                df_display['Date'] = df_display['Date'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else '')
+                # Link cell lists the article plus any near-duplicate copies
+                df_display['Link'] = [
+                    '<br>'.join(
+                        [make_clickable(a.link)] +
+                        [f'{d.source}: {make_clickable(d.link)}' for d in a.duplicates]
+                    )
+                    for a in source_articles
+                ]
                 
                 # Style the DataFrame
-                df_styled = df_display.style\
-                    .format({'Link': make_clickable})\
-                    .set_table_styles(styles)
+                df_styled = df_display.style.set_table_styles(styles)
                 
                 # Add source section to HTML
                 html_template += f"""
@@ -178,111 +209,344 @@ def save_to_html(articles, date_str, filename):
         logger.error(f"Error saving to HTML: {e}")
         raise
 
-def process_all_news(recipients, target_date=None):
+def week_range(target_date=None):
+    """
+    Compute the reporting week ending on the target date.
+    
+    Args:
+        target_date (str, optional): Last day in YYYY-MM-DD format (default: today)
+        
+    Returns:
+        tuple: (start date, end date, "start to end" string)
+    """
+    end_date = (datetime.strptime(target_date, '%Y-%m-%d').date() 
+               if target_date else datetime.now().date())
+    start_date = end_date - timedelta(days=7)
+    date_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+    return start_date, end_date, date_str
+
+def discover_source(spec, start_date, end_date):
+    """
+    Scrape the listing of one source and keep articles in the date range.
+    
+    Args:
+        spec (SourceSpec): Source to scrape
+        start_date (date): First day of the range
+        end_date (date): Last day of the range
+        
+    Returns:
+        list[Article]: Relevant articles in range, content not fetched yet
+    """
+    source_articles = []  # Artículos para esta fuente
+    for article in scrape_source(spec, since=start_date):
+        # Check if article is within date range
+        if article.date and start_date <= article.date <= end_date:
+            article.source = spec.name
+            source_articles.append(article)
+    logger.info(f"Found {len(source_articles)} articles from {spec.name}")
+    # Off-topic items are dropped before their pages are downloaded
+    return filter_relevant(source_articles)
+
+def discover_source_articles(start_date, end_date, deadline=SOURCE_DEADLINE):
+    """
+    Scrape the listings of every source and keep articles in the date range.
+    
+    Sources are scraped concurrently; a source that has not finished within
+    ``deadline`` seconds is skipped for this run.
+    
+    Args:
+        start_date (date): First day of the range
+        end_date (date): Last day of the range
+        deadline (float): Seconds allowed per source
+        
+    Returns:
+        list[Article]: Articles in range, content not fetched yet
+    """
+    all_articles = []
+    executor = ThreadPoolExecutor(max_workers=len(SOURCES))
+    futures = {executor.submit(discover_source, spec, start_date, end_date): spec for spec in SOURCES}
+    finished, late = wait(futures, timeout=deadline)
+    # Keep report order stable regardless of completion order
+    for future, spec in futures.items():
+        if future in late:
+            logger.error(f"Skipping {spec.name}: discovery exceeded {deadline:.0f}s deadline")
+            continue
+        try:
+            all_articles.extend(future.result())
+        except Exception as e:
+            logger.error(f"Error processing {spec.name}: {e}")
+    # Do not wait for late sources; their requests end with the HTTP timeouts
+    executor.shutdown(wait=False, cancel_futures=True)
+    return all_articles
+
+def fetch_contents(articles, checkpoint=None, deadline=SOURCE_DEADLINE, fetcher=None):
+    """
+    Download the content of every article concurrently.
+    
+    Downloads of a source still pending after ``deadline`` seconds are
+    abandoned (and left for a resumed run when a checkpoint is given).
+    
+    Args:
+        articles (list[Article]): Articles from ``discover_source_articles``
+        checkpoint (RunCheckpoint, optional): Records each fetched article
+            and skips those fetched by an earlier attempt of the run
+        deadline (float): Seconds allowed per source
+        fetcher (PersistentFetcher, optional): Long-lived connection pool to
+            download through (see ``async_fetcher``)
+    """
+    specs = {spec.name: spec for spec in SOURCES}
+    done = checkpoint.completed_items('fetch') if checkpoint else {}
+
+    if done:
+        logger.info(f"Reusing {len(done)} fetched articles from checkpoint")
+    pending = []
+    for article in articles:
+        if article.link in done:
+            article.content = done[article.link]
+        else:
+            pending.append(article)
+
+    def store(article, content):
+        article.content = content or ''
+        # Failed or abandoned downloads are not recorded, so a resumed run retries them
+        if checkpoint and article.content:
+            checkpoint.record_item('fetch', article.link, article.content)
+
+    expires = time.monotonic() + deadline
+    if fetcher is not None or fetch_contents_sync is not None:
+        # One event loop and connection pool for every download
+        jobs = [(specs[a.source], a.link) for a in pending]
+        fetch = fetcher.fetch_contents if fetcher is not None else fetch_contents_sync
+        results = fetch(jobs, on_result=lambda i, content: store(pending[i], content),
+                        deadlines={name: expires for name in specs})
+    else:
+        def fetch_before_deadline(article):
+            if time.monotonic() >= expires:
+                return None
+            content = get_source_content(specs[article.source], article.link)
+            store(article, content)
+            return content
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            results = list(executor.map(fetch_before_deadline, pending))
+
+    abandoned = {}
+    for article, content in zip(pending, results):
+        if content is None:
+            abandoned[article.source] = abandoned.get(article.source, 0) + 1
+    for source, count in abandoned.items():
+        logger.error(f"{source}: {count} article downloads abandoned at the {deadline:.0f}s deadline")
+
+def collect_youtube_videos(checkpoint=None):
+    """
+    Collect recent videos with transcripts from the configured channels.
+    
+    Args:
+        checkpoint (RunCheckpoint, optional): Records each transcript and
+            reuses those fetched by an earlier attempt of the run
+    
+    Returns:
+        list[Article]: Videos with their transcript as content
+    """
+    try:
+        if YOUTUBE_API_KEY and YOUTUBE_CHANNELS:
+            youtube_articles = process_youtube_channels(
+                YOUTUBE_API_KEY, 
+                YOUTUBE_CHANNELS,
+                max_videos=10,
+                summarize=False,
+                checkpoint=checkpoint
+            )
+            logger.info(f"Added {len(youtube_articles)} YouTube videos to articles")
+            return youtube_articles
+        logger.info("YouTube processing skipped: API key or channels not configured")
+    except Exception as e:
+        logger.error(f"Error processing YouTube channels: {e}")
+    return []
+
+def summarize_articles(articles, checkpoint=None, budget=None):
+    """
+    Summarize every article that has content, in chunks so that progress
+    survives a crash when a checkpoint is given.
+    
+    With a budget, articles are taken in priority order and each chunk is
+    split between the configured backend, extractive summaries and
+    deferral (see ``src.run_budget``).
+    
+    Args:
+        articles (list[Article]): Articles (one per story) to summarize
+        checkpoint (RunCheckpoint, optional): Records each summary and
+            reuses those from an earlier attempt of the run
+        budget (RunBudget, optional): Deadline and token/cost limits
+        
+    Returns:
+        list[Article]: Articles deferred by the budget (empty without one)
+    """
+    done = checkpoint.completed_items('summarize') if checkpoint else {}
+    pending = []
+    for article in articles:
+        if article.link in done:
+            article.summary = done[article.link]
+        elif article.content:
+            pending.append(article)
+
+    if done:
+        logger.info(f"Reusing {len(done)} summaries from checkpoint")
+    if budget:
+        pending.sort(key=priority, reverse=True)
+
+    # Batch API backends get everything in one submission
+    chunk_size = max(len(pending), 1) if submits_whole_input() else SUMMARIZE_CHUNK
+    deferred = []
+    for i in range(0, len(pending), chunk_size):
+        chunk = pending[i:i + chunk_size]
+        tiers = budget.plan(chunk) if budget else {LLM: chunk}
+        deferred += tiers.get(DEFERRED, [])
+        for tier, backend in ((LLM, None), (EXTRACTIVE, 'extractive')):
+            batch = tiers.get(tier, [])
+            started = time.monotonic()
+            for article, summary in zip(batch, summarize_texts([a.content for a in batch], backend)):
+                article.summary = summary
+                # Backends return "" on failure: leave those for a resumed run
+                if checkpoint and summary:
+                    checkpoint.record_item('summarize', article.link, summary)
+            if budget:
+                budget.charge(tier, batch, time.monotonic() - started)
+    if budget:
+        budget.log_summary()
+    return deferred
+
+def render_outputs(articles, date_str, end_date):
+    """
+    Write the CSV and HTML reports and update the archive, search index and
+    report site.
+    
+    Args:
+        articles (list[Article]): Summarized articles
+        date_str (str): Date range string for the report title
+        end_date (date): Last day of the range, used in file names
+    """
+    end_date_str = end_date.strftime('%Y-%m-%d')
+    
+    # Save to CSV
+    csv_path = f"data/articles_week_{end_date_str}.csv"
+    save_to_csv(articles, csv_path)
+    
+    # Append to the columnar archive (non-fatal)
+    try:
+        append_to_archive(articles)
+    except Exception as e:
+        logger.error(f"Error appending to Parquet archive: {e}")
+    
+    # Save to HTML
+    html_path = f"results/articles_week_{end_date_str}.html"
+    save_to_html(articles, date_str, html_path)
+    
+    # Update the full-text search index (non-fatal)
+    try:
+        index_articles(articles)
+    except Exception as e:
+        logger.error(f"Error updating search index: {e}")
+    
+    # Re-render the changed pages of the static report site (non-fatal)
+    try:
+        update_site(articles, date_str, end_date)
+    except Exception as e:
+        logger.error(f"Error updating report site: {e}")
+
+def process_all_news(recipients, target_date=None, resume_run_id=None):
     """
     Process news from all sources and send combined email.
     
+    Every stage (discovery, fetch, summarize, render, email) is checkpointed
+    under data/runs/<run_id>/; passing ``resume_run_id`` continues a failed
+    run from its last completed stage and item. Summarization honours
+    RUN_DEADLINE_MINUTES and the LLM token/cost budget (``src.run_budget``).
+    
     Args:
         recipients (str or list): Email recipient(s)
         target_date (str, optional): Target date in YYYY-MM-DD format
+        resume_run_id (str, optional): Run to resume (its target date is reused)
         
     Returns:
         None
     """
     try:
+        budget = RunBudget.from_env()
+        if resume_run_id:
+            checkpoint = RunCheckpoint.load(resume_run_id)
+            target_date = checkpoint.params.get('target_date')
+        else:
+            checkpoint = RunCheckpoint.create({'target_date': target_date})
+
         # Set date range
-        end_date = (datetime.strptime(target_date, '%Y-%m-%d').date() 
-                   if target_date else datetime.now().date())
-        start_date = end_date - timedelta(days=7)
-        date_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+        start_date, end_date, date_str = week_range(target_date)
 
         logger.info(f"Processing news for date range: {date_str}")
 
-        # Get and process articles
-        all_articles = []
-        source_counts = {}  # Para llevar la cuenta de artículos por fuente
-
-        source_configs = [
-            ('AI News', scrape_articles_AI_news, get_article_content),
-            ('MIT News', scrape_mit_articles, get_mit_article_content),
-            ('Stanford News', scrape_stanford_articles, get_stanford_article_content)
-        ]
-
-        # Collect articles from all sources
-        for source_name, scraper_func, content_func in source_configs:
-            try:
-                logger.info(f"Processing source: {source_name}")
-                url = globals()[f"{source_name.upper().replace(' ', '_')}_URL"]
-                articles = scraper_func(url)
-                
-                source_articles = []  # Artículos para esta fuente
-
-                # Process each article
-                for article in articles:
-                    article_date = article.get('Date')
-                    
-                    # Check if article is within date range
-                    if article_date and start_date <= article_date <= end_date:
-                        # Get and summarize content
-                        content = content_func(article['Link'])
-                        if content:
-                            article['Summary'] = "not summary yet" #summarize_with_openai(content)
-                        article['Source'] = source_name
-                        all_articles.append(article)
-                        source_articles.append(article)
-
-                source_counts[source_name] = len(source_articles)
-                logger.info(f"Found {len(source_articles)} articles from {source_name}")
-        
-            except Exception as e:
-                logger.error(f"Error processing {source_name}: {e}")
-                source_counts[source_name] = 0
-                continue
+        # Discovery: listings of all web sources
+        if checkpoint.is_done('discovery'):
+            all_articles = checkpoint.load_articles('discovery')
+        else:
+            all_articles = discover_source_articles(start_date, end_date)
+            checkpoint.mark_done('discovery', all_articles)
 
-        # Process YouTube channels
-        try:
-            if YOUTUBE_API_KEY and YOUTUBE_CHANNELS:
-                youtube_articles = process_youtube_channels(
-                    YOUTUBE_API_KEY, 
-                    YOUTUBE_CHANNELS,
-                    max_videos=10
-                )
-                
-                all_articles = all_articles.extend(youtube_articles)
-                source_counts['YouTube'] = len(youtube_articles)
-                logger.info(f"Added {len(youtube_articles)} YouTube videos to articles")
-            else:
-                logger.info("YouTube processing skipped: API key or channels not configured")
-                source_counts['YouTube'] = 0
-            
-        except Exception as e:
-            logger.error(f"Error processing YouTube channels: {e}")
-            source_counts['YouTube'] = 0
+        # Fetch: article content and YouTube transcripts
+        if checkpoint.is_done('fetch'):
+            all_articles = checkpoint.load_articles('fetch')
+        else:
+            fetch_contents(all_articles, checkpoint)
+            all_articles.extend(collect_youtube_videos(checkpoint))
+            checkpoint.mark_done('fetch', all_articles)
 
         # Log total counts
+        source_counts = {}  # Para llevar la cuenta de artículos por fuente
+        for article in all_articles:
+            source_counts[article.source] = source_counts.get(article.source, 0) + 1
         logger.info(f"Total articles collected: {len(all_articles)}")
         for source, count in source_counts.items():
             logger.info(f"  - {source}: {count} articles")
         
+        # Summarize: collapse the same story reported by several sources, then
+        # summarize each story once, within the run's deadline and LLM budget.
+        # Items deferred by an earlier run are carried into this one.
+        if checkpoint.is_done('summarize'):
+            all_articles = checkpoint.load_articles('summarize')
+        else:
+            links = {a.link for a in all_articles}
+            carried = [a for a in load_deferred() if a.link not in links]
+            if carried:
+                logger.info(f"Carrying over {len(carried)} items deferred by an earlier run")
+            try:
+                all_articles = collapse_duplicates(all_articles + carried)
+            except Exception as e:
+                logger.error(f"Error collapsing duplicate articles: {e}")
+                all_articles += carried
+            deferred = summarize_articles(all_articles, checkpoint, budget)
+            if deferred:
+                save_deferred(deferred)
+                deferred_links = {a.link for a in deferred}
+                all_articles = [a for a in all_articles if a.link not in deferred_links]
+            clear_deferred(all_articles)
+            checkpoint.mark_done('summarize', all_articles)
 
         if all_articles:
             # Create date string for filenames
             end_date_str = end_date.strftime('%Y-%m-%d')
             
-            # Save to CSV
-            csv_path = f"data/articles_week_{end_date_str}.csv"
-            save_to_csv(all_articles, csv_path)
-            
-            # Save to HTML
-            html_path = f"results/articles_week_{end_date_str}.html"
-            save_to_html(all_articles, date_str, html_path)
+            if not checkpoint.is_done('render'):
+                render_outputs(all_articles, date_str, end_date)
+                checkpoint.mark_done('render')
             
-            # Send email
-            send_combined_email_report(all_articles, date_str, recipients)
+            # Send email, linking capped sections to the hosted report
+            if not checkpoint.is_done('email'):
+                report_url = report_url_for(week_page(end_date))
+                send_combined_email_report(all_articles, date_str, recipients, report_url)
+                checkpoint.mark_done('email')
             logger.info("Articles processed, saved, and email sent successfully!")
         else:
             logger.info(f"No articles found for date range: {date_str}")
     
     except Exception as e:
         logger.error(f"Error in process_all_news: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,443 @@
+"""
+Compressed archive of raw fetched payloads
+Every downloaded article page and video transcript is kept, zstd
+compressed with a dictionary trained per source, so content can be
+re-extracted and re-summarized offline after a selector or model change.
+Pages are stored as downloaded: the streaming reader stops once the
+article container has closed, so an archived page usually ends there and
+only a selector inside that part of the page can be re-extracted
+
+Layout under RAW_ARCHIVE_DIR, one directory per source:
+    seg-000001.zst ...  append-only segments of independent zstd frames
+    index.jsonl         one line per record: key, kind, segment, offset,
+                        length, dictionary version, fetch time
+    dict-1.zdict ...    trained dictionaries (version 0 = no dictionary)
+
+Reads memory-map the segment and decompress a single frame.
+
+Usage:
+    python -m src.raw_archive stats
+    python -m src.raw_archive reextract --since 2025-01-01 [--summarize]
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.raw_archive')
+
+RAW_ARCHIVE_DIR = "data/raw"
+
+# Set RAW_ARCHIVE=0 to stop keeping raw payloads
+RAW_ARCHIVE_ENABLED = os.getenv('RAW_ARCHIVE', '1') not in ('', '0')
+
+# Segments are closed and a new one started past this size
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+# A source's dictionary is trained once this many records exist without one
+DICT_TRAIN_RECORDS = 100
+DICT_SIZE = 112 * 1024
+COMPRESSION_LEVEL = 10
+
+HTML, TRANSCRIPT = 'html', 'transcript'
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("The raw archive requires the zstandard package") from e
+    return zstandard
+
+
+def _slug(source):
+    return _SLUG_RE.sub('-', source.lower()).strip('-') or 'unknown'
+
+
+class _SourceStore:
+    """Segments, index and dictionaries of one source."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index = {}  # (kind, key) -> latest entry
+        self.entries = 0
+        self.undictionaried = 0
+        self._index_pos = 0
+        self._dicts = {}
+        self._maps = {}
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.jsonl')
+
+    def refresh(self):
+        """Reads index lines appended since the last call (by any process)."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Partially written by another process
+                entry = json.loads(line)
+                self.index[(entry['kind'], entry['key'])] = entry
+                self.entries += 1
+                if not entry['dict']:
+                    self.undictionaried += 1
+                self._index_pos += len(line)
+
+    def dictionary_version(self):
+        versions = [int(name[5:-6]) for name in os.listdir(self.directory)
+                    if name.startswith('dict-') and name.endswith('.zdict')]
+        return max(versions, default=0)
+
+    def dictionary(self, version):
+        if version not in self._dicts:
+            with open(os.path.join(self.directory, f"dict-{version}.zdict"), 'rb') as f:
+                self._dicts[version] = _zstd().ZstdCompressionDict(f.read())
+        return self._dicts[version]
+
+    def segment(self):
+        """Returns (number, path) of the segment to append to."""
+        numbers = [int(name[4:-4]) for name in os.listdir(self.directory)
+                   if name.startswith('seg-') and name.endswith('.zst')]
+        number = max(numbers, default=1)
+        path = os.path.join(self.directory, f"seg-{number:06d}.zst")
+        if os.path.exists(path) and os.path.getsize(path) >= SEGMENT_BYTES:
+            number += 1
+            path = os.path.join(self.directory, f"seg-{number:06d}.zst")
+        return number, path
+
+    def read_frame(self, entry):
+        """Returns the compressed bytes of a record through a memory map."""
+        number = entry['segment']
+        end = entry['offset'] + entry['length']
+        mapped = self._maps.get(number)
+        if mapped is None or len(mapped) < end:
+            # The segment grew since it was mapped
+            if mapped is not None:
+                mapped.close()
+            path = os.path.join(self.directory, f"seg-{number:06d}.zst")
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[number] = mapped
+        return mapped[entry['offset']:end]
+
+    def close(self):
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+
+class RawArchive:
+    """
+    Append-only, per-source zstd archive of raw payloads.
+
+    Records are keyed by (kind, key), e.g. ('html', url) or
+    ('transcript', video_id); storing a key again appends a new record and
+    the index points at the latest one.
+    """
+
+    def __init__(self, root=RAW_ARCHIVE_DIR):
+        self.root = root
+        self._stores = {}
+        # Reentrant: _store() takes it too, also when called under it
+        self._lock = threading.RLock()
+
+    def _store(self, source):
+        slug = _slug(source)
+        with self._lock:
+            if slug not in self._stores:
+                directory = os.path.join(self.root, slug)
+                os.makedirs(directory, exist_ok=True)
+                self._stores[slug] = _SourceStore(directory)
+                self._stores[slug].refresh()
+            return self._stores[slug]
+
+    @contextmanager
+    def _locked(self, store):
+        """Serializes appends across threads and processes."""
+        with self._lock, open(os.path.join(store.directory, '.lock'), 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                # Locks the first byte; retries for about 10s, then raises OSError
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def put(self, source, key, payload, kind=HTML):
+        """
+        Appends a payload.
+
+        Args:
+            source (str): Source name (one directory and dictionary per source)
+            key (str): Record key, e.g. the page URL or video id
+            payload (str | bytes): Raw content
+            kind (str): HTML or TRANSCRIPT
+
+        Returns:
+            dict: Index entry of the new record
+        """
+        zstandard = _zstd()
+        data = payload.encode('utf-8') if isinstance(payload, str) else payload
+        store = self._store(source)
+        with self._locked(store):
+            store.refresh()
+            version = store.dictionary_version()
+            # Retried every DICT_TRAIN_RECORDS records if training fails
+            if not version and store.undictionaried and store.undictionaried % DICT_TRAIN_RECORDS == 0:
+                version = self._train(store)
+            compressor = zstandard.ZstdCompressor(
+                level=COMPRESSION_LEVEL, dict_data=store.dictionary(version) if version else None)
+            frame = compressor.compress(data)
+
+            number, path = store.segment()
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+            entry = {
+                'key': key, 'kind': kind, 'segment': number, 'offset': offset,
+                'length': len(frame), 'size': len(data), 'dict': version,
+                'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            with open(store.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            store.refresh()
+        return entry
+
+    def _train(self, store, max_samples=2000):
+        """Trains the next dictionary version from the source's stored records."""
+        zstandard = _zstd()
+        samples = [self._decompress(store, entry)
+                   for entry in list(store.index.values())[-max_samples:]]
+        version = store.dictionary_version() + 1
+        try:
+            trained = zstandard.train_dictionary(DICT_SIZE, samples, level=COMPRESSION_LEVEL)
+        except zstandard.ZstdError as e:
+            logger.warning(f"Dictionary training failed for {store.directory}: {e}")
+            return version - 1
+        path = os.path.join(store.directory, f"dict-{version}.zdict")
+        with open(path + '.tmp', 'wb') as f:
+            f.write(trained.as_bytes())
+        os.replace(path + '.tmp', path)
+        logger.info(f"Trained zstd dictionary {path} from {len(samples)} records")
+        return version
+
+    def train(self, source):
+        """
+        Trains a new dictionary for a source; later records use it.
+
+        Returns:
+            int: New dictionary version (unchanged if training failed)
+        """
+        store = self._store(source)
+        with self._locked(store):
+            store.refresh()
+            return self._train(store)
+
+    def _decompress(self, store, entry):
+        dict_data = store.dictionary(entry['dict']) if entry['dict'] else None
+        decompressor = _zstd().ZstdDecompressor(dict_data=dict_data)
+        return decompressor.decompress(store.read_frame(entry))
+
+    def get(self, source, key, kind=HTML):
+        """
+        Returns:
+            str or None: Latest payload stored under the key, decoded as UTF-8
+        """
+        with self._lock:
+            store = self._store(source)
+            entry = store.index.get((kind, key))
+            if entry is None:
+                store.refresh()
+                entry = store.index.get((kind, key))
+            if entry is None:
+                return None
+            return self._decompress(store, entry).decode('utf-8', errors='replace')
+
+    def records(self, source, kind=None):
+        """
+        Lists the latest record of every key of a source.
+
+        Returns:
+            list[dict]: Index entries
+        """
+        with self._lock:
+            store = self._store(source)
+            store.refresh()
+            return [e for (k, _), e in store.index.items() if kind is None or k == kind]
+
+    def sources(self):
+        """list[str]: Source directories present in the archive."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def stats(self):
+        """
+        Returns:
+            dict: Source directory -> records, raw and stored bytes
+        """
+        result = {}
+        for slug in self.sources():
+            with self._lock:
+                store = self._store(slug)
+                store.refresh()
+                entries = list(store.index.values())
+                version = store.dictionary_version()
+            result[slug] = {
+                'records': len(entries),
+                'raw_bytes': sum(e['size'] for e in entries),
+                'stored_bytes': sum(e['length'] for e in entries),
+                'dictionary': version,
+            }
+        return result
+
+    def close(self):
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+
+
+raw_archive = RawArchive()
+
+
+def archive_raw(source, key, payload, kind=HTML):
+    """
+    Stores a fetched payload in the shared archive; failures only log.
+
+    Args:
+        source (str): Source name
+        key (str): Page URL or video id
+        payload (str | bytes): Raw content
+        kind (str): HTML or TRANSCRIPT
+    """
+    if not RAW_ARCHIVE_ENABLED or not payload:
+        return
+    try:
+        raw_archive.put(source, key, payload, kind)
+    except Exception as e:
+        logger.warning(f"Could not archive raw {kind} for {key}: {e}")
+
+
+def _video_id(article):
+    """Video id of a YouTube item; the search index only keeps its watch link."""
+    if article.video_id:
+        return article.video_id
+    parts = urlsplit(article.link or '')
+    if parts.netloc.endswith('youtube.com') and parts.path == '/watch':
+        return parse_qs(parts.query).get('v', [None])[0]
+    return None
+
+
+def reextract_articles(articles, archive=None):
+    """
+    Rebuilds article content from archived raw payloads, without network.
+
+    Pages go through the current extraction rules of their source; videos
+    get the text of their archived transcript.
+
+    Args:
+        articles (list[Article]): Articles with link/source (and video_id)
+        archive (RawArchive, optional): Defaults to the shared archive
+
+    Returns:
+        int: Number of articles whose content was rebuilt
+    """
+    from .models import Transcript, TranscriptSegment
+    from .scraper import extract_content
+    from .sources import SOURCES
+    archive = archive or raw_archive
+    specs = {spec.name: spec for spec in SOURCES}
+    rebuilt = 0
+    for article in articles:
+        try:
+            video_id = _video_id(article)
+            if video_id:
+                payload = archive.get('youtube', video_id, TRANSCRIPT)
+                if payload is None:
+                    continue
+                data = json.loads(payload)
+                segments = [TranscriptSegment(**s) for s in data.pop('segments', [])]
+                content = Transcript(segments=segments, **data).text
+            else:
+                spec = specs.get(article.source)
+                payload = archive.get(article.source, article.link, HTML) if spec else None
+                if payload is None:
+                    continue
+                content = extract_content(spec, payload, article.link)
+        except Exception as e:
+            logger.error(f"Error re-extracting {article.link}: {e}")
+            continue
+        if content:
+            article.content = content
+            rebuilt += 1
+    logger.info(f"Re-extracted {rebuilt} of {len(articles)} articles from the raw archive")
+    return rebuilt
+
+
+def main(argv=None):
+    """Command line entry point for inspecting the archive and offline re-extraction"""
+    parser = argparse.ArgumentParser(description="Raw page and transcript archive")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='Records and compression per source')
+    train = commands.add_parser('train', help='Train a new dictionary for a source')
+    train.add_argument('source')
+    reextract = commands.add_parser('reextract', help='Rebuild indexed content from raw payloads')
+    reextract.add_argument('--since', help='Earliest date (YYYY-MM-DD)')
+    reextract.add_argument('--until', help='Latest date (YYYY-MM-DD)')
+    reextract.add_argument('--summarize', action='store_true', help='Also regenerate summaries')
+    parser.add_argument('--root', default=RAW_ARCHIVE_DIR, help='Archive directory')
+    args = parser.parse_args(argv)
+
+    archive = RawArchive(args.root)
+    if args.command == 'stats':
+        for slug, info in archive.stats().items():
+            ratio = info['raw_bytes'] / info['stored_bytes'] if info['stored_bytes'] else 0
+            print(f"{slug:<24}{info['records']:>8} records {info['raw_bytes'] / 1e6:>9.1f} MB raw "
+                  f"{info['stored_bytes'] / 1e6:>8.1f} MB stored ({ratio:.1f}x, dict v{info['dictionary']})")
+    elif args.command == 'train':
+        print(f"dictionary v{archive.train(args.source)}")
+    else:
+        from .search_index import load_articles, index_articles
+        from .summarizer import summarize_texts
+        start_date = datetime.strptime(args.since, '%Y-%m-%d').date() if args.since else None
+        end_date = datetime.strptime(args.until, '%Y-%m-%d').date() if args.until else None
+        articles = load_articles(start_date, end_date)
+        reextract_articles(articles, archive)
+        if args.summarize:
+            with_content = [a for a in articles if a.content]
+            for article, summary in zip(with_content, summarize_texts([a.content for a in with_content])):
+                article.summary = summary
+        index_articles(articles)
+    archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+"""
+Generic article body extraction
+A readability-style extractor: one HTMLParser pass scores every block
+element by the paragraph text it holds, its link density and its class/id
+names, then keeps the paragraphs of the best one. The winning container of
+each domain is remembered as a simple selector, so later pages of that
+domain go straight to it (and the download can stop once it has closed)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.readability')
+
+# Learned per-domain container selectors
+HINTS_PATH = "data/extractor_hints.json"
+
+# Bodies shorter than this are not trusted (nor learned as hints)
+MIN_ARTICLE_CHARS = 250
+
+# Paragraphs with more link text than this are navigation, not body
+MAX_PARAGRAPH_LINK_DENSITY = 0.5
+
+# Elements whose text never belongs to the article body
+SKIP_TAGS = frozenset((
+    'script', 'style', 'noscript', 'template', 'svg', 'nav', 'footer', 'aside',
+    'form', 'button', 'select', 'figcaption', 'iframe', 'header',
+))
+# Elements that hold paragraph text
+TEXT_TAGS = frozenset(('p', 'pre', 'blockquote', 'h2', 'h3', 'h4', 'li'))
+# Elements that can be the article container
+CONTAINER_TAGS = frozenset(('div', 'article', 'section', 'main', 'td', 'body'))
+# Elements dropped whole when their class/id looks like page furniture
+FURNITURE_TAGS = frozenset(('div', 'section', 'ul', 'ol', 'span', 'td'))
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+))
+
+_POSITIVE = re.compile(r'article|body|content|entry|main|post|story|text', re.IGNORECASE)
+_NEGATIVE = re.compile(
+    r'(?<![a-z])ads?(?![a-z])|banner|caption|comment|contact|cookie|footer|gallery|meta|modal|'
+    r'nav|newsletter|popup|promo|related|share|sidebar|slide|social|sponsor|subscribe|widget',
+    re.IGNORECASE)
+_HINT_CLASS = re.compile(r'^[A-Za-z][\w-]*$')
+
+
+class _Node:
+    """An open element and the paragraph score collected under it."""
+    __slots__ = ('tag', 'attrs', 'score', 'text_chars', 'link_chars', 'skip', 'parent')
+
+    def __init__(self, tag, attrs, skip, parent=None):
+        self.tag = tag
+        self.parent = parent
+        self.attrs = attrs
+        self.score = 0.0
+        self.text_chars = 0
+        self.link_chars = 0
+        self.skip = skip
+
+    def class_weight(self):
+        names = f"{self.attrs.get('class') or ''} {self.attrs.get('id') or ''}"
+        weight = 0
+        if _NEGATIVE.search(names):
+            weight -= 25
+        if _POSITIVE.search(names):
+            weight += 25
+        return weight
+
+
+def _matches(node, hint):
+    tag, classes, element_id = hint
+    if tag and node.tag != tag:
+        return False
+    if element_id and node.attrs.get('id') != element_id:
+        return False
+    return classes <= set((node.attrs.get('class') or '').split())
+
+
+def parse_hint(selector):
+    """Returns (tag, classes, id) for a ``tag.class`` or ``tag#id`` selector."""
+    match = re.match(r'^([a-z][a-z0-9]*)?((?:[.#][\w-]+)*)$', selector or '')
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    classes = set(re.findall(r'\.([\w-]+)', match.group(2)))
+    ids = re.findall(r'#([\w-]+)', match.group(2))
+    return match.group(1) or None, classes, ids[0] if ids else None
+
+
+class _DensityParser(HTMLParser):
+    """
+    Single pass over the page: paragraphs are collected with the ids of
+    their open ancestors, and each paragraph's score is credited to its
+    parent container (fully) and grandparent (half), as readability does.
+    """
+
+    def __init__(self, hint=None):
+        super().__init__(convert_charrefs=True)
+        self.hint = hint
+        self.stack = []
+        self.nodes = []
+        self.paragraphs = []  # (text, link_chars, ancestor node ids)
+        self.hinted = None
+        self._text = None
+        self._link_depth = 0
+
+    def _skipping(self):
+        return bool(self.stack) and self.stack[-1][1].skip
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br' and self._text is not None:
+                self._text[0].append(' ')
+            return
+        attrs = dict(attrs)
+        names = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+        skip = self._skipping() or tag in SKIP_TAGS or (
+            tag in FURNITURE_TAGS and _NEGATIVE.search(names) is not None
+            and not _POSITIVE.search(names))
+        node = _Node(tag, attrs, skip, self.stack[-1][0] if self.stack else None)
+        node_id = len(self.nodes)
+        self.nodes.append(node)
+        self.stack.append((node_id, node))
+        if self.hint and self.hinted is None and _matches(node, self.hint):
+            self.hinted = node_id
+        if tag == 'a':
+            self._link_depth += 1
+        if tag in TEXT_TAGS and self._text is None and not skip:
+            # [text parts, link chars, index in stack]
+            self._text = ([], [0], len(self.stack) - 1)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open tag; unclosed children close with it
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][1].tag == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            _, node = self.stack.pop()
+            if node.tag == 'a':
+                self._link_depth = max(self._link_depth - 1, 0)
+            if self._text is not None and self._text[2] >= len(self.stack):
+                self._finish_paragraph()
+
+    def handle_data(self, data):
+        if self._text is not None and not self._skipping():
+            self._text[0].append(data)
+            if self._link_depth:
+                self._text[1][0] += len(data.strip())
+
+    def _finish_paragraph(self):
+        parts, link_chars, _ = self._text
+        self._text = None
+        text = ' '.join(''.join(parts).split())
+        if not text:
+            return
+        ancestors = [node_id for node_id, _ in self.stack]
+        self.paragraphs.append((text, link_chars[0], ancestors))
+        # Readability-style paragraph score: commas and length count
+        score = 1 + text.count(',') + min(len(text) / 100, 3)
+        containers = [n for _, n in self.stack if n.tag in CONTAINER_TAGS]
+        for i, node in enumerate(reversed(containers[-2:])):
+            node.score += score / (1 + i)
+        for node in containers:
+            node.text_chars += len(text)
+            node.link_chars += link_chars[0]
+
+    def close(self):
+        super().close()
+        if self._text is not None:
+            self._finish_paragraph()
+
+    def best_node(self):
+        """Returns the id of the highest-scoring container, or None."""
+        best, best_score = None, 0.0
+        for node_id, node in enumerate(self.nodes):
+            if node.skip or not node.score:
+                continue
+            link_density = node.link_chars / node.text_chars if node.text_chars else 1
+            score = (node.score + node.class_weight()) * (1 - link_density)
+            if score > best_score:
+                best, best_score = node_id, score
+        # Widen to article-named wrappers holding no other text: they make a
+        # more stable hint when a body is split over several blocks
+        while best is not None:
+            parent_id = self.nodes[best].parent
+            parent = self.nodes[parent_id] if parent_id is not None else None
+            if (parent is None or parent.skip or parent.tag not in CONTAINER_TAGS
+                    or parent.text_chars != self.nodes[best].text_chars
+                    or not _POSITIVE.search(f"{parent.attrs.get('class') or ''} {parent.attrs.get('id') or ''}")):
+                break
+            best = parent_id
+        return best
+
+    def text_of(self, node_id, skip_phrases=()):
+        """Joins the body paragraphs inside a container."""
+        parts = []
+        for text, link_chars, ancestors in self.paragraphs:
+            if node_id not in ancestors or link_chars > MAX_PARAGRAPH_LINK_DENSITY * len(text):
+                continue
+            if any(phrase in text for phrase in skip_phrases):
+                continue
+            parts.append(text)
+        return ' '.join(parts)
+
+
+def hint_for(node):
+    """
+    Builds a simple selector identifying a container.
+
+    Returns:
+        str or None: ``tag#id`` or ``tag.class1.class2``; None when the
+        element has no stable name
+    """
+    element_id = node.attrs.get('id') or ''
+    if _HINT_CLASS.match(element_id) and not re.search(r'\d{3,}', element_id):
+        return f"{node.tag}#{element_id}"
+    classes = [c for c in (node.attrs.get('class') or '').split()
+               if _HINT_CLASS.match(c) and not re.search(r'\d{3,}', c)]
+    if classes:
+        return node.tag + ''.join(f".{c}" for c in classes)
+    if node.tag in ('article', 'main'):
+        return node.tag
+    return None
+
+
+class HintCache:
+    """Per-domain container selectors, persisted as JSON."""
+
+    def __init__(self, path=HINTS_PATH):
+        self.path = path
+        self._hints = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._hints is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._hints = json.load(f)
+            except (OSError, ValueError):
+                self._hints = {}
+        return self._hints
+
+    def get(self, domain):
+        with self._lock:
+            return self._load().get(domain)
+
+    def set(self, domain, selector):
+        with self._lock:
+            hints = self._load()
+            if selector:
+                if hints.get(domain) == selector:
+                    return
+                hints[domain] = selector
+            elif hints.pop(domain, None) is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(hints, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save extractor hints: {e}")
+
+
+hints = HintCache()
+
+
+def _domain(url):
+    return urlparse(url).netloc.lower() if url else ''
+
+
+def container_hint(url):
+    """
+    Returns:
+        str or None: Learned container selector for the URL's domain
+    """
+    return hints.get(_domain(url)) if url else None
+
+
+def drop_hint(url):
+    """Forgets the learned container of the URL's domain."""
+    if url:
+        hints.set(_domain(url), None)
+
+
+def extract_main_text(html, url=None, skip_phrases=(), min_length=MIN_ARTICLE_CHARS,
+                      cache=None):
+    """
+    Extracts the article body of a page without site-specific rules.
+
+    When the domain has a learned container hint and the page has a
+    matching element with enough text, that element is used; otherwise the
+    densest container wins and becomes the domain's hint.
+
+    Args:
+        html (str): Page HTML (possibly cut off after the article)
+        url (str, optional): Page URL, used for per-domain hints
+        skip_phrases (tuple): Paragraphs containing any of these are dropped
+        min_length (int): Shorter bodies are treated as missing
+        cache (HintCache, optional): Hint store, defaults to the shared one
+
+    Returns:
+        str: Article text or empty string if nothing article-like was found
+    """
+    cache = cache or hints
+    domain = _domain(url)
+    hint = cache.get(domain) if domain else None
+    parser = _DensityParser(parse_hint(hint))
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        logger.error(f"Error parsing page {url or ''}: {e}")
+        return ""
+
+    if parser.hinted is not None:
+        text = parser.text_of(parser.hinted, skip_phrases)
+        if len(text) >= min_length:
+            return text
+
+    best = parser.best_node()
+    if best is None:
+        return ""
+    text = parser.text_of(best, skip_phrases)
+    if len(text) < min_length:
+        return ""
+    if domain:
+        learned = hint_for(parser.nodes[best])
+        if learned and learned != hint:
+            logger.info(f"Learned content container for {domain}: {learned}")
+            cache.set(domain, learned)
+    return text
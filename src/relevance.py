@@ -0,0 +1,146 @@
+"""
+Topic relevance pre-filter
+Scores titles and descriptions against configurable topic profiles with a
+hashed TF-IDF model on sparse SciPy matrices, so off-topic items (and
+#shorts style clips) can be dropped before their content or transcript is
+fetched. Filtering is opt-in (RELEVANCE_MIN_SCORE); scores are always kept
+"""
+
+import json
+import logging
+import os
+import re
+import zlib
+import numpy as np
+from scipy import sparse
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.relevance')
+
+# Topic profiles: name -> keywords. Override with RELEVANCE_PROFILES, e.g.
+# '{"robotics": "robot robots robotics humanoid manipulation"}'
+DEFAULT_PROFILES = {
+    'ai': (
+        "ai artificial intelligence machine learning deep neural network networks model models "
+        "llm llms language gpt chatgpt openai anthropic claude gemini deepmind transformer "
+        "transformers generative genai agent agents agentic chatbot chatbots inference training "
+        "dataset datasets algorithm algorithms reinforcement diffusion multimodal vision "
+        "robot robots robotics autonomous automation computer computing gpu gpus nvidia "
+        "prompt prompts fine tuning embedding embeddings reasoning benchmark alignment "
+        "quantum chip chips semiconductor startup startups "
+        "ia inteligencia artificial aprendizaje automático modelo modelos datos robótica cuántico"
+    ),
+}
+PROFILES = json.loads(os.getenv('RELEVANCE_PROFILES', 'null')) or DEFAULT_PROFILES
+
+# Items scoring below this are dropped before fetching (0 keeps everything)
+RELEVANCE_MIN_SCORE = float(os.getenv('RELEVANCE_MIN_SCORE', '0'))
+
+# Score multiplier for clips tagged #shorts
+SHORTS_FACTOR = 0.5
+
+# Hashed vocabulary size
+N_FEATURES = 1 << 16
+
+_WORD_RE = re.compile(r'\w+')
+_SHORTS_RE = re.compile(r'#shorts?\b', re.IGNORECASE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its new of on or our "
+    "that the this to was we what when why will with you your "
+    "de del el en la las los un una y que por para con se al es su sus como".split()
+)
+
+
+def _hashed_terms(text):
+    """Returns the hashed feature index of every non-stopword token."""
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+    return np.fromiter((zlib.crc32(w.encode('utf-8')) % N_FEATURES for w in words),
+                       dtype=np.int64, count=len(words))
+
+
+def _term_matrix(texts):
+    """Builds a sparse (texts x N_FEATURES) CSR term-count matrix."""
+    terms = [_hashed_terms(text) for text in texts]
+    rows = np.repeat(np.arange(len(texts)), [len(t) for t in terms])
+    cols = np.concatenate(terms) if terms else np.zeros(0, dtype=np.int64)
+    # Repeated (row, term) pairs are summed into counts
+    matrix = sparse.csr_matrix((np.ones(len(cols), dtype=np.float32), (rows, cols)),
+                               shape=(len(texts), N_FEATURES))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def score_texts(texts, profiles=None):
+    """
+    Scores texts against topic profiles.
+
+    A text's score for a profile is the share of its TF-IDF weight that
+    falls on the profile's terms; the best profile wins. IDF is computed
+    over the scored texts, so words common to the whole batch (a source's
+    boilerplate, say) count for less.
+
+    Args:
+        texts (list[str]): Titles and descriptions to score
+        profiles (dict, optional): Profile name -> keywords, defaults to PROFILES
+
+    Returns:
+        numpy.ndarray: One score in [0, 1] per text
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    profiles = profiles or PROFILES
+    weights = _term_matrix(texts)
+
+    # Each stored entry is one (text, term) pair, so counting columns gives
+    # document frequencies
+    doc_freq = np.bincount(weights.indices, minlength=N_FEATURES)
+    idf = (np.log((1 + len(texts)) / (1 + doc_freq)) + 1).astype(np.float32)
+    # Sublinear term frequency keeps repeated words from dominating
+    weights.data = np.log1p(weights.data) * idf[weights.indices]
+
+    keywords = [' '.join(k) if isinstance(k, (list, tuple)) else k for k in profiles.values()]
+    profile_terms = _term_matrix(keywords)
+    profile_terms.data[:] = 1.0
+
+    totals = np.asarray(weights.sum(axis=1), dtype=np.float32).ravel()
+    on_topic = (weights @ profile_terms.T).toarray()
+    scores = np.divide(on_topic.max(axis=1), totals, out=np.zeros(len(texts), dtype=np.float32),
+                       where=totals > 0)
+    return scores
+
+
+def filter_relevant(articles, min_score=RELEVANCE_MIN_SCORE, profiles=None):
+    """
+    Scores articles from their title and description and drops off-topic ones.
+
+    Every kept article gets its ``relevance`` set, which the run budget uses
+    to order summaries.
+
+    Args:
+        articles (list[Article]): Articles whose content has not been fetched
+        min_score (float): Minimum score to keep an article (0 keeps all)
+        profiles (dict, optional): Profile name -> keywords
+
+    Returns:
+        list[Article]: Articles that passed, in their original order
+    """
+    if not articles:
+        return []
+    try:
+        scores = score_texts([f"{a.title} {a.description}" for a in articles], profiles)
+    except Exception as e:
+        logger.error(f"Error scoring relevance: {e}")
+        return articles
+
+    kept = []
+    for article, score in zip(articles, scores):
+        if _SHORTS_RE.search(f"{article.title} {article.description}"):
+            score *= SHORTS_FACTOR
+        article.relevance = round(float(score), 3)
+        if article.relevance >= min_score:
+            kept.append(article)
+        else:
+            logger.info(f"Dropped as off-topic ({article.relevance}): [{article.source}] {article.title}")
+    if len(kept) < len(articles):
+        logger.info(f"Relevance filter dropped {len(articles) - len(kept)} of {len(articles)} items")
+    return kept
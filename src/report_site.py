@@ -0,0 +1,329 @@
+"""
+Static report site
+Renders every reported week into a browsable site: an index of weeks,
+one page per week, one per week and source, and one archive page per
+source. Pages are fingerprinted by the data they show, so a run only
+re-renders the pages whose items changed; each written file also gets
+precompressed .gz and .br variants for the web server
+
+Layout under SITE_DIR:
+    index.html
+    weeks/<end date>/index.html, weeks/<end date>/<source>.html
+    sources/<source>.html
+    assets/style.<hash>.css
+    _data/<end date>.json   items of each week (without page content)
+    manifest.json           fingerprint of every page
+
+<source> is the source name as a slug, with a short hash of the name
+appended when two names only differ in case or punctuation.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter
+from html import escape
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.report_site')
+
+SITE_DIR = os.getenv('REPORT_SITE_DIR', 'results/site')
+
+# Bump to re-render every page after a template change
+SITE_VERSION = 1
+
+# Files at least this large get .gz/.br variants
+COMPRESS_MIN_BYTES = 256
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+STYLE = """
+body { font-family: Arial, sans-serif; margin: 20px; background-color: #f8f9fa; color: #333; }
+.container { max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px;
+             box-shadow: 0 0 10px rgba(0,0,0,0.1); }
+h1 { text-align: center; padding-bottom: 20px; border-bottom: 2px solid #914048; }
+nav { margin-bottom: 20px; font-size: 0.9em; }
+nav a { margin-right: 12px; color: #914048; }
+.source-header { background-color: #f5f5f5; padding: 10px; margin: 20px 0 10px 0; font-size: 1.2em;
+                 font-weight: bold; border-left: 4px solid #914048; }
+.item { margin: 0 0 16px 0; }
+.item .meta { color: #777; font-size: 0.85em; }
+.item .also { font-size: 0.85em; }
+table { border-collapse: collapse; width: 100%; }
+th { background-color: #914048; color: white; padding: 10px; border: 1px solid #ddd; }
+td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+""".strip()
+
+
+def _slug(source):
+    return _SLUG_RE.sub('-', (source or '').lower()).strip('-') or 'unknown'
+
+
+def _source_slugs(sources):
+    """
+    Maps every source name to its page name. Names that differ only in
+    case or punctuation would share a slug; those get a short hash of the
+    name appended.
+    """
+    counts = Counter(_slug(source) for source in sources)
+    return {source: _slug(source) if counts[_slug(source)] == 1 else
+            f"{_slug(source)}-{hashlib.sha256(source.encode('utf-8')).hexdigest()[:6]}"
+            for source in sources}
+
+
+def week_page(end_date):
+    """
+    Args:
+        end_date (date | str): Last day of the reported week
+
+    Returns:
+        str: Path of the week's page relative to the site root
+    """
+    end = end_date if isinstance(end_date, str) else end_date.strftime('%Y-%m-%d')
+    return f"weeks/{end}/index.html"
+
+
+def _item(article):
+    """Article as stored in the site data: everything but the page content."""
+    data = article.to_dict()
+    data.pop('content', None)
+    data['duplicates'] = [_item(d) for d in article.duplicates]
+    return data
+
+
+def _fingerprint(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False)
+                          .encode('utf-8')).hexdigest()[:16]
+
+
+def _write(root, relpath, data, compress=True):
+    """Writes a file atomically, with .gz and .br variants."""
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    variants = {'': data}
+    if compress and len(data) >= COMPRESS_MIN_BYTES:
+        # mtime=0 keeps unchanged pages byte-identical between runs
+        variants['.gz'] = gzip.compress(data, compresslevel=9, mtime=0)
+        try:
+            import brotli
+            variants['.br'] = brotli.compress(data, mode=brotli.MODE_TEXT)
+        except ImportError:
+            pass
+    for suffix, content in variants.items():
+        tmp_path = f"{path}{suffix}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path + suffix)
+
+
+def _remove(root, relpath):
+    for suffix in ('', '.gz', '.br'):
+        path = os.path.join(root, relpath) + suffix
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _rel(from_page, to_path):
+    """Relative link from one page to another file of the site."""
+    return os.path.relpath(to_path, os.path.dirname(from_page) or '.').replace(os.sep, '/')
+
+
+def _layout(page, title, css, body, nav=()):
+    links = ''.join(f'<a href="{escape(_rel(page, target))}">{escape(label)}</a>'
+                    for label, target in (('All weeks', 'index.html'),) + tuple(nav))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<link rel="stylesheet" href="{escape(_rel(page, css))}">
+</head>
+<body>
+<div class="container">
+<nav>{links}</nav>
+<h1>{escape(title)}</h1>
+{body}
+</div>
+</body>
+</html>
+"""
+
+
+def _render_items(items):
+    parts = []
+    for item in items:
+        also = ''.join(f' <a href="{escape(d["link"])}">{escape(d["source"])}</a>'
+                       for d in item.get('duplicates', []))
+        parts.append(
+            f'<div class="item"><a href="{escape(item["link"])}"><strong>{escape(item["title"])}</strong></a>'
+            f'<div class="meta">{escape(item.get("date") or "")}</div>'
+            f'<div>{escape(item.get("summary") or "")}</div>'
+            + (f'<div class="also">Also covered by:{also}</div>' if also else '')
+            + '</div>')
+    return '\n'.join(parts)
+
+
+def _by_source(items):
+    groups = {}
+    for item in items:
+        groups.setdefault(item.get('source') or '', []).append(item)
+    return dict(sorted(groups.items()))
+
+
+def _load_weeks(root):
+    """Returns {end date: week data}, newest first."""
+    data_dir = os.path.join(root, '_data')
+    weeks = {}
+    if os.path.isdir(data_dir):
+        for name in os.listdir(data_dir):
+            if name.endswith('.json'):
+                with open(os.path.join(data_dir, name), encoding='utf-8') as f:
+                    weeks[name[:-5]] = json.load(f)
+    return dict(sorted(weeks.items(), reverse=True))
+
+
+def _pages(weeks, css):
+    """
+    Yields (relpath, inputs, render) for every page of the site; ``render``
+    is only called when the page's fingerprint changed.
+    """
+    summary = [(end, week['date_str'], {s: len(i) for s, i in _by_source(week['items']).items()})
+               for end, week in weeks.items()]
+    # Slugs go into the fingerprints of the pages linking to them: a new
+    # colliding source renames an existing source's pages
+    slugs = _source_slugs(sorted({s for _, _, counts in summary for s in counts}))
+
+    def render_index(page='index.html'):
+        rows = ''.join(
+            f'<tr><td><a href="{escape(week_page(end))}">{escape(date_str)}</a></td>'
+            f'<td>{sum(counts.values())}</td>'
+            f'<td>{escape(", ".join(f"{s} ({n})" for s, n in counts.items()))}</td></tr>'
+            for end, date_str, counts in summary)
+        sources = ''.join(f'<a href="sources/{slug}.html">{escape(s)}</a> '
+                          for s, slug in slugs.items())
+        body = (f'<p>Sources: {sources}</p>'
+                f'<table><tr><th>Week</th><th>Items</th><th>Sources</th></tr>{rows}</table>')
+        return _layout(page, 'AI News Summary', css, body)
+
+    yield 'index.html', (summary, slugs), render_index
+
+    sources = {}
+    for end, week in weeks.items():
+        groups = _by_source(week['items'])
+        page = week_page(end)
+        nav = tuple((s, f"weeks/{end}/{slugs[s]}.html") for s in groups)
+
+        def render_week(page=page, week=week, groups=groups, nav=nav):
+            body = ''.join(f'<div class="source-header">{escape(s)}</div>{_render_items(items)}'
+                           for s, items in groups.items())
+            return _layout(page, f"AI News Summary - {week['date_str']}", css, body, nav)
+
+        yield page, (week['date_str'], week['items'], nav), render_week
+
+        for source, items in groups.items():
+            sources.setdefault(source, []).append((end, week['date_str'], items))
+            source_page = f"weeks/{end}/{slugs[source]}.html"
+            archive_page = f"sources/{slugs[source]}.html"
+
+            def render_week_source(page=source_page, end=end, week=week, source=source, items=items,
+                                   archive_page=archive_page):
+                return _layout(page, f"{source} - {week['date_str']}", css, _render_items(items),
+                               (('This week', week_page(end)), (f"All {source}", archive_page)))
+
+            yield source_page, (week['date_str'], source, items, archive_page), render_week_source
+
+    for source, entries in sources.items():
+        page = f"sources/{slugs[source]}.html"
+        listing = [(end, date_str, [(i['title'], i['link'], i.get('date')) for i in items])
+                   for end, date_str, items in entries]
+
+        def render_source(page=page, source=source, listing=listing):
+            body = ''.join(
+                f'<div class="source-header"><a href="{escape(_rel(page, week_page(end)))}">'
+                f'{escape(date_str)}</a></div><ul>'
+                + ''.join(f'<li><a href="{escape(link)}">{escape(title)}</a> '
+                          f'<span class="meta">{escape(day or "")}</span></li>'
+                          for title, link, day in items)
+                + '</ul>'
+                for end, date_str, items in listing)
+            return _layout(page, f"{source} - all weeks", css, body)
+
+        yield page, (source, listing), render_source
+
+
+def build_site(root=SITE_DIR):
+    """
+    Renders the pages whose data changed and removes pages that no longer exist.
+
+    Args:
+        root (str): Site directory
+
+    Returns:
+        dict: Counts of rendered, unchanged and removed pages
+    """
+    manifest_path = os.path.join(root, 'manifest.json')
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {'pages': {}}
+
+    # The stylesheet name carries its hash, so browsers can cache it forever
+    css_data = STYLE.encode('utf-8')
+    css = f"assets/style.{hashlib.sha256(css_data).hexdigest()[:10]}.css"
+    if not os.path.exists(os.path.join(root, css)):
+        _write(root, css, css_data)
+    # Older stylesheets, also ones left behind when the manifest was lost
+    assets = os.path.join(root, 'assets')
+    for name in os.listdir(assets):
+        if re.fullmatch(r'style\.[0-9a-f]+\.css', name) and f"assets/{name}" != css:
+            _remove(root, f"assets/{name}")
+
+    pages = {}
+    stats = {'rendered': 0, 'unchanged': 0, 'removed': 0}
+    for relpath, inputs, render in _pages(_load_weeks(root), css):
+        fingerprint = _fingerprint(SITE_VERSION, css, inputs)
+        pages[relpath] = fingerprint
+        if (manifest['pages'].get(relpath) == fingerprint
+                and os.path.exists(os.path.join(root, relpath))):
+            stats['unchanged'] += 1
+            continue
+        _write(root, relpath, render().encode('utf-8'))
+        stats['rendered'] += 1
+
+    for relpath in set(manifest['pages']) - set(pages):
+        _remove(root, relpath)
+        stats['removed'] += 1
+
+    _write(root, 'manifest.json', json.dumps({'css': css, 'pages': pages}, indent=1,
+                                             sort_keys=True).encode('utf-8'), compress=False)
+    logger.info(f"Report site {root}: {stats['rendered']} pages rendered, "
+                f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+    return stats
+
+
+def update_site(articles, date_str, end_date, root=SITE_DIR):
+    """
+    Stores a week's items and brings the site up to date.
+
+    Args:
+        articles (list[Article]): Summarized articles of the week
+        date_str (str): Date range string for page titles
+        end_date (date): Last day of the week, used as the week's id
+        root (str): Site directory
+
+    Returns:
+        dict: Counts of rendered, unchanged and removed pages
+    """
+    end = end_date.strftime('%Y-%m-%d')
+    week = {'date_str': date_str, 'items': [_item(a) for a in articles]}
+    data_path = os.path.join(root, '_data', f"{end}.json")
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    with open(data_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(week, f, ensure_ascii=False)
+    os.replace(data_path + '.tmp', data_path)
+    return build_site(root)
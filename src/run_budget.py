@@ -0,0 +1,242 @@
+"""
+Deadline- and budget-aware summarization planning
+Ranks items by recency and source weight and decides, as the run
+progresses, which get a full LLM summary, which a cheaper extractive one
+and which are deferred to the next run, so the report ships within the
+wall-clock slot and the token/cost budget
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import date
+from .extractive import estimate_tokens, INPUT_TOKEN_BUDGET
+from .models import Article
+from .summarizer import SUMMARY_MAX_TOKENS, SUMMARIZER_BACKEND, is_paid
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.run_budget')
+
+# Wall-clock limit for a whole run (0: no limit) and time kept for render/email
+RUN_DEADLINE_MINUTES = float(os.getenv('RUN_DEADLINE_MINUTES', '0'))
+RENDER_RESERVE_SECONDS = 60
+
+# LLM budget per run (0: unlimited), and prices used to convert tokens to cost
+RUN_TOKEN_BUDGET = int(os.getenv('RUN_TOKEN_BUDGET', '0'))
+RUN_COST_BUDGET = float(os.getenv('RUN_COST_BUDGET', '0'))
+PRICE_PER_1K_INPUT = float(os.getenv('LLM_PRICE_PER_1K_INPUT', '0.03'))
+PRICE_PER_1K_OUTPUT = float(os.getenv('LLM_PRICE_PER_1K_OUTPUT', '0.06'))
+
+# Relative importance of each source, e.g. '{"MIT News": 1.5}' (default 1.0)
+SOURCE_WEIGHTS = json.loads(os.getenv('SOURCE_WEIGHTS', '{}'))
+
+# An item loses half its priority every RECENCY_HALF_LIFE_DAYS
+RECENCY_HALF_LIFE_DAYS = 3
+
+# Initial per-item duration estimates, refined as summaries complete
+LLM_SECONDS_PER_ITEM = 5.0
+EXTRACTIVE_SECONDS_PER_ITEM = 0.05
+
+DEFERRED_PATH = "data/deferred.json"
+
+# Summary tiers
+LLM, EXTRACTIVE, DEFERRED = 'llm', 'extractive', 'deferred'
+
+
+def priority(article, today=None):
+    """
+    Scores an article for summarization order.
+
+    Args:
+        article (Article): Article with date, source, duplicates and relevance
+        today (date, optional): Reference day, defaults to today
+
+    Returns:
+        float: Higher scores are summarized first
+    """
+    today = today or date.today()
+    age = (today - article.date).days if article.date else RECENCY_HALF_LIFE_DAYS * 2
+    recency = 0.5 ** (max(age, 0) / RECENCY_HALF_LIFE_DAYS)
+    # Stories covered by several sources matter more, as do on-topic ones
+    coverage = 1 + 0.5 * len(article.duplicates)
+    relevance = 1 + (article.relevance or 0)
+    return SOURCE_WEIGHTS.get(article.source, 1.0) * recency * coverage * relevance
+
+
+class RunBudget:
+    """
+    Tracks the time and tokens left in a run and assigns summary tiers.
+
+    Token and duration estimates use the extractive pre-pass cap on input
+    (INPUT_TOKEN_BUDGET) plus SUMMARY_MAX_TOKENS of output; duration
+    estimates follow the measured average as batches complete. Tokens and
+    cost are only counted and limited for paid backends; with the others
+    only the deadline applies.
+    """
+
+    def __init__(self, deadline=None, max_tokens=RUN_TOKEN_BUDGET, max_cost=RUN_COST_BUDGET,
+                 reserve_seconds=RENDER_RESERVE_SECONDS, backend=None):
+        """
+        Args:
+            deadline (float, optional): ``time.monotonic()`` value the run must finish by
+            max_tokens (int): LLM tokens allowed (0: unlimited)
+            max_cost (float): LLM spend allowed (0: unlimited)
+            reserve_seconds (float): Time kept for rendering and email
+            backend (str, optional): Summarizer backend of the LLM tier,
+                defaults to SUMMARIZER_BACKEND
+        """
+        backend = backend or SUMMARIZER_BACKEND
+        self.deadline = deadline
+        self.paid = is_paid(backend)
+        self.max_tokens = max_tokens if self.paid else 0
+        self.max_cost = max_cost if self.paid else 0
+        self.reserve_seconds = reserve_seconds
+        self.tokens_used = 0
+        self.cost_used = 0.0
+        llm_seconds = EXTRACTIVE_SECONDS_PER_ITEM if backend == EXTRACTIVE else LLM_SECONDS_PER_ITEM
+        self.seconds_per_item = {LLM: llm_seconds, EXTRACTIVE: EXTRACTIVE_SECONDS_PER_ITEM}
+        self.degraded = {EXTRACTIVE: [], DEFERRED: []}
+
+    @classmethod
+    def from_env(cls, started=None):
+        """
+        Budget configured by RUN_DEADLINE_MINUTES, RUN_TOKEN_BUDGET and RUN_COST_BUDGET.
+
+        Args:
+            started (float, optional): ``time.monotonic()`` at run start
+        """
+        started = started if started is not None else time.monotonic()
+        deadline = started + RUN_DEADLINE_MINUTES * 60 if RUN_DEADLINE_MINUTES else None
+        return cls(deadline)
+
+    def time_left(self):
+        """float: Seconds available for summarization (inf without a deadline)."""
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline - time.monotonic() - self.reserve_seconds
+
+    @staticmethod
+    def _llm_tokens(article):
+        tokens_in = min(estimate_tokens(article.content), INPUT_TOKEN_BUDGET)
+        return tokens_in, SUMMARY_MAX_TOKENS
+
+    @staticmethod
+    def _cost(tokens_in, tokens_out):
+        return (tokens_in * PRICE_PER_1K_INPUT + tokens_out * PRICE_PER_1K_OUTPUT) / 1000
+
+    def plan(self, articles):
+        """
+        Assigns a tier to each article of a batch, highest priority first.
+
+        Args:
+            articles (list[Article]): Articles with content
+
+        Returns:
+            dict: Tier name -> list of articles
+        """
+        tiers = {LLM: [], EXTRACTIVE: [], DEFERRED: []}
+        time_left = self.time_left()
+        tokens = self.tokens_used
+        cost = self.cost_used
+        for article in articles:
+            tokens_in, tokens_out = self._llm_tokens(article)
+            item_cost = self._cost(tokens_in, tokens_out)
+            over_tokens = self.max_tokens and tokens + tokens_in + tokens_out > self.max_tokens
+            over_cost = self.max_cost and cost + item_cost > self.max_cost
+            if not (over_tokens or over_cost) and time_left >= self.seconds_per_item[LLM]:
+                tiers[LLM].append(article)
+                tokens += tokens_in + tokens_out
+                cost += item_cost
+                time_left -= self.seconds_per_item[LLM]
+            elif time_left >= self.seconds_per_item[EXTRACTIVE]:
+                reason = 'token budget' if over_tokens else 'cost budget' if over_cost else 'deadline'
+                tiers[EXTRACTIVE].append(article)
+                self.degraded[EXTRACTIVE].append((article, reason))
+                time_left -= self.seconds_per_item[EXTRACTIVE]
+            else:
+                tiers[DEFERRED].append(article)
+                self.degraded[DEFERRED].append((article, 'deadline'))
+        return tiers
+
+    def charge(self, tier, articles, seconds):
+        """
+        Records completed summaries.
+
+        Args:
+            tier (str): LLM or EXTRACTIVE
+            articles (list[Article]): Articles summarized
+            seconds (float): Wall-clock time taken
+        """
+        if not articles:
+            return
+        if tier == LLM and self.paid:
+            for article in articles:
+                tokens_in, tokens_out = self._llm_tokens(article)
+                self.tokens_used += tokens_in + tokens_out
+                self.cost_used += self._cost(tokens_in, tokens_out)
+        measured = seconds / len(articles)
+        self.seconds_per_item[tier] += 0.5 * (measured - self.seconds_per_item[tier])
+
+    def log_summary(self):
+        """Logs the spend and every degraded item."""
+        spent = [f"~{self.tokens_used} tokens", f"~${self.cost_used:.2f}"] if self.paid else []
+        if self.deadline:
+            spent.append(f"{self.time_left():.0f}s left before render")
+        if spent:
+            logger.info(f"Summarization budget: {', '.join(spent)}")
+        outcomes = {EXTRACTIVE: 'got extractive summaries', DEFERRED: 'deferred to the next run'}
+        for tier, items in self.degraded.items():
+            for article, reason in items:
+                logger.warning(f"{tier} ({reason}): [{article.source}] {article.title}")
+            if items:
+                logger.warning(f"{len(items)} items {outcomes[tier]}")
+
+
+def _write_deferred(articles, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump([a.to_dict() for a in articles], f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def save_deferred(articles, path=DEFERRED_PATH):
+    """
+    Persists articles deferred to the next run (merging with earlier ones).
+
+    Args:
+        articles (list[Article]): Articles not summarized in this run
+        path (str): JSON file holding deferred articles
+    """
+    pending = {a.link: a for a in load_deferred(path)}
+    pending.update((a.link, a) for a in articles)
+    _write_deferred(list(pending.values()), path)
+
+
+def load_deferred(path=DEFERRED_PATH):
+    """
+    Returns:
+        list[Article]: Articles deferred by earlier runs
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [Article.from_dict(d) for d in json.load(f)]
+
+
+def clear_deferred(articles, path=DEFERRED_PATH):
+    """
+    Drops articles that have now been summarized from the deferred file,
+    together with the duplicates collapsed into them.
+
+    Args:
+        articles (list[Article]): Articles summarized in this run
+        path (str): JSON file holding deferred articles
+    """
+    links = {a.link for a in articles} | {d.link for a in articles for d in a.duplicates}
+    remaining = [a for a in load_deferred(path) if a.link not in links]
+    if remaining:
+        _write_deferred(remaining, path)
+    elif os.path.exists(path):
+        os.remove(path)
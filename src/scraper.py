@@ -1,300 +1,358 @@
 """
 Web scraping functionality for AI News Scraper
-Contains functions to scrape articles from various news sources
+Contains the extractor that runs the declarative source specs in
+sources.py, plus the per-source entry points built on top of it
 """
 
+import json
 import logging
 from datetime import datetime
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
-import requests
 from requests.exceptions import RequestException
-from .utils import parse_article_date, setup_http_session
+from .utils import parse_article_date, setup_http_session, HTTP_TIMEOUT
+from .models import Article
+from .sources import AI_NEWS, MIT_NEWS, STANFORD_NEWS, JsonListing
+from .embedded_state import find_attribute_json, find_script_json
+from .feeds import discover_articles
+from .politeness import scheduler
+from .streaming import stream_html
+from .readability import extract_main_text, container_hint, drop_hint, MIN_ARTICLE_CHARS
+from .raw_archive import archive_raw
 
 # Initialize HTTP session
 session = setup_http_session()
 
-def scrape_articles_AI_news(url):
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+def fetch_page(url):
     """
-    Scrapes articles from the provided website URL.
-    
+    Downloads a page with the shared session, gated by the per-host scheduler.
+
     Args:
-        url (str): URL of the website to scrape articles from.
-    
+        url (str): Page URL
+
     Returns:
-        list: A list of dictionaries, where each dictionary contains article data (title, link, date).
+        bytes: Raw response body
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-        }
-        response = session.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        article_data = []
+    response = scheduler.get(session, url, timeout=HTTP_TIMEOUT, headers=DEFAULT_HEADERS)
+    response.raise_for_status()
+    return response.content
 
-        # Find the Featured section
-        featured_section = soup.find('section', class_='featured')
-        if featured_section:
 
-            # Find all featured article blocks with specific class
-            featured_blocks = featured_section.find_all('div', class_='cell blocks small-12 medium-3 large-3')
+def parse_source_date(value, date_format):
+    """
+    Parses a listing date according to a source's declared format.
 
-            for block in featured_blocks:
-                try:
-                    # Get the image link and title
-                    link_element = block.find('a', class_='img-link')
-                    title_element = block.find('h3')
-                    date_div = block.find('div', class_='content')  # Date extraction
-
-                    if link_element and title_element:
-                        title = link_element['title'].strip()  # Title is in the link's title attribute
-                        link = link_element['href'].strip()   # Article URL
-                        date_str = date_div.text.strip().split('|')[0].strip() if date_div else 'No date available'
-                        date = parse_article_date(date_str) 
-
-                        article_data.append({
-                            'Title': title,
-                            'Link': link,
-                            'Date': date,
-                            'Source': "AI News"
-                        })
-
-                except Exception as e:
-                    logging.warning(f"Error processing featured article: {e}")
-                    continue
+    Args:
+        value: Raw value ('text': free-form date string, 'iso': ISO 8601
+            timestamp, 'epoch_ms': milliseconds since the epoch)
+        date_format (str): One of 'text', 'iso' or 'epoch_ms'
 
-        # Get regular articles
-        regular_articles = soup.find_all('article')
-
-        for article in regular_articles:
-            try:
-                title = article.find('h3').get_text(strip=True)
-                link = article.find('a')['href']
-                date_div = article.find('div', class_='content')
-                date_str = date_div.text.strip().split('|')[0].strip() if date_div else 'No date available'
-                date = parse_article_date(date_str)
-
-                # Check if this article is already in our list
-                if not any(a['Link'] == link for a in article_data):
-                    article_data.append({
-                        'Title': title,
-                        'Link': link,
-                        'Date': date,
-                        'Source': "AI News"
-                    })
-            except Exception as e:
-                logging.warning(f"Error processing article: {e}")
+    Returns:
+        date: Parsed date or None
+    """
+    if not value:
+        return None
+    if date_format == 'iso':
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    if date_format == 'epoch_ms':
+        return datetime.fromtimestamp(value / 1000).date()
+    return parse_article_date(value)
+
+
+def _html_entries(page, rule):
+    """Yields (title, link, raw date) for each item matched by a ListingRule."""
+    for item in page.soup.select(rule.item):
+        try:
+            link_element = item.select_one(rule.link)
+            if not link_element or not link_element.get('href'):
                 continue
 
-        return article_data
+            if rule.title_attr:
+                title = link_element.get(rule.title_attr)
+            else:
+                title_element = item.select_one(rule.title) if rule.title else link_element
+                title = title_element.get_text(strip=True) if title_element else None
+
+            raw_date = None
+            if rule.date:
+                date_element = item.select_one(rule.date)
+                if date_element:
+                    raw_date = (date_element.get(rule.date_attr) if rule.date_attr
+                                else date_element.get_text().strip())
+                    if raw_date and rule.date_separator:
+                        raw_date = raw_date.split(rule.date_separator)[0].strip()
+
+            yield title, link_element['href'].strip(), raw_date
+        except Exception as e:
+            logging.warning(f"Error processing listing item: {e}")
+
+
+def _json_entries(page, rule):
+    """Yields (title, link, raw date) for each item in an embedded JSON payload."""
+    if rule.script_id:
+        payload = find_script_json(page.raw, rule.script_id)
+    else:
+        payload = find_attribute_json(page.raw, rule.attribute, rule.marker)
+        if payload is None and rule.container:
+            # Fall back to a full parse if the byte scan found nothing
+            container = page.soup.select_one(rule.container)
+            if container and container.get(rule.attribute):
+                payload = json.loads(container[rule.attribute])
+    if not payload:
+        return
+    for item in payload.get(rule.items_key, []):
+        yield item.get(rule.title_key), item.get(rule.link_key), item.get(rule.date_key)
+
+
+class _Page:
+    """Raw listing page whose HTML tree is only built if a rule needs it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._soup = None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.raw, 'html.parser')
+        return self._soup
+
+
+def scrape_source(spec, url=None, since=None):
+    """
+    Scrapes the listing page of a source described by a SourceSpec.
+
+    Sources with a feed or sitemap are discovered from it first (stopping
+    at ``since``); the HTML listing is only scraped if that yields nothing
+    or an explicit ``url`` is given.
+
+    The page is fetched once. HTML rules share a single parse of it, while
+    embedded JSON listings are read straight from the raw bytes, so pages
+    that only need their JSON state are never parsed. Links already seen
+    are skipped.
+
+    Args:
+        spec (SourceSpec): Source definition
+        url (str, optional): Listing URL, defaults to ``spec.url``
+        since (date, optional): Oldest date of interest for feed discovery
+
+    Returns:
+        list[Article]: Articles found on the page
+    """
+    discovery_url = spec.feed_url or spec.sitemap_url
+    if url is None and discovery_url:
+        articles = discover_articles(session, discovery_url, since, spec.name,
+                                     ordered=bool(spec.feed_url), headers=DEFAULT_HEADERS)
+        if articles:
+            return articles
+        logging.info(f"No feed results for {spec.name}, falling back to HTML listing")
+
+    try:
+        raw = fetch_page(url or spec.url)
     except RequestException as e:
-        logging.error(f"Request error: {e}")
+        logging.error(f"Request error scraping {spec.name}: {e}")
         return []
+    return parse_listing(spec, raw)
 
 
-# Function to fetch the content of an article
-def get_article_content(url):
+def parse_listing(spec, raw):
     """
-    Fetches the main content of an article from its URL.
+    Extracts articles from a downloaded listing page.
 
     Args:
-        url (str): URL of the article.
+        spec (SourceSpec): Source definition
+        raw (bytes): Listing page HTML
 
     Returns:
-        str: Extracted article content or None if extraction fails.
+        list[Article]: Articles found on the page
+    """
+    page = _Page(raw)
+    article_data = []
+    seen_links = set()
+    for rule in spec.listings:
+        entries = _json_entries if isinstance(rule, JsonListing) else _html_entries
+        try:
+            for title, link, raw_date in entries(page, rule):
+                if not title or not link:
+                    continue
+                if spec.base_url and not link.startswith('http'):
+                    link = urljoin(spec.base_url, link)
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+                try:
+                    date = parse_source_date(raw_date, rule.date_format)
+                except (ValueError, TypeError) as e:
+                    logging.warning(f"Unparseable date {raw_date!r} from {spec.name}: {e}")
+                    date = None
+                article_data.append(Article(title=title.strip(), link=link, date=date, source=spec.name))
+        except Exception as e:
+            logging.error(f"Error in scraping {spec.name}: {e}")
+
+    return article_data
+
+
+def extract_paragraph_text(container, skip_phrases=()):
+    """
+    Joins the non-empty paragraphs of a container in a single pass.
+
+    Args:
+        container (Tag): Element holding the article body
+        skip_phrases (tuple): Paragraphs containing any of these are dropped
+
+    Returns:
+        str: Paragraph texts joined by spaces
+    """
+    parts = []
+    for p in container.find_all('p'):
+        text = p.get_text(strip=True)
+        if text and not any(phrase in text for phrase in skip_phrases):
+            parts.append(text)
+    return ' '.join(parts)
+
+
+def get_source_content(spec, url):
+    """
+    Fetches the main content of an article from a source described by a SourceSpec.
+
+    The page is streamed with a size cap and reading stops as soon as the
+    source's preferred content container has closed. When that container
+    is only a learned domain hint and yields no body, the hint is dropped
+    and the whole page is fetched again. The downloaded page is kept in the
+    raw archive for offline re-extraction.
+
+    Args:
+        spec (SourceSpec): Source definition
+        url (str): Article URL
+
+    Returns:
+        str: Extracted article content or empty string if extraction fails
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = session.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        content_container = soup.find('div', class_='article-content') or soup.find('article')
-
-        if content_container:
-            paragraphs = content_container.find_all('p')
-            return ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-        return ""
-    except RequestException as e:
-        logging.error(f"Error fetching article content: {e}")
+        stop_after = content_stop_selector(spec, url)
+        page = stream_html(session, url, stop_after=stop_after,
+                           timeout=HTTP_TIMEOUT, headers=DEFAULT_HEADERS)
+        content = extract_content(spec, page, url)
+        if not content and refetch_full_page(spec, url, stop_after):
+            page = stream_html(session, url, timeout=HTTP_TIMEOUT, headers=DEFAULT_HEADERS)
+            content = extract_content(spec, page, url)
+        archive_raw(spec.name, url, page)
+        return content
+    except Exception as e:
+        logging.error(f"Error fetching {spec.name} article content: {e}")
         return ""
-    
+
+
+def extract_content(spec, raw, url=None):
+    """
+    Extracts the article body from a downloaded article page.
+
+    The source's own content selectors are tried first; pages where none
+    matches go through the generic text-density extractor.
+
+    Args:
+        spec (SourceSpec): Source definition
+        raw (bytes | str): Article page HTML, possibly cut off after the container
+        url (str, optional): Page URL, for the extractor's per-domain hints
+
+    Returns:
+        str: Article content or empty string if nothing article-like was found
+    """
+    if spec.content:
+        soup = BeautifulSoup(raw, 'html.parser')
+        for selector in spec.content:
+            container = soup.select_one(selector)
+            if container:
+                content = extract_paragraph_text(container, spec.skip_phrases)
+                return content if len(content) >= spec.min_content_length else ""
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8', errors='replace')
+    return extract_main_text(raw, url, spec.skip_phrases,
+                             max(spec.min_content_length, MIN_ARTICLE_CHARS))
+
+
+def content_stop_selector(spec, url):
+    """
+    Returns:
+        str or None: Container after which an article download can stop:
+        the source's first content selector, else the learned domain hint
+    """
+    return spec.content[0] if spec.content else container_hint(url)
+
+
+def refetch_full_page(spec, url, stop_after):
+    """
+    Called when a page cut off at ``stop_after`` yielded no content. A
+    learned hint that no longer holds the body (the site changed its
+    layout) is dropped, so the page can be read again in full.
+
+    Returns:
+        bool: True if the page should be downloaded again without stop_after
+    """
+    if not stop_after or spec.content:
+        return False
+    logging.info(f"Container hint {stop_after} found no content on {url}, "
+                 f"fetching the full page")
+    drop_hint(url)
+    return True
+
+
+def scrape_articles_AI_news(url):
+    """
+    Scrapes articles from AI News (featured and regular listings).
+
+    Args:
+        url (str): URL of the AI News listing page
+
+    Returns:
+        list[Article]: Articles found on the page (title, link, date, source).
+    """
+    return scrape_source(AI_NEWS, url)
+
+
+def get_article_content(url):
+    """
+    Fetches the main content of an AI News article.
+
+    Args:
+        url (str): URL of the article.
+
+    Returns:
+        str: Extracted article content or empty string if extraction fails.
+    """
+    return get_source_content(AI_NEWS, url)
+
+
 def scrape_mit_articles(url):
     """
     Scrapes articles from MIT AI News
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        }
-        
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        article_data = []
-
-        # Find all article elements with the correct class
-        articles = soup.find_all('article', class_='term-page--news-article--item')
-
-        for article in articles:
-            try:
-                # Extract title
-                title_element = article.find('h3', class_='term-page--news-article--item--title')
-                title = title_element.find('a').get_text(strip=True) if title_element else None
-
-                # Extract link
-                link_element = article.find('a', class_='term-page--news-article--item--title--link')
-                link = link_element['href'] if link_element else None
-                if link and not link.startswith('http'):
-                    link = f"https://news.mit.edu{link}"
-
-                # Extract date and convert to date object
-                date_element = article.find('time')
-                date_str = date_element['datetime'] if date_element else None
-                if date_str:
-                    date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
-                else:
-                    date_obj = None
-
-                # # Extract summary
-                # summary_element = article.find('p', class_='term-page--news-article--item--dek')
-                # summary = summary_element.get_text(strip=True) if summary_element else None
-
-                if all([title, link]):  # Add article if at least title and link are present
-                    article_data.append({
-                        'Title': title,
-                        'Link': link,
-                        'Date': date_obj,
-                        'Source': "MIT News"
-                    })
-
-            except Exception as e:
-                logging.warning(f"Error processing MIT article: {e}")
-                continue
+    return scrape_source(MIT_NEWS, url)
 
-        return article_data
-    except Exception as e:
-        logging.error(f"Error in scraping MIT: {e}")
-        return []
 
 def get_mit_article_content(url):
     """
     Fetches the content of a MIT News article
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Try to find the main article content
-        content_container = (
-            soup.find('div', class_='news-article--content--body') or  # Try specific content class first
-            soup.find('article') or                                    # Then try main article tag
-            soup.find('main')                                         # Finally try main content area
-        )
-        
-        if content_container:
-            # Get all paragraphs
-            paragraphs = content_container.find_all('p')
-            
-            # Clean and join the text
-            content = ' '.join([
-                p.get_text(strip=True) 
-                for p in paragraphs 
-                if p.get_text(strip=True) and 
-                   'Previous image' not in p.get_text() and
-                   'Next image' not in p.get_text()
-            ])
-            
-            # Additional cleaning
-            content = content.replace('Previous imageNext image', '')
-            
-            if len(content) > 100:  # Basic check to ensure we got meaningful content
-                return content
-                
-        return ""
-    except Exception as e:
-        logging.err
+    return get_source_content(MIT_NEWS, url)
+
 
 def scrape_stanford_articles(url):
     """
     Scrapes articles from Stanford AI News
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        }
-        
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        article_data = []
-
-        news_container = soup.find('div', {'data-component': 'topic-subtopic-listing'})
-        if news_container:
-            import json
-            props = json.loads(news_container['data-hydration-props'])
-            articles = props.get('data', [])
-            
-            for article in articles:
-                try:
-                    # Convert timestamp to date object immediately
-                    if article.get('date'):
-                        date_obj = datetime.fromtimestamp(article.get('date')/1000).date()
-                    else:
-                        date_obj = None
-
-                    #summary = article.get('description', [''])[0] if isinstance(article.get('description'), list) else article.get('description')
-                    article_data.append({
-                        'Title': article.get('title'),
-                        'Link': article.get('liveUrl'),
-                        'Date': date_obj,
-                        'Source': "Stanford News"
-                    })
-
-                except Exception as e:
-                    logging.warning(f"Error processing Stanford article: {e}")
-                    continue
+    return scrape_source(STANFORD_NEWS, url)
+
 
-        return article_data
-    
-    except Exception as e:
-        logging.error(f"Error in scraping Stanford: {e}")
-        return []
-        
 def get_stanford_article_content(url):
     """
     Fetches the content of a Stanford News article
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        # Find the main article content
-        content_container = soup.find('div', class_='su-page-content') or soup.find('article')
-        
-        if content_container:
-            paragraphs = content_container.find_all('p')
-            return ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-        return ""
-    except Exception as e:
-        logging.error(f"Error fetching Stanford article content: {e}")
-        return ""
-
-
-
+    return get_source_content(STANFORD_NEWS, url)
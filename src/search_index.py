@@ -0,0 +1,234 @@
+"""
+Local full-text search over collected articles, summaries and transcripts
+Backed by a SQLite FTS5 index that is updated incrementally after each run
+
+Usage:
+    python -m src.search_index "large language models" --days 90 --source "MIT News"
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from .models import Article
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.search')
+
+SEARCH_DB_PATH = "data/search_index.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    date TEXT,
+    language TEXT,
+    summary TEXT,
+    content TEXT,
+    indexed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS items_date ON items(date);
+CREATE INDEX IF NOT EXISTS items_source ON items(source);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, summary, content,
+    content='items', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+    INSERT INTO items_fts(rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+"""
+
+# Only rows whose text actually changed are rewritten (and re-tokenized)
+_UPSERT = """
+INSERT INTO items (link, title, source, date, language, summary, content, indexed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(link) DO UPDATE SET
+    title = excluded.title,
+    source = excluded.source,
+    date = excluded.date,
+    language = excluded.language,
+    summary = excluded.summary,
+    content = excluded.content,
+    indexed_at = excluded.indexed_at
+WHERE items.title IS NOT excluded.title
+   OR items.summary IS NOT excluded.summary
+   OR items.content IS NOT excluded.content
+   OR items.date IS NOT excluded.date
+   OR items.source IS NOT excluded.source
+"""
+
+# Column weights for bm25(): title, summary, content
+_BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def connect_index(db_path=SEARCH_DB_PATH):
+    """
+    Opens the search index, creating the schema if needed.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Open connection with row access by column name
+    """
+    directory = os.path.dirname(db_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def index_articles(articles, db_path=SEARCH_DB_PATH):
+    """
+    Adds or refreshes articles in the search index.
+
+    Articles are keyed by link; unchanged articles are left untouched so
+    repeated runs over the same week stay cheap.
+
+    Args:
+        articles (list[Article]): Articles to index
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        int: Number of rows inserted or updated
+    """
+    now = datetime.now().isoformat(timespec='seconds')
+    rows = [
+        (a.link, a.title, a.source, a.date_str or None, a.language,
+         a.summary, a.content, now)
+        for a in articles if a.link
+    ]
+    conn = connect_index(db_path)
+    try:
+        with conn:
+            changed = max(conn.executemany(_UPSERT, rows).rowcount, 0)
+        logger.info(f"Search index updated: {changed} of {len(rows)} items changed")
+        return changed
+    finally:
+        conn.close()
+
+
+def search(query, start_date=None, end_date=None, sources=None, limit=20,
+           db_path=SEARCH_DB_PATH):
+    """
+    Runs a ranked full-text query against the index.
+
+    Args:
+        query (str): FTS5 query, e.g. ``openai AND "reasoning model"``
+        start_date (date, optional): Earliest item date, inclusive
+        end_date (date, optional): Latest item date, inclusive
+        sources (list, optional): Only return items from these sources
+        limit (int): Maximum number of results
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        list[dict]: Matches ordered by relevance, each with title, link,
+            source, date, summary, rank and a highlighted snippet
+    """
+    sql = [
+        "SELECT items.title, items.link, items.source, items.date, items.summary,",
+        "       bm25(items_fts, ?, ?, ?) AS rank,",
+        "       snippet(items_fts, -1, '[', ']', '...', 16) AS snippet",
+        "FROM items_fts JOIN items ON items.id = items_fts.rowid",
+        "WHERE items_fts MATCH ?",
+    ]
+    params = list(_BM25_WEIGHTS) + [query]
+
+    if start_date:
+        sql.append("AND items.date >= ?")
+        params.append(start_date.isoformat())
+    if end_date:
+        sql.append("AND items.date <= ?")
+        params.append(end_date.isoformat())
+    if sources:
+        sql.append(f"AND items.source IN ({', '.join('?' for _ in sources)})")
+        params.extend(sources)
+
+    sql.append("ORDER BY rank LIMIT ?")
+    params.append(limit)
+
+    conn = connect_index(db_path)
+    try:
+        return [dict(row) for row in conn.execute('\n'.join(sql), params)]
+    finally:
+        conn.close()
+
+
+def load_articles(start_date=None, end_date=None, db_path=SEARCH_DB_PATH):
+    """
+    Reads indexed items back as articles, e.g. to render a report from
+    items ingested over the week.
+
+    Args:
+        start_date (date, optional): Earliest item date, inclusive
+        end_date (date, optional): Latest item date, inclusive
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        list[Article]: Items ordered by source and date
+    """
+    sql = ["SELECT link, title, source, date, language, summary, content FROM items WHERE 1 = 1"]
+    params = []
+    if start_date:
+        sql.append("AND date >= ?")
+        params.append(start_date.isoformat())
+    if end_date:
+        sql.append("AND date <= ?")
+        params.append(end_date.isoformat())
+    sql.append("ORDER BY source, date")
+
+    conn = connect_index(db_path)
+    try:
+        return [Article.from_dict(dict(row)) for row in conn.execute('\n'.join(sql), params)]
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    """Command line entry point for querying the index"""
+    parser = argparse.ArgumentParser(description="Search archived AI news items")
+    parser.add_argument('query', help='FTS5 query string')
+    parser.add_argument('--since', help='Earliest date (YYYY-MM-DD)')
+    parser.add_argument('--until', help='Latest date (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, help='Only items from the last N days')
+    parser.add_argument('--source', action='append', help='Restrict to a source (repeatable)')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum number of results')
+    parser.add_argument('--db', default=SEARCH_DB_PATH, help='Path to the index database')
+    args = parser.parse_args(argv)
+
+    start_date = datetime.strptime(args.since, '%Y-%m-%d').date() if args.since else None
+    end_date = datetime.strptime(args.until, '%Y-%m-%d').date() if args.until else None
+    if args.days:
+        start_date = datetime.now().date() - timedelta(days=args.days)
+
+    results = search(args.query, start_date, end_date, args.source, args.limit, args.db)
+    for hit in results:
+        print(f"{hit['date'] or '----------'}  [{hit['source']}]  {hit['title']}")
+        print(f"    {hit['link']}")
+        print(f"    {hit['snippet']}")
+    print(f"{len(results)} result(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""
+Declarative source definitions for the web scrapers
+Each news source is a SourceSpec entry describing where its listing and
+article content live; the extractor in scraper.py runs all of them
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from config.config import AI_NEWS_URL, MIT_NEWS_URL, STANFORD_NEWS_URL
+
+
+@dataclass(frozen=True, slots=True)
+class ListingRule:
+    """
+    Finds articles in an HTML listing page with CSS selectors.
+
+    ``link``, ``title`` and ``date`` are evaluated relative to each ``item``.
+    When ``title`` is None the link element's text is used; ``*_attr`` reads
+    an attribute instead of the element text.
+    """
+    item: str
+    link: str
+    title: Optional[str] = None
+    title_attr: Optional[str] = None
+    date: Optional[str] = None
+    date_attr: Optional[str] = None
+    date_format: str = 'text'
+    date_separator: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class JsonListing:
+    """
+    Finds articles in a JSON payload embedded in the page.
+
+    The payload is located with a byte scan (see ``src.embedded_state``):
+    either the ``attribute`` of the element whose tag contains ``marker``,
+    or the ``<script>`` whose id is ``script_id``. ``container`` is a CSS
+    selector used as a full-parse fallback for attribute payloads.
+    """
+    container: Optional[str] = None
+    attribute: Optional[str] = None
+    marker: Optional[str] = None
+    script_id: Optional[str] = None
+    items_key: str = 'data'
+    title_key: str = 'title'
+    link_key: str = 'url'
+    date_key: str = 'date'
+    date_format: str = 'iso'
+
+
+@dataclass(frozen=True, slots=True)
+class SourceSpec:
+    """
+    Everything needed to scrape one news source.
+
+    Args:
+        name: Source name shown in reports
+        url: Listing page URL
+        listings: ListingRule/JsonListing entries, applied in order
+        content: CSS selectors for the article body, tried in order; pages
+            matching none (or sources without any) use the generic extractor
+        base_url: Prefix for relative article links
+        skip_phrases: Paragraphs containing any of these are dropped
+        min_content_length: Shorter extracted content is treated as missing
+        feed_url: RSS/Atom feed used for discovery before the HTML listing
+        sitemap_url: XML (news) sitemap used when there is no feed
+    """
+    name: str
+    url: str
+    listings: tuple
+    content: tuple = ()
+    base_url: Optional[str] = None
+    feed_url: Optional[str] = None
+    sitemap_url: Optional[str] = None
+    skip_phrases: tuple = ()
+    min_content_length: int = 0
+
+
+AI_NEWS = SourceSpec(
+    name="AI News",
+    url=AI_NEWS_URL,
+    listings=(
+        # Featured blocks carry the title in the link's title attribute
+        ListingRule(
+            item='section.featured div.cell.blocks.small-12.medium-3.large-3',
+            link='a.img-link',
+            title_attr='title',
+            date='div.content',
+            date_separator='|'
+        ),
+        ListingRule(
+            item='article',
+            link='a',
+            title='h3',
+            date='div.content',
+            date_separator='|'
+        ),
+    ),
+    content=('div.article-content',),
+    feed_url="https://www.artificialintelligence-news.com/feed/",
+)
+
+MIT_NEWS = SourceSpec(
+    name="MIT News",
+    url=MIT_NEWS_URL,
+    listings=(
+        ListingRule(
+            item='article.term-page--news-article--item',
+            link='a.term-page--news-article--item--title--link',
+            title='h3.term-page--news-article--item--title a',
+            date='time',
+            date_attr='datetime',
+            date_format='iso'
+        ),
+    ),
+    content=('div.news-article--content--body',),
+    base_url="https://news.mit.edu",
+    feed_url="https://news.mit.edu/topic/mitartificial-intelligence2-rss.xml",
+    skip_phrases=('Previous image', 'Next image'),
+    min_content_length=100,
+)
+
+STANFORD_NEWS = SourceSpec(
+    name="Stanford News",
+    url=STANFORD_NEWS_URL,
+    listings=(
+        JsonListing(
+            container='div[data-component="topic-subtopic-listing"]',
+            attribute='data-hydration-props',
+            marker='data-component="topic-subtopic-listing"',
+            link_key='liveUrl',
+            date_format='epoch_ms'
+        ),
+    ),
+    content=('div.su-page-content',),
+)
+
+# Sources processed by process_all_news, in report order
+SOURCES = [AI_NEWS, MIT_NEWS, STANFORD_NEWS]
@@ -0,0 +1,188 @@
+"""
+Bounded streaming downloads for article pages
+Reads response bodies chunk by chunk with a size cap, rejects non-HTML
+responses from their headers, decodes incrementally and stops reading
+once the article container has been closed
+"""
+
+import codecs
+import logging
+import re
+from html.parser import HTMLParser
+from requests.exceptions import RequestException
+from .politeness import scheduler, parse_retry_after
+
+# Get logger
+logger = logging.getLogger('ai_news_scraper.streaming')
+
+# Largest article body read into memory; longer pages are cut off here
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+
+CHUNK_SIZE = 16 * 1024
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*)?((?:[.#][\w-]+)*)$')
+_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class DownloadRejected(RequestException):
+    """Raised when a response is not an HTML page."""
+
+
+def check_content_type(content_type):
+    """
+    Rejects responses that are not HTML before their body is read.
+
+    Args:
+        content_type (str): Content-Type header (missing headers are accepted)
+
+    Raises:
+        DownloadRejected: If the content type is not HTML
+    """
+    media_type = (content_type or '').split(';', 1)[0].strip().lower()
+    if media_type and media_type not in HTML_CONTENT_TYPES:
+        raise DownloadRejected(f"Unexpected content type {media_type!r}")
+
+
+def _parse_selector(selector):
+    """Returns (tag, classes, id) for a simple ``tag.class#id`` selector, else None."""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    classes = set(re.findall(r'\.([\w-]+)', match.group(2)))
+    ids = re.findall(r'#([\w-]+)', match.group(2))
+    return (match.group(1) or '').lower() or None, classes, ids[0] if ids else None
+
+
+class _ContainerWatcher(HTMLParser):
+    """Tracks when the first element matching a simple selector is closed."""
+
+    def __init__(self, selector):
+        super().__init__(convert_charrefs=False)
+        self.tag, self.classes, self.id = selector
+        self._open_tag = None
+        self.depth = 0
+        self.closed = False
+
+    def _matches(self, tag, attrs):
+        if self.tag and tag != self.tag:
+            return False
+        attrs = dict(attrs)
+        if self.id and attrs.get('id') != self.id:
+            return False
+        return self.classes <= set((attrs.get('class') or '').split())
+
+    def handle_starttag(self, tag, attrs):
+        if self.closed:
+            return
+        if self.depth:
+            if tag == self._open_tag:
+                self.depth += 1
+        elif self._matches(tag, attrs):
+            self._open_tag = tag
+            self.depth = 1
+
+    def handle_endtag(self, tag):
+        if self.depth and tag == self._open_tag:
+            self.depth -= 1
+            self.closed = self.depth == 0
+
+
+class BoundedReader:
+    """
+    Accumulates a streamed HTML body.
+
+    Chunks are decoded incrementally with the charset from the headers
+    (UTF-8 by default). Reading should stop when ``feed`` returns True:
+    either ``max_bytes`` were read or the ``stop_after`` container closed.
+    """
+
+    def __init__(self, content_type=None, max_bytes=MAX_CONTENT_BYTES, stop_after=None):
+        charset = _CHARSET.search(content_type or '')
+        try:
+            decoder = codecs.getincrementaldecoder(charset.group(1) if charset else 'utf-8')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')
+        self._decoder = decoder(errors='replace')
+        self._parts = []
+        self._watcher = None
+        if stop_after:
+            selector = _parse_selector(stop_after)
+            if selector:
+                self._watcher = _ContainerWatcher(selector)
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+        self.stopped_early = False
+
+    def feed(self, chunk):
+        """
+        Adds a chunk of the body.
+
+        Returns:
+            bool: True once no more data is needed
+        """
+        remaining = self.max_bytes - self.bytes_read
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        self._parts.append(text)
+        if self._watcher:
+            self._watcher.feed(text)
+            if self._watcher.closed:
+                self.stopped_early = True
+                return True
+        return self.truncated
+
+    def text(self, url=''):
+        """
+        Returns:
+            str: Decoded body read so far
+        """
+        self._parts.append(self._decoder.decode(b'', final=True))
+        if self.truncated:
+            logger.warning(f"Page exceeded {self.max_bytes} bytes, truncated: {url}")
+        return ''.join(self._parts)
+
+
+def stream_html(session, url, stop_after=None, max_bytes=MAX_CONTENT_BYTES, **kwargs):
+    """
+    Downloads an HTML page with a size cap, stopping early when possible.
+
+    Args:
+        session (requests.Session): HTTP session
+        url (str): Page URL
+        stop_after (str, optional): Simple CSS selector (``tag.class``);
+            reading stops once the first matching element has closed
+        max_bytes (int): Maximum number of body bytes to read
+        **kwargs: Passed to ``session.get`` (headers, timeout, ...)
+
+    Returns:
+        str: Decoded (possibly partial) page
+
+    Raises:
+        requests.RequestException: On HTTP errors or non-HTML responses
+    """
+    # The slot covers the body download too: it is most of the request time
+    with scheduler.slot(url) as slot:
+        response = session.get(url, stream=True, **kwargs)
+        slot.record(response.status_code,
+                    retry_after=parse_retry_after(response.headers.get('Retry-After')))
+        with response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type')
+            check_content_type(content_type)
+            reader = BoundedReader(content_type, max_bytes, stop_after)
+            try:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if reader.feed(chunk):
+                        break
+            except RequestException:
+                # The host failed mid-body: the 2xx status recorded above
+                # must not count as a success
+                slot.error = True
+                raise
+    return reader.text(url)
@@ -1,13 +1,17 @@
 """
-OpenAI integration for article summarization
+Article summarization
+Provides the OpenAI integration plus pluggable backends (including a
+CPU-only local model) that can run in chunks across a process pool
 """
 
 import logging
 import openai
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 # Import the API key from config
 from config.config import OPENAI_API_KEY
+from .extractive import extractive_summary, INPUT_TOKEN_BUDGET
 
 # Add the project root directory to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,28 +20,250 @@ sys.path
 # Configure OpenAI
 openai.api_key = OPENAI_API_KEY
 
-def summarize_with_openai(text):
+# Backend selection ('openai', 'openai-batch', 'local' or 'extractive') and local model settings.
+# The paid backends are opt-in: without SUMMARIZER_BACKEND nothing is sent to OpenAI
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "extractive")
+SUMMARIZER_WORKERS = int(os.getenv("SUMMARIZER_WORKERS", "1"))
+LOCAL_MODEL_PATH = os.getenv("LOCAL_MODEL_PATH", "models/summarizer.gguf")
+
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes news articles."
+USER_PROMPT = "Please provide a concise summary of this article: {text}"
+SUMMARY_MAX_TOKENS = 200
+
+def summarize_with_openai(text, max_input_tokens=INPUT_TOKEN_BUDGET):
     """
     Summarizes text using OpenAI's GPT model.
     
+    Long texts are first reduced locally to their top-ranked sentences so
+    that at most ``max_input_tokens`` are sent to the model.
+    
     Args:
         text (str): Text to summarize
+        max_input_tokens (int): Input token budget, None to send the full text
         
     Returns:
         str: Summarized text or empty string if error occurs
     """
     try:
-        user_prompt = f"Please provide a concise summary of this article: {text}"
+        if max_input_tokens:
+            text = extractive_summary(text, max_input_tokens)
+        user_prompt = USER_PROMPT.format(text=text)
         completion = openai.chat.completions.create(
             model="gpt-4",
             messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes news articles."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt}
             ],
             temperature=0.1,
-            max_tokens=200
+            max_tokens=SUMMARY_MAX_TOKENS
         )
         return completion.choices[0].message.content.strip()
     except Exception as e:
         logging.error(f"OpenAI API error: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+
+class SummarizerBackend:
+    """
+    Interface for summarization backends.
+
+    Subclasses implement ``summarize_many``; it must return one summary
+    per input text, using an empty string for failures. Whether the texts
+    are processed together or one by one is up to the backend. Backends with
+    ``whole_input`` set receive all texts in a single call; ``paid`` ones
+    are billed per token.
+    """
+    name = None
+    whole_input = False
+    paid = False
+
+    def summarize(self, text):
+        return self.summarize_many([text])[0]
+
+    def summarize_many(self, texts):
+        raise NotImplementedError
+
+
+class OpenAIBackend(SummarizerBackend):
+    """Remote summarization through the OpenAI chat completions API."""
+    name = 'openai'
+    paid = True
+
+    def __init__(self, max_input_tokens=INPUT_TOKEN_BUDGET):
+        self.max_input_tokens = max_input_tokens
+
+    def summarize_many(self, texts):
+        return [summarize_with_openai(text, self.max_input_tokens) for text in texts]
+
+
+class OpenAIBatchBackend(SummarizerBackend):
+    """
+    Summarization through the OpenAI Batch API: one asynchronous job for
+    all texts, cheaper and higher-throughput but completing within hours.
+    """
+    name = 'openai-batch'
+    whole_input = True
+    paid = True
+
+    def summarize_many(self, texts):
+        # Imported here: openai_batch reuses this module's prompts
+        from .openai_batch import summarize_with_batch_api
+        return summarize_with_batch_api(texts)
+
+
+class LocalModelBackend(SummarizerBackend):
+    """
+    CPU-only summarization with a quantized GGUF model through llama.cpp.
+
+    The model is loaded lazily, once per process, so each worker in a
+    process pool holds its own copy. llama.cpp generates one completion at
+    a time, so texts are summarized sequentially; parallelism comes from
+    running several workers (SUMMARIZER_WORKERS).
+    """
+    name = 'local'
+
+    def __init__(self, model_path=LOCAL_MODEL_PATH, n_ctx=4096, n_threads=None,
+                 max_input_tokens=INPUT_TOKEN_BUDGET):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self.max_input_tokens = max_input_tokens
+        self._model = None
+
+    def _load(self):
+        if self._model is None:
+            try:
+                from llama_cpp import Llama
+            except ImportError as e:
+                raise ImportError("The local backend requires llama-cpp-python") from e
+            self._model = Llama(
+                model_path=self.model_path,
+                n_ctx=self.n_ctx,
+                n_threads=self.n_threads,
+                verbose=False
+            )
+            logging.info(f"Loaded local summarization model: {self.model_path}")
+        return self._model
+
+    def summarize_many(self, texts):
+        model = self._load()
+        summaries = []
+        for text in texts:
+            try:
+                completion = model.create_chat_completion(
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": USER_PROMPT.format(
+                            text=extractive_summary(text, self.max_input_tokens))}
+                    ],
+                    temperature=0.1,
+                    max_tokens=SUMMARY_MAX_TOKENS
+                )
+                summaries.append(completion['choices'][0]['message']['content'].strip())
+            except Exception as e:
+                logging.error(f"Local model error: {e}")
+                summaries.append("")
+        return summaries
+
+
+class ExtractiveBackend(SummarizerBackend):
+    """Model-free summaries made of the top-ranked sentences of the text."""
+    name = 'extractive'
+
+    def __init__(self, token_budget=SUMMARY_MAX_TOKENS):
+        self.token_budget = token_budget
+
+    def summarize_many(self, texts):
+        return [extractive_summary(text, self.token_budget) for text in texts]
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (OpenAIBackend, OpenAIBatchBackend, LocalModelBackend, ExtractiveBackend)
+}
+
+
+def get_backend(name=None):
+    """
+    Creates a summarizer backend by name.
+
+    Args:
+        name (str, optional): Backend name, defaults to SUMMARIZER_BACKEND
+
+    Returns:
+        SummarizerBackend: Backend instance
+    """
+    name = name or SUMMARIZER_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown summarizer backend: {name}")
+    return BACKENDS[name]()
+
+
+def submits_whole_input(name=None):
+    """
+    Returns:
+        bool: Whether the backend should receive all texts at once rather
+        than in chunks (e.g. the Batch API)
+    """
+    name = name or SUMMARIZER_BACKEND
+    return name in BACKENDS and BACKENDS[name].whole_input
+
+
+def is_paid(name=None):
+    """
+    Returns:
+        bool: Whether the backend is billed per token (run budgets only
+        limit tokens and cost for these)
+    """
+    name = name or SUMMARIZER_BACKEND
+    return name in BACKENDS and BACKENDS[name].paid
+
+
+# Backend held by each process-pool worker
+_worker_backend = None
+
+
+def _init_worker(name):
+    global _worker_backend
+    _worker_backend = get_backend(name)
+
+
+def _summarize_in_worker(texts):
+    return _worker_backend.summarize_many(texts)
+
+
+def summarize_texts(texts, backend=None, workers=None, batch_size=8):
+    """
+    Summarizes many texts, in batches, optionally across a process pool.
+
+    Args:
+        texts (list[str]): Texts to summarize
+        backend (str, optional): Backend name, defaults to SUMMARIZER_BACKEND
+        workers (int, optional): Worker processes, defaults to SUMMARIZER_WORKERS;
+            1 runs in the current process
+        batch_size (int): Texts handed to a backend per call
+
+    Returns:
+        list[str]: One summary per text, in input order
+    """
+    if not texts:
+        return []
+
+    name = backend or SUMMARIZER_BACKEND
+    workers = workers or SUMMARIZER_WORKERS
+    if submits_whole_input(name):
+        logging.info(f"Summarizing {len(texts)} texts with '{name}' backend in one call")
+        return get_backend(name).summarize_many(texts)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    logging.info(f"Summarizing {len(texts)} texts with '{name}' backend "
+                 f"({len(batches)} batches, {workers} worker(s))")
+
+    if workers <= 1:
+        summarizer = get_backend(name)
+        results = [summarizer.summarize_many(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(name,)) as executor:
+            results = list(executor.map(_summarize_in_worker, batches))
+
+    return [summary for batch in results for summary in batch]
@@ -40,10 +40,19 @@ def parse_article_date(date_str):
     logging.warning(f"Unrecognized date format: {date_str}")
     return None
 
+# Separate connect and read timeouts (seconds): a dead host fails on connect
+# within seconds, while slow but live pages still get time to respond
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '20'))
+HTTP_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
 def setup_http_session():
     """
     Sets up an HTTP session with retry logic.
     
+    Retries are kept few and short; persistent failures are handled by the
+    per-host circuit breaker in src.politeness instead.
+    
     Returns:
         requests.Session: Configured session object
     """
@@ -52,7 +61,7 @@ def setup_http_session():
     from requests.packages.urllib3.util.retry import Retry
     
     session = Session()
-    retries = HTTPAdapter(max_retries=5)
+    retries = HTTPAdapter(max_retries=Retry(total=2, connect=1, read=1, backoff_factor=0.5))
     session.mount('http://', retries)
     session.mount('https://', retries)
     
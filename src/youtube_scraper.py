@@ -1,11 +1,38 @@
 import logging
 import pandas as pd
+import requests
 from googleapiclient.discovery import build
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import (YouTubeTranscriptApi, NoTranscriptFound, TooManyRequests,
+                                    YouTubeRequestFailed)
 import json
 from datetime import datetime, timedelta
 import os
+import re
 import traceback
+from contextlib import contextmanager
+from functools import lru_cache
+from .models import Article, Transcript, TranscriptSegment
+from .politeness import scheduler
+from .relevance import filter_relevant
+from .raw_archive import archive_raw, TRANSCRIPT
+
+# Host used to rate-limit transcript requests
+TRANSCRIPT_HOST_URL = "https://www.youtube.com/"
+
+# Idiomas preferidos para las transcripciones, en orden
+TRANSCRIPT_LANGUAGES = ('en', 'es')
+
+# Reglas para descartar videos antes de pedir su transcripción: duración
+# mínima y máxima en segundos (0 = sin límite) y si se exigen subtítulos
+# subidos por el canal (los automáticos no cuentan para la API)
+VIDEO_MIN_SECONDS = int(os.getenv('YOUTUBE_MIN_SECONDS', '0'))
+VIDEO_MAX_SECONDS = int(os.getenv('YOUTUBE_MAX_SECONDS', '0'))
+VIDEO_REQUIRE_CAPTIONS = os.getenv('YOUTUBE_REQUIRE_CAPTIONS', '') not in ('', '0')
+
+# Máximo de IDs por llamada a videos().list
+VIDEOS_LIST_MAX_IDS = 50
+
+_ISO_DURATION = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
 
 # Get logger
 logger = logging.getLogger('ai_news_scraper.youtube')
@@ -34,6 +61,23 @@ def build_youtube_client(api_key):
         raise
 
 
+@lru_cache(maxsize=None)
+def get_youtube_client(api_key):
+    """
+    Devuelve un cliente de la API de YouTube reutilizable.
+    
+    El documento de descubrimiento de la API se descarga una sola vez por
+    proceso y clave, en lugar de en cada ejecución.
+    
+    Args:
+        api_key (str): Clave de API de YouTube
+        
+    Returns:
+        object: Cliente de la API de YouTube
+    """
+    return build_youtube_client(api_key)
+
+
 def get_channel_id(youtube, channel_name):
     """
     Obtiene el ID del canal a partir del nombre del canal.
@@ -77,7 +121,7 @@ def get_recent_videos(youtube, channel_id, max_results=50, days_back=7):
         days_back (int): Cuando contar los 7 dias
         
     Returns:
-        list: Lista de videos con información
+        list[Article]: Lista de videos (título, enlace, fecha, video_id, descripción)
     """
     try:
         request = youtube.search().list(
@@ -99,12 +143,14 @@ def get_recent_videos(youtube, channel_id, max_results=50, days_back=7):
             )
             
             if published_at >= cutoff_date:
-                video = {
-                    'title': item['snippet']['title'],
-                    'video_id': item['id']['videoId'],
-                    'published_at': item['snippet']['publishedAt']
-                }
-                videos.append(video)
+                video_id = item['id']['videoId']
+                videos.append(Article(
+                    title=item['snippet']['title'],
+                    link=f"https://www.youtube.com/watch?v={video_id}",
+                    date=published_at.date(),
+                    video_id=video_id,
+                    description=item['snippet'].get('description', '')
+                ))
         
         logger.info(f"Found {len(videos)} videos from the last {days_back} days for channel {channel_id}")
         return videos
@@ -113,10 +159,251 @@ def get_recent_videos(youtube, channel_id, max_results=50, days_back=7):
         return []
 
 
+def parse_duration(value):
+    """
+    Convierte una duración ISO 8601 de la API (p. ej. ``PT1H2M10S``) a segundos.
+
+    Returns:
+        int or None: Segundos, o None si el formato no es válido
+    """
+    match = _ISO_DURATION.match(value or '')
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def annotate_videos(youtube, videos):
+    """
+    Añade duración y subtítulos a los videos con videos().list, hasta 50
+    IDs por llamada y todas las llamadas en una sola petición HTTP por lotes.
+
+    Args:
+        youtube (object): Cliente de la API de YouTube
+        videos (list[Article]): Videos con video_id
+
+    Returns:
+        dict: video_id -> liveBroadcastContent ('none', 'live' o 'upcoming')
+    """
+    by_id = {}
+    for video in videos:
+        by_id.setdefault(video.video_id, []).append(video)
+    ids = list(by_id)
+    list_requests = [
+        youtube.videos().list(
+            part='contentDetails,snippet',
+            id=','.join(ids[i:i + VIDEOS_LIST_MAX_IDS]),
+            maxResults=VIDEOS_LIST_MAX_IDS,
+            fields='items(id,contentDetails(duration,caption),snippet/liveBroadcastContent)'
+        )
+        for i in range(0, len(ids), VIDEOS_LIST_MAX_IDS)
+    ]
+    if not list_requests:
+        return {}
+
+    responses = []
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            logger.error(f"Error getting video details (batch {request_id}): {exception}")
+        else:
+            responses.append(response)
+
+    if len(list_requests) == 1:
+        responses.append(list_requests[0].execute())
+    else:
+        batch = youtube.new_batch_http_request(callback=collect)
+        for request in list_requests:
+            batch.add(request)
+        batch.execute()
+
+    live = {}
+    for response in responses:
+        for item in response.get('items', []):
+            details = item.get('contentDetails', {})
+            live[item['id']] = item.get('snippet', {}).get('liveBroadcastContent', 'none')
+            for video in by_id.get(item['id'], []):
+                video.duration = parse_duration(details.get('duration'))
+                video.has_captions = details.get('caption') == 'true'
+    return live
+
+
+def screen_videos(youtube, videos, min_seconds=VIDEO_MIN_SECONDS, max_seconds=VIDEO_MAX_SECONDS,
+                  require_captions=VIDEO_REQUIRE_CAPTIONS):
+    """
+    Descarta, antes de pedir transcripciones, los videos en directo o
+    programados, los demasiado cortos (shorts) o largos y, si se pide,
+    los que no tienen subtítulos subidos.
+
+    Si la consulta de detalles falla, los videos se conservan sin anotar.
+
+    Args:
+        youtube (object): Cliente de la API de YouTube
+        videos (list[Article]): Videos candidatos
+        min_seconds (int): Duración mínima (0 = sin límite)
+        max_seconds (int): Duración máxima (0 = sin límite)
+        require_captions (bool): Exigir subtítulos subidos por el canal
+
+    Returns:
+        list[Article]: Videos que cumplen las reglas, en el mismo orden
+    """
+    if not videos:
+        return []
+    try:
+        live = annotate_videos(youtube, videos)
+    except Exception as e:
+        logger.error(f"Error getting video details: {str(e)}")
+        return videos
+
+    kept = []
+    skipped = {}
+    for video in videos:
+        if live.get(video.video_id, 'none') != 'none':
+            reason = 'live'
+        elif video.duration is not None and min_seconds and video.duration < min_seconds:
+            reason = 'too short'
+        elif video.duration is not None and max_seconds and video.duration > max_seconds:
+            reason = 'too long'
+        elif require_captions and video.has_captions is False:
+            reason = 'no captions'
+        else:
+            kept.append(video)
+            continue
+        skipped[reason] = skipped.get(reason, 0) + 1
+        logger.debug(f"Skipping video {video.video_id} ({reason}): {video.title}")
+    if skipped:
+        logger.info(f"Skipped {len(videos) - len(kept)} of {len(videos)} videos before transcripts: "
+                    + ', '.join(f"{count} {reason}" for reason, count in skipped.items()))
+    return kept
+
+
+def _select_transcript(transcript_list, languages, translate=True, fallback_any=True):
+    """
+    Elige la mejor pista de una lista de subtítulos ya descargada.
+    
+    Orden de preferencia, por cada idioma de ``languages``: subtítulos
+    manuales, luego generados automáticamente. Si ninguno existe, se pide
+    a YouTube una traducción desde la mejor pista traducible y, por
+    último (``fallback_any``), se acepta cualquier pista disponible.
+    
+    Args:
+        transcript_list (TranscriptList): Resultado de ``list_transcripts``
+        languages (list): Códigos de idioma en orden de preferencia
+        translate (bool): Permitir traducción en el servidor
+        fallback_any (bool): Aceptar una pista en otro idioma
+        
+    Returns:
+        tuple: (pista, idioma original si se tradujo) o (None, None)
+    """
+    # Manuales primero en cada criterio
+    tracks = sorted(transcript_list, key=lambda t: t.is_generated)
+    for code in languages:
+        for track in tracks:
+            if track.language_code == code:
+                return track, None
+    
+    if translate:
+        for code in languages:
+            for track in tracks:
+                if any(lang['language_code'] == code for lang in track.translation_languages):
+                    return track.translate(code), track.language_code
+    
+    if fallback_any and tracks:
+        return tracks[0], None
+    return None, None
+
+
+def _fetch_segments(track):
+    """Descarga una pista y la convierte en segmentos limpios."""
+    return [
+        TranscriptSegment(clean_subtitle_text(entry['text']), entry['start'], entry['duration'])
+        for entry in track.fetch()
+    ]
+
+
+def _transcript_error_status(error):
+    """
+    Estado con el que se registra en el planificador un error al obtener
+    transcripciones. Solo los errores de transporte (None: se registran
+    como error) y las respuestas 429/5xx son fallos del host; los propios
+    del video (privado, sin subtítulos, ...) se registran como 404 para
+    que unos pocos videos no abran el circuito de youtube.com.
+    """
+    if isinstance(error, requests.RequestException):
+        return None
+    if isinstance(error, TooManyRequests):
+        return 429
+    if isinstance(error, YouTubeRequestFailed):
+        # La librería envuelve el HTTPError original
+        response = getattr(error.__context__, 'response', None)
+        status = getattr(response, 'status_code', None)
+        if status == 429 or (status and status >= 500):
+            return status
+    return 404
+
+
+@contextmanager
+def _transcript_slot():
+    """Turno del planificador para una petición de transcripciones."""
+    with scheduler.slot(TRANSCRIPT_HOST_URL) as slot:
+        try:
+            yield slot
+        except Exception as e:
+            status = _transcript_error_status(e)
+            if status is not None:
+                # Un 429 también cuenta como fallo para el circuit breaker
+                slot.record(status, error=status == 429)
+            raise
+
+
+def fetch_transcript(video_id, languages=TRANSCRIPT_LANGUAGES, translate=True):
+    """
+    Obtiene la mejor transcripción disponible de un video.
+    
+    Lista las pistas una sola vez, elige la mejor (ver
+    ``_select_transcript``) y descarga solo esa, traducida por YouTube
+    únicamente si no hay ninguna en los idiomas pedidos.
+    
+    Args:
+        video_id (str): ID del video
+        languages (list): Códigos de idioma en orden de preferencia
+        translate (bool): Permitir traducción en el servidor
+        
+    Returns:
+        Transcript: Transcripción con sus segmentos, o None si falla
+    """
+    try:
+        with _transcript_slot():
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            track, translated_from = _select_transcript(transcript_list, languages, translate)
+            if track is None:
+                raise NoTranscriptFound(video_id, list(languages), transcript_list)
+            segments = _fetch_segments(track)
+        
+        transcript = Transcript(
+            video_id=video_id,
+            language=track.language,
+            language_code=track.language_code,
+            is_generated=track.is_generated,
+            segments=segments,
+            translated_from=translated_from
+        )
+        # Guardar la transcripción cruda para poder reprocesarla sin red
+        archive_raw('youtube', video_id, json.dumps(transcript.to_dict(), ensure_ascii=False), TRANSCRIPT)
+        return transcript
+    
+    except Exception as e:
+        logger.error(f"Failed to get transcript for video {video_id}: {str(e)}")
+        return None
+
+
 def download_subtitles(video_id, languages=['es', 'en'], output_dir='subtitles'):
     """
     Descarga subtítulos para un video en los idiomas especificados.
     
+    La lista de pistas se obtiene una sola vez; un idioma sin pista propia
+    se descarga como traducción de YouTube.
+    
     Args:
         video_id (str): ID del video
         languages (list): Lista de códigos de idioma
@@ -131,21 +418,28 @@ def download_subtitles(video_id, languages=['es', 'en'], output_dir='subtitles')
             os.makedirs(output_dir)
             logger.info(f"Created directory: {output_dir}")
 
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        with _transcript_slot():
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
         results = {}
         
         for language in languages:
             try:
-                transcript = transcript_list.find_transcript([language])
-                subtitles = transcript.fetch()
+                track, translated_from = _select_transcript(transcript_list, [language],
+                                                            fallback_any=False)
+                if track is None:
+                    raise NoTranscriptFound(video_id, [language], transcript_list)
+                with _transcript_slot():
+                    segments = _fetch_segments(track)
                 
                 # Guardar en formato JSON
                 filename = f'{output_dir}/{video_id}_{language}.json'
                 with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(subtitles, f, ensure_ascii=False, indent=2)
+                    json.dump([{'text': s.text, 'start': s.start, 'duration': s.duration}
+                               for s in segments], f, ensure_ascii=False, indent=2)
                 
                 results[language] = 'Success'
-                logger.info(f"Downloaded {language} subtitles for video {video_id}")
+                origin = f" (translated from {translated_from})" if translated_from else ""
+                logger.info(f"Downloaded {language} subtitles for video {video_id}{origin}")
                 
             except Exception as e:
                 results[language] = f'Failed: {str(e)}'
@@ -195,14 +489,14 @@ def process_channel(youtube, channel_name, max_videos=50, languages=['es', 'en']
         for video in videos:
             try:
                 result = {
-                    'title': video['title'],
-                    'video_id': video['video_id'],
-                    'published_at': video['published_at'],
-                    'subtitles': download_subtitles(video['video_id'], languages)
+                    'title': video.title,
+                    'video_id': video.video_id,
+                    'published_at': video.date_str,
+                    'subtitles': download_subtitles(video.video_id, languages)
                 }
                 results.append(result)
             except Exception as e:
-                logger.error(f"Error processing video {video['video_id']}: {str(e)}")
+                logger.error(f"Error processing video {video.video_id}: {str(e)}")
         
         # Guardar resultados en un archivo JSON
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -256,37 +550,16 @@ def get_video_transcript(video_id):
     Returns:
         tuple: (texto completo, idioma) o (None, None) si falla
     """
-    try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        # Intentar con subtítulos manuales primero
-        try:
-            transcript = transcript_list.find_manually_created_transcript()
-        except:
-            # Si no hay subtítulos manuales, probar con cualquier idioma disponible
-            transcript = transcript_list.find_transcript(['en', 'es'])
-        
-        subtitles = transcript.fetch()
-        language = transcript.language
-        
-        # Obtener texto de cada entrada de subtítulos
-        subtitle_texts = [entry['text'] for entry in subtitles]
-        
-        # Limpiar cada segmento de texto
-        cleaned_texts = [clean_subtitle_text(text) for text in subtitle_texts]
-        
-        # Unir todos los segmentos de texto limpios con espacios
-        full_text = ' '.join(cleaned_texts).strip()
-        
-        logger.info(f"Successfully retrieved transcript for video {video_id} in {language}")
-        return full_text, language
-    
-    except Exception as e:
-        logger.error(f"Failed to get transcript for video {video_id}: {str(e)}")
+    transcript = fetch_transcript(video_id)
+    if transcript is None:
         return None, None
+    
+    logger.info(f"Successfully retrieved transcript for video {video_id} in {transcript.language}")
+    return transcript.text, transcript.language
 
 
-def process_youtube_channels(api_key, channel_names, max_videos=5, days_back=7):
+def process_youtube_channels(api_key, channel_names, max_videos=5, days_back=7, summarize=True,
+                             checkpoint=None):
     """
     Procesa videos de múltiples canales y los combina en un solo CSV.
     
@@ -295,19 +568,23 @@ def process_youtube_channels(api_key, channel_names, max_videos=5, days_back=7):
         channel_names (list): Lista de nombres de canales
         max_videos (int): Máximo de videos por canal
         days_back (int): Solo incluir videos de los últimos X días
+        summarize (bool): Resumir cada video aquí; False deja el resumen
+            para el llamador (p. ej. tras agrupar duplicados)
+        checkpoint (RunCheckpoint, optional): Guarda cada transcripción
+            obtenida y reutiliza las de un intento anterior de la ejecución
         
     Returns:
-        DataFrame o str: DataFrame con los datos o mensaje de error
+        list[Article]: Videos procesados (lista vacía si no hay datos o falla)
     """
     try:
         logger.info(f"Processing {len(channel_names)} channels: {', '.join(channel_names)}")
         
-        youtube = build_youtube_client(api_key)
+        youtube = get_youtube_client(api_key)
 
-        # Lista para almacenar datos de todos los canales
-        all_data = []
+        # Videos candidatos de todos los canales
+        candidates = []
         
-        # Procesar cada canal
+        # Listar cada canal
         for channel_name in channel_names:
             try:
                 logger.info(f"Processing channel: {channel_name}")
@@ -320,51 +597,66 @@ def process_youtube_channels(api_key, channel_names, max_videos=5, days_back=7):
 
                 # Obtener videos de los últimos X días
                 videos = get_recent_videos(youtube, channel_id, max_videos, days_back)
+                # Descartar videos fuera de tema antes de descargar transcripciones
+                videos = filter_relevant(videos)
                 
                 if not videos:
                     logger.info(f"No videos found in the last 7 days for channel: {channel_name}")
                     continue
                 
-                # Procesar cada video
                 for video in videos:
+                    video.source = channel_name
+                candidates.extend(videos)
+            
+            except Exception as e:
+                logger.error(f"Error processing channel {channel_name}: {str(e)}")
+        
+        # Detalles de todos los candidatos en una petición por lotes; se
+        # descartan directos, shorts, etc. sin pedir su transcripción
+        candidates = screen_videos(youtube, candidates)
+        
+        # Transcripciones ya obtenidas por un intento anterior
+        done = checkpoint.completed_items('transcripts') if checkpoint else {}
+        if done:
+            logger.info(f"Reusing {len(done)} transcripts from checkpoint")
+        
+        # Lista para almacenar datos de todos los canales
+        all_data = []
+        
+        # Procesar cada video
+        for video in candidates:
+            try:
+                # Obtener transcripción
+                if video.link in done:
+                    full_text, language = done[video.link]['text'], done[video.link]['language']
+                else:
+                    full_text, language = get_video_transcript(video.video_id)
+                    # Solo se guardan las obtenidas: las fallidas se reintentan al reanudar
+                    if full_text and checkpoint:
+                        checkpoint.record_item('transcripts', video.link,
+                                               {'text': full_text, 'language': language})
+                
+                if full_text:
+                    # Generar resumen (descomentado cuando se implemente)
                     try:
-                        video_id = video['video_id']
-                        title = video['title']
-                        date = datetime.strptime(video['published_at'], '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%m-%d')
-                        video_url = f"https://www.youtube.com/watch?v={video_id}"
+                        if summarize:
+                            video.summary = "not summary yet"  # summarize_with_openai(full_text)
+                        video.content = full_text
+                        video.language = language
                         
-                        # Obtener transcripción
-                        full_text, language = get_video_transcript(video_id)
+                        # Añadir a la lista de datos con el nombre del canal
+                        all_data.append(video)
                         
-                        if full_text:
-                            # Generar resumen (descomentado cuando se implemente)
-                            try:
-                                summary = "not summary yet"  # summarize_with_openai(full_text)
-                                
-                                # Añadir a la lista de datos con el nombre del canal
-                                all_data.append({
-                                    'Title': title,
-                                    'Date': date,
-                                    'Link': video_url,
-                                    'Summary': summary,
-                                    'Source': channel_name,
-                                    'Language': language
-                                })
-                                
-                                logger.info(f"Successfully processed video: {title}")
-                            except Exception as e:
-                                logger.error(f"Error generating summary for video {video_id}: {str(e)}")
+                        logger.info(f"Successfully processed video: {video.title}")
                     except Exception as e:
-                        logger.error(f"Error processing video {video.get('video_id', 'unknown')}: {str(e)}")
-            
+                        logger.error(f"Error generating summary for video {video.video_id}: {str(e)}")
             except Exception as e:
-                logger.error(f"Error processing channel {channel_name}: {str(e)}")
+                logger.error(f"Error processing video {video.video_id or 'unknown'}: {str(e)}")
         
         # Si no se recopiló ningún dato
         if not all_data:
-            msg = "No videos found for any of the specified channels"
-            logger.warning(msg)
-            return msg
+            logger.warning("No videos found for any of the specified channels")
+            return []
                 
         # # Crear DataFrame y guardar como CSV
         # df = pd.DataFrame(all_data)
@@ -378,7 +670,6 @@ def process_youtube_channels(api_key, channel_names, max_videos=5, days_back=7):
         return all_data
         
     except Exception as e:
-        error_msg = f"Error processing multiple channels: {str(e)}"
-        logger.error(error_msg)
+        logger.error(f"Error processing multiple channels: {str(e)}")
         logger.error(traceback.format_exc())
-        return error_msg
+        return []
@@ -0,0 +1,28 @@
+"""
+Shared pytest setup: puts the project root on the path and, when the
+local config/config.py is absent (it holds credentials and is not
+committed), provides the settings the package reads at import time
+"""
+
+import os
+import sys
+import types
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+try:
+    import config.config  # noqa: F401
+except ImportError:
+    settings = types.ModuleType('config.config')
+    settings.AI_NEWS_URL = "https://www.artificialintelligence-news.com/"
+    settings.MIT_NEWS_URL = "https://news.mit.edu/topic/artificial-intelligence2"
+    settings.STANFORD_NEWS_URL = "https://news.stanford.edu/"
+    settings.YOUTUBE_API_KEY = None
+    settings.YOUTUBE_CHANNELS = []
+    settings.OPENAI_API_KEY = "test"
+    settings.EMAIL = "test@example.com"
+    settings.PASSWORD = "test"
+    import config
+    config.config = settings
+    sys.modules['config.config'] = settings
@@ -0,0 +1,71 @@
+from src import process_all_news as pipeline
+from src.checkpoint import RunCheckpoint
+from src.models import Article
+from src.sources import SOURCES
+
+SOURCE = SOURCES[0].name
+
+
+def _articles():
+    return [Article(title=f"Story {i}", link=f"https://example.com/{i}", source=SOURCE)
+            for i in range(3)]
+
+
+def test_run_ids_are_unique_within_a_second(tmp_path):
+    ids = {RunCheckpoint.create({}, root=str(tmp_path)).run_id for _ in range(20)}
+    assert len(ids) == 20
+
+
+def test_resume_retries_failed_download_and_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'fetch_contents_sync', None)
+    checkpoint = RunCheckpoint.create({'target_date': '2025-03-16'}, root=str(tmp_path))
+
+    # First attempt: the download of story 1 fails, the summary of story 2 fails
+    fetched = []
+
+    def flaky_content(spec, url):
+        fetched.append(url)
+        return '' if url.endswith('/1') else f"Body of {url}"
+
+    def flaky_summaries(texts, backend=None):
+        return ['' if text.endswith('/2') else f"Summary of {text}" for text in texts]
+
+    monkeypatch.setattr(pipeline, 'get_source_content', flaky_content)
+    monkeypatch.setattr(pipeline, 'summarize_texts', flaky_summaries)
+    articles = _articles()
+    pipeline.fetch_contents(articles, checkpoint)
+    pipeline.summarize_articles(articles, checkpoint)
+    assert [a.summary for a in articles] == [
+        "Summary of Body of https://example.com/0", '', '']
+
+    # Resume: only the failed items are attempted again
+    fetched.clear()
+    summarized = []
+
+    def working_summaries(texts, backend=None):
+        summarized.extend(texts)
+        return [f"Summary of {text}" for text in texts]
+
+    monkeypatch.setattr(pipeline, 'get_source_content', lambda spec, url: fetched.append(url)
+                        or f"Body of {url}")
+    monkeypatch.setattr(pipeline, 'summarize_texts', working_summaries)
+    resumed = RunCheckpoint.load(checkpoint.run_id, root=str(tmp_path))
+    articles = _articles()
+    pipeline.fetch_contents(articles, resumed)
+    pipeline.summarize_articles(articles, resumed)
+
+    assert fetched == ["https://example.com/1"]
+    assert summarized == ["Body of https://example.com/1", "Body of https://example.com/2"]
+    assert all(a.summary == f"Summary of Body of {a.link}" for a in articles)
+
+
+def test_stage_output_round_trips(tmp_path):
+    checkpoint = RunCheckpoint.create({'target_date': '2025-03-16'}, root=str(tmp_path))
+    articles = _articles()
+    articles[0].duplicates = [Article(title="Copy", link="https://other.example/0")]
+    checkpoint.mark_done('discovery', articles)
+
+    resumed = RunCheckpoint.load(checkpoint.run_id, root=str(tmp_path))
+    assert resumed.is_done('discovery') and not resumed.is_done('fetch')
+    assert resumed.params == {'target_date': '2025-03-16'}
+    assert resumed.load_articles('discovery') == articles
@@ -0,0 +1,59 @@
+from src import readability, scraper
+from src.sources import SourceSpec
+
+URL = 'https://blog.example.com/post'
+BODY = ' '.join(['Researchers released a new open model for long documents.'] * 10)
+OLD_LAYOUT = f'<html><body><div class="entry"><p>{BODY}</p></div></body></html>'
+NEW_LAYOUT = (f'<html><body><div class="entry"><p>Share this post</p></div>'
+              f'<article class="post-body"><p>{BODY}</p></article></body></html>')
+
+
+def _spec():
+    return SourceSpec(name='Example', url='https://blog.example.com/', listings=())
+
+
+def _fetch(monkeypatch, page):
+    """Serves ``page`` cut off after ``stop_after``, like the streaming reader."""
+    calls, archived = [], []
+
+    def stream_html(session, url, stop_after=None, **kwargs):
+        calls.append(stop_after)
+        if stop_after:
+            tag, cls = stop_after.split('.')
+            start = page.index(f'<{tag} class="{cls}"')
+            return page[:page.index(f'</{tag}>', start) + len(tag) + 3]
+        return page
+
+    monkeypatch.setattr(scraper, 'stream_html', stream_html)
+    monkeypatch.setattr(scraper, 'archive_raw', lambda source, url, page: archived.append(page))
+    return calls, archived
+
+
+def test_learned_hint_stops_download(tmp_path, monkeypatch):
+    monkeypatch.setattr(readability, 'hints', readability.HintCache(str(tmp_path / 'hints.json')))
+    readability.hints.set('blog.example.com', 'div.entry')
+    calls, archived = _fetch(monkeypatch, OLD_LAYOUT)
+
+    assert scraper.get_source_content(_spec(), URL) == BODY
+    assert calls == ['div.entry']
+    assert readability.hints.get('blog.example.com') == 'div.entry'
+
+
+def test_stale_hint_refetches_full_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(readability, 'hints', readability.HintCache(str(tmp_path / 'hints.json')))
+    readability.hints.set('blog.example.com', 'div.entry')
+    calls, archived = _fetch(monkeypatch, NEW_LAYOUT)
+
+    assert scraper.get_source_content(_spec(), URL) == BODY
+    assert calls == ['div.entry', None]
+    assert archived == [NEW_LAYOUT]
+    assert readability.hints.get('blog.example.com') == 'article.post-body'
+
+
+def test_no_refetch_without_hint(tmp_path, monkeypatch):
+    monkeypatch.setattr(readability, 'hints', readability.HintCache(str(tmp_path / 'hints.json')))
+    calls, archived = _fetch(monkeypatch, '<html><body><p>Too short</p></body></html>')
+
+    assert scraper.get_source_content(_spec(), URL) == ""
+    assert calls == [None]
+    assert len(archived) == 1
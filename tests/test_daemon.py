@@ -0,0 +1,96 @@
+import threading
+from datetime import date
+
+from src import async_fetcher, daemon
+from src.models import Article
+from src.sources import SOURCES
+
+STORY = ("The lab released a new open model that beats larger systems on reasoning "
+         "benchmarks while running on a single consumer graphics card, researchers said. ") * 5
+
+
+def test_persistent_fetcher_reuses_one_client_across_polls(monkeypatch):
+    clients = set()
+
+    async def fake_content(self, spec, url):
+        clients.add(id(self._client))
+        return f"Body of {url}"
+
+    monkeypatch.setattr(async_fetcher.AsyncFetcher, 'get_source_content', fake_content)
+    fetcher = async_fetcher.PersistentFetcher()
+    try:
+        results = []
+        # Scheduled polls may run on different threads
+        for i in range(2):
+            thread = threading.Thread(target=lambda i=i: results.append(
+                fetcher.fetch_contents([(SOURCES[0], f"https://example.com/{i}")])))
+            thread.start()
+            thread.join()
+    finally:
+        fetcher.close()
+    assert results == [["Body of https://example.com/0"], ["Body of https://example.com/1"]]
+    assert len(clients) == 1
+
+
+def test_failed_transcripts_are_retried_up_to_the_limit(monkeypatch):
+    video = Article(title="Talk", link="https://www.youtube.com/watch?v=abc", date=date.today(),
+                    video_id="abc")
+    calls = []
+
+    def failing_transcript(video_id):
+        calls.append(video_id)
+        raise RuntimeError("transcript service down")
+
+    monkeypatch.setattr(daemon, 'YOUTUBE_API_KEY', 'key')
+    monkeypatch.setattr(daemon, 'YOUTUBE_CHANNELS', ['Channel'])
+    monkeypatch.setattr(daemon, 'get_youtube_client', lambda key: object())
+    monkeypatch.setattr(daemon, 'get_channel_id', lambda youtube, name: 'UC1')
+    monkeypatch.setattr(daemon, 'get_recent_videos', lambda youtube, channel_id, n: [
+        Article(title=video.title, link=video.link, date=video.date, video_id=video.video_id)])
+    monkeypatch.setattr(daemon, 'filter_relevant', lambda videos: videos)
+    monkeypatch.setattr(daemon, 'screen_videos', lambda youtube, videos: videos)
+    monkeypatch.setattr(daemon, 'get_video_transcript', failing_transcript)
+
+    news = daemon.NewsDaemon([])
+    for _ in range(daemon.TRANSCRIPT_MAX_ATTEMPTS + 2):
+        assert news._new_videos(date(2000, 1, 1)) == []
+    assert len(calls) == daemon.TRANSCRIPT_MAX_ATTEMPTS
+    assert video.link in news.seen
+
+
+def test_each_story_is_summarized_once(monkeypatch):
+    stored = Article(title="Stored", link="https://a.example/stored", source="A",
+                     content="Older story about a chip export rule. " * 20, summary="Stored summary")
+    new = [
+        Article(title="Model A", link="https://a.example/1", source="A", content=STORY),
+        Article(title="Model B", link="https://b.example/1", source="B", content=STORY + "Extra."),
+        Article(title="Chips", link="https://b.example/2", source="B",
+                content="Older story about a chip export rule. " * 20),
+    ]
+    summarized = []
+
+    def fake_summarize(articles):
+        summarized.extend(a.link for a in articles)
+        for article in articles:
+            article.summary = f"Summary of {article.title}"
+
+    monkeypatch.setattr(daemon, 'load_articles', lambda start, end: [stored])
+    monkeypatch.setattr(daemon, 'summarize_articles', fake_summarize)
+    daemon.NewsDaemon([])._summarize_stories(new, date(2025, 3, 9), date(2025, 3, 16))
+
+    assert summarized == ["https://b.example/1"]
+    assert [a.summary for a in new] == ["Summary of Model B", "Summary of Model B", "Stored summary"]
+
+
+def test_failed_initial_poll_does_not_stop_the_daemon(monkeypatch):
+    started = []
+
+    def failing_poll(self):
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(daemon, 'PersistentFetcher', None)
+    monkeypatch.setattr(daemon.NewsDaemon, 'load_seen', lambda self: None)
+    monkeypatch.setattr(daemon.NewsDaemon, 'poll', failing_poll)
+    monkeypatch.setattr(daemon.BlockingScheduler, 'start', lambda self: started.append(True))
+    daemon.run_daemon([])
+    assert started == [True]
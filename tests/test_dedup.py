@@ -0,0 +1,37 @@
+from datetime import date
+
+from src.dedup import find_duplicate_groups, collapse_duplicates
+from src.models import Article
+
+STORY = ("OpenAI released a new reasoning model on Tuesday that scores higher on math "
+         "and coding benchmarks while costing less per token than the previous release, "
+         "and the company said it will be available to developers through the API this week")
+OTHER = ("Stanford researchers published a study of how hospitals use machine learning to "
+         "triage emergency patients, finding large differences between sites in how the "
+         "models were validated before they were deployed")
+
+
+def test_near_duplicates_are_grouped():
+    reworded = STORY.replace('on Tuesday', 'on Tuesday morning') + ', a spokesperson said'
+    groups = find_duplicate_groups([STORY, OTHER, reworded])
+    assert sorted(sorted(g) for g in groups) == [[0, 2], [1]]
+
+
+def test_distinct_texts_stay_apart():
+    assert find_duplicate_groups([]) == []
+    assert sorted(find_duplicate_groups([STORY, OTHER])) == [[0], [1]]
+
+
+def test_collapse_keeps_longest_and_attaches_others():
+    short = Article(title='Short', link='https://a.example/1', date=date(2025, 3, 10),
+                    source='AI News', content=STORY)
+    other = Article(title='Other', link='https://b.example/2', date=date(2025, 3, 10),
+                    source='Stanford News', content=OTHER)
+    longer = Article(title='Longer', link='https://c.example/3', date=date(2025, 3, 11),
+                     source='MIT News', content=STORY + ', according to the announcement')
+
+    stories = collapse_duplicates([short, other, longer])
+
+    assert stories == [longer, other]
+    assert longer.duplicates == [short]
+    assert other.duplicates == []
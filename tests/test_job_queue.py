@@ -0,0 +1,134 @@
+import pytest
+
+from src import distributed, job_queue
+from src.job_queue import SQLiteQueue, MemoryQueue, QUEUED, LEASED, DONE, FAILED, RETRY_BACKOFF
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(job_queue.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def queue(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteQueue(str(tmp_path / 'jobs.db'))
+    return MemoryQueue()
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue('run', 'fetch', 'https://example.com/a', {'n': 1})
+    assert not queue.enqueue('run', 'fetch', 'https://example.com/a', {'n': 2})
+    assert queue.enqueue('other-run', 'fetch', 'https://example.com/a', {'n': 3})
+    job = queue.lease()
+    assert job.payload == {'n': 1}
+    assert queue.counts('run') == {LEASED: 1}
+
+
+def test_lease_filters_by_kind(queue):
+    queue.enqueue('run', 'fetch', 'a', {})
+    queue.enqueue('run', 'summarize', 'b', {})
+    assert queue.lease(kinds=['summarize']).key == 'b'
+    assert queue.lease(kinds=['summarize']) is None
+
+
+def test_expired_lease_is_handed_out_again(queue, clock):
+    queue.enqueue('run', 'fetch', 'a', {})
+    first = queue.lease(lease_seconds=10)
+    assert queue.lease(lease_seconds=10) is None
+
+    clock[0] += 11
+    second = queue.lease(lease_seconds=10)
+    assert second.key == 'a'
+    assert second.attempts == 2
+    assert second.token != first.token
+    assert not queue.extend(first)
+    assert queue.extend(second)
+
+
+def test_failed_job_retries_with_backoff_then_fails(queue, clock):
+    queue.enqueue('run', 'fetch', 'a', {}, max_attempts=3)
+    for attempt in (1, 2):
+        job = queue.lease()
+        assert job.attempts == attempt
+        queue.fail(job, 'boom')
+        assert queue.counts('run') == {QUEUED: 1}
+        backoff = RETRY_BACKOFF * 2 ** (attempt - 1)
+        clock[0] += backoff - 1
+        assert queue.lease() is None
+        clock[0] += 1
+
+    job = queue.lease()
+    assert job.attempts == 3
+    queue.fail(job, 'boom')
+    assert queue.counts('run') == {FAILED: 1}
+    clock[0] += 3600
+    assert queue.lease() is None
+
+
+def test_last_attempt_with_expired_lease_fails(queue, clock):
+    queue.enqueue('run', 'fetch', 'a', {}, max_attempts=1)
+    queue.lease(lease_seconds=10)
+    clock[0] += 11
+    assert queue.lease() is None
+    assert queue.counts('run') == {FAILED: 1}
+
+
+def test_complete_after_lost_lease_keeps_first_result(queue, clock):
+    queue.enqueue('run', 'fetch', 'a', {})
+    stale = queue.lease(lease_seconds=10)
+    clock[0] += 11
+    current = queue.lease(lease_seconds=10)
+
+    assert queue.complete(current, {'by': 'current'})
+    assert not queue.complete(stale, {'by': 'stale'})
+    # A late failure report from the stale worker changes nothing either
+    queue.fail(stale, 'timeout')
+    assert queue.counts('run') == {DONE: 1}
+    assert queue.results('run', 'fetch') == {'a': {'by': 'current'}}
+
+
+def test_run_params_are_saved_once(queue):
+    assert queue.run_params('run') is None
+    assert queue.save_run('run', {'target_date': '2025-03-16'})
+    assert not queue.save_run('run', {'target_date': '2025-03-23'})
+    assert queue.run_params('run') == {'target_date': '2025-03-16'}
+
+
+def test_resumed_coordinator_uses_the_saved_target_date(monkeypatch):
+    queue = MemoryQueue()
+    queue.save_run('r1', {'target_date': '2025-03-09'})
+    weeks = []
+
+    def stop_after_week_range(target_date):
+        weeks.append(target_date)
+        raise RuntimeError('stop')
+
+    monkeypatch.setattr(distributed, 'week_range', stop_after_week_range)
+    with pytest.raises(RuntimeError):
+        distributed.run_coordinator(queue, ['to@example.com'], '2025-03-16', run_id='r1')
+    assert weeks == ['2025-03-09']
+
+    with pytest.raises(ValueError):
+        distributed.run_coordinator(queue, ['to@example.com'], '2025-03-16', run_id='unknown')
+
+
+def test_coordinators_started_together_get_distinct_runs(monkeypatch):
+    queue = MemoryQueue()
+    saved = []
+    save_run = queue.save_run
+    monkeypatch.setattr(queue, 'save_run', lambda run_id, params: saved.append(run_id)
+                        or save_run(run_id, params))
+
+    def stop(target_date):
+        raise RuntimeError('stop')
+
+    monkeypatch.setattr(distributed.time, 'time', lambda: 1742100000.0)
+    monkeypatch.setattr(distributed, 'week_range', stop)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            distributed.run_coordinator(queue, ['to@example.com'], '2025-03-16')
+    assert len(set(saved)) == 2
+    assert all(queue.run_params(run_id) for run_id in saved)
@@ -0,0 +1,74 @@
+import json
+import os
+
+from src.openai_batch import MockBatchClient, summarize_with_batch_api, read_results
+
+TEXTS = [
+    "Researchers released an open model for code generation. It runs on one GPU.",
+    "FAIL: a regulator opened an inquiry into data centre power use.",
+    "A robotics startup raised a new funding round to build warehouse robots.",
+]
+
+
+def _responder(body):
+    text = body['messages'][-1]['content']
+    if 'FAIL:' in text:
+        raise RuntimeError("model overloaded")
+    return "summary: " + text.rsplit(': ', 1)[-1][:30]
+
+
+def _run(client, batch_dir, **kwargs):
+    return summarize_with_batch_api(TEXTS, client=client, batch_dir=str(batch_dir),
+                                    poll_seconds=0, **kwargs)
+
+
+def test_submit_poll_and_partial_results(tmp_path):
+    client = MockBatchClient(responder=_responder, polls_to_complete=3)
+    summaries = _run(client, tmp_path)
+
+    assert summaries[0].startswith("summary: ")
+    assert summaries[1] == ""  # listed in the error file
+    assert summaries[2].startswith("summary: ")
+    assert len(client.batches._batches) == 1
+    # Request file and manifest are removed once results are merged
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_results_skips_errors(tmp_path):
+    client = MockBatchClient(responder=_responder, polls_to_complete=1)
+    path = tmp_path / 'in.jsonl'
+    path.write_text(''.join(json.dumps({
+        'custom_id': f"id{i}", 'method': 'POST', 'url': '/v1/chat/completions',
+        'body': {'model': 'm', 'messages': [{'role': 'user', 'content': text}]}}) + '\n'
+        for i, text in enumerate(TEXTS)))
+    with open(path, 'rb') as f:
+        input_file = client.files.create(file=f, purpose='batch')
+    batch = client.batches.create(input_file.id, '/v1/chat/completions', '24h')
+    batch = client.batches.retrieve(batch.id)
+
+    assert batch.status == 'completed'
+    assert batch.request_counts.failed == 1
+    assert sorted(read_results(client, batch)) == ['id0', 'id2']
+
+
+def test_unfinished_batch_is_resumed_not_resubmitted(tmp_path):
+    client = MockBatchClient(responder=_responder, polls_to_complete=3)
+
+    # Gives up before the batch completes: the manifest is kept
+    assert _run(client, tmp_path, max_wait=0) == ["", "", ""]
+    manifests = [n for n in os.listdir(tmp_path) if n.endswith('.json')]
+    assert len(manifests) == 1
+
+    summaries = _run(client, tmp_path)
+    assert len(client.batches._batches) == 1
+    assert summaries[0] and summaries[2] and not summaries[1]
+
+
+def test_manifest_from_another_mock_is_resubmitted(tmp_path):
+    _run(MockBatchClient(responder=_responder, polls_to_complete=3), tmp_path, max_wait=0)
+
+    # A later process has a fresh mock that never saw the first batch
+    client = MockBatchClient(responder=_responder)
+    summaries = _run(client, tmp_path)
+    assert len(client.batches._batches) == 1
+    assert summaries[0] and summaries[2]
@@ -0,0 +1,266 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src import async_fetcher, politeness, streaming
+from src.politeness import HostScheduler, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, chunks=(), text='', headers=None, on_chunk=None,
+                 error=None):
+        self.status_code = status_code
+        self.headers = headers or {'Content-Type': 'text/html; charset=utf-8'}
+        self.text = text
+        self._chunks = chunks
+        self._on_chunk = on_chunk
+        self._error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise politeness.requests.HTTPError(str(self.status_code))
+
+    def iter_content(self, size):
+        for chunk in self._chunks:
+            if self._on_chunk:
+                self._on_chunk()
+            yield chunk
+        if self._error:
+            raise self._error
+
+
+def test_robots_fetched_once_for_concurrent_async_requests(monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        time.sleep(0.05)
+        return FakeResponse(text="User-agent: *\nCrawl-delay: 0\n")
+
+    monkeypatch.setattr(politeness.requests, 'get', fake_get)
+    scheduler = HostScheduler(initial_limit=16)
+
+    async def request(i):
+        async with scheduler.async_slot(f"https://example.com/{i}") as slot:
+            slot.record(200)
+
+    async def main():
+        await asyncio.gather(*(request(i) for i in range(10)))
+
+    asyncio.run(main())
+    assert calls == ["https://example.com/robots.txt"]
+
+
+def test_sync_slot_held_while_body_streams(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False)
+    monkeypatch.setattr(streaming, 'scheduler', scheduler)
+    in_flight = []
+
+    def on_chunk():
+        in_flight.append(scheduler.stats()['example.com']['in_flight'])
+
+    class Session:
+        def get(self, url, **kwargs):
+            return FakeResponse(chunks=[b'<html><body><p>', b'hello</p></body></html>'],
+                                on_chunk=on_chunk)
+
+    html = streaming.stream_html(Session(), "https://example.com/a")
+    assert 'hello' in html
+    assert in_flight == [1, 1]
+    assert scheduler.stats()['example.com']['in_flight'] == 0
+
+
+def _finish(scheduler, url, status=200, error=False, latency=0.1):
+    host = scheduler.acquire(url)
+    slot = politeness.RequestSlot()
+    slot.record(status, error=error)
+    scheduler.release(host, latency, slot)
+
+
+def test_aimd_increases_on_success_and_halves_on_throttle():
+    scheduler = HostScheduler(initial_limit=2, max_limit=16, respect_robots=False)
+    url = "https://example.com/"
+    for _ in range(4):
+        _finish(scheduler, url)
+    grown = scheduler.stats()['example.com']['limit']
+    assert grown > 2
+
+    host = scheduler.acquire(url)
+    slot = politeness.RequestSlot()
+    slot.record(429, retry_after=0)
+    scheduler.release(host, 0.1, slot)
+    assert scheduler.stats()['example.com']['limit'] == pytest.approx(grown / 2, abs=0.01)
+
+
+def test_aimd_holds_limit_when_latency_doubles():
+    scheduler = HostScheduler(initial_limit=2, respect_robots=False)
+    url = "https://example.com/"
+    _finish(scheduler, url, latency=0.1)
+    before = scheduler.stats()['example.com']['limit']
+    for _ in range(20):
+        _finish(scheduler, url, latency=1.0)
+    after = scheduler.stats()['example.com']['limit']
+    # Only the first slow samples (while the EWMA catches up) may still grow it
+    assert after - before < 1.0
+
+
+def test_circuit_breaker_opens_half_opens_and_closes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(politeness.time, 'monotonic', lambda: clock[0])
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=3, breaker_cooldown=60)
+    url = "https://down.example/"
+
+    for _ in range(3):
+        _finish(scheduler, url, status=None, error=True)
+        clock[0] += 10  # past any backoff pause
+    assert scheduler.stats()['down.example']['circuit'] == OPEN
+    with pytest.raises(CircuitOpenError):
+        scheduler.acquire(url)
+
+    clock[0] += 60
+    host = scheduler.acquire(url)
+    assert scheduler.stats()['down.example']['circuit'] == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        scheduler.try_acquire(url)  # only the probe may be in flight
+    slot = politeness.RequestSlot()
+    slot.record(200)
+    scheduler.release(host, 0.1, slot)
+    assert scheduler.stats()['down.example']['circuit'] == CLOSED
+
+
+def test_client_errors_do_not_count_toward_the_breaker():
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=2)
+    for _ in range(5):
+        _finish(scheduler, "https://example.com/missing", status=404)
+    assert scheduler.stats()['example.com']['circuit'] == CLOSED
+
+
+def test_body_read_failure_after_200_counts_toward_the_breaker(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=2, breaker_cooldown=60)
+    monkeypatch.setattr(streaming, 'scheduler', scheduler)
+
+    class Session:
+        def get(self, url, **kwargs):
+            return FakeResponse(chunks=[b'<html><body><p>'],
+                                error=politeness.requests.exceptions.ChunkedEncodingError('reset'))
+
+    for _ in range(2):
+        with pytest.raises(politeness.requests.RequestException):
+            streaming.stream_html(Session(), "https://stalls.example/a")
+        scheduler._hosts['stalls.example'].next_allowed = 0  # skip the backoff pause
+    stats = scheduler.stats()['stalls.example']
+    assert stats['circuit'] == OPEN
+    assert stats['limit'] < 2
+
+
+def test_async_body_read_failure_after_200_counts_toward_the_breaker(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=2, breaker_cooldown=60)
+    monkeypatch.setattr(async_fetcher, 'scheduler', scheduler)
+
+    class StalledBody(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'<html><body><p>'
+            raise httpx.ReadTimeout('stalled')
+
+    def handler(request):
+        return httpx.Response(200, headers={'Content-Type': 'text/html'}, stream=StalledBody())
+
+    async def main():
+        async with _mock_fetcher(handler) as fetcher:
+            for _ in range(2):
+                with pytest.raises(httpx.ReadTimeout):
+                    await fetcher.stream_html("https://stalls.example/a")
+                scheduler._hosts['stalls.example'].next_allowed = 0
+
+    asyncio.run(main())
+    assert scheduler.stats()['stalls.example']['circuit'] == OPEN
+
+
+def test_rejected_download_is_not_a_host_failure(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=1)
+    monkeypatch.setattr(streaming, 'scheduler', scheduler)
+
+    class Session:
+        def get(self, url, **kwargs):
+            return FakeResponse(headers={'Content-Type': 'application/pdf'})
+
+    with pytest.raises(streaming.DownloadRejected):
+        streaming.stream_html(Session(), "https://example.com/paper.pdf")
+    assert scheduler.stats()['example.com']['circuit'] == CLOSED
+
+
+def _mock_fetcher(handler, **kwargs):
+    fetcher = async_fetcher.AsyncFetcher(**kwargs)
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+def test_deadline_cancel_counts_as_failure(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=1, breaker_cooldown=60)
+    monkeypatch.setattr(async_fetcher, 'scheduler', scheduler)
+
+    class SlowBody(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'<html><body><p>'
+            await asyncio.sleep(10)
+
+    def handler(request):
+        return httpx.Response(200, headers={'Content-Type': 'text/html'}, stream=SlowBody())
+
+    async def main():
+        async with _mock_fetcher(handler) as fetcher:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(fetcher.stream_html("https://slow.example/a"), 0.1)
+
+    asyncio.run(main())
+    assert scheduler.stats()['slow.example']['circuit'] == OPEN
+
+
+def test_waiting_on_a_busy_host_does_not_hold_global_permits(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, initial_limit=1)
+    monkeypatch.setattr(async_fetcher, 'scheduler', scheduler)
+    scheduler.try_acquire("https://busy.example/")  # the host's only slot stays taken
+
+    def handler(request):
+        return httpx.Response(200, headers={'Content-Type': 'text/html'}, content=b'<p>ok</p>')
+
+    async def main():
+        async with _mock_fetcher(handler, max_concurrency=1) as fetcher:
+            blocked = asyncio.ensure_future(fetcher.stream_html("https://busy.example/a"))
+            await asyncio.sleep(0.1)
+            page = await asyncio.wait_for(fetcher.stream_html("https://free.example/a"), 1)
+            blocked.cancel()
+            return page
+
+    assert 'ok' in asyncio.run(main())
+
+
+def test_crawl_delay_refreshed_when_robots_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(politeness.time, 'time', lambda: clock[0])
+    bodies = ["User-agent: *\nDisallow:\n", "User-agent: *\nCrawl-delay: 3\n"]
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return FakeResponse(text=bodies[len(calls) - 1])
+
+    monkeypatch.setattr(politeness.requests, 'get', fake_get)
+    scheduler = HostScheduler()
+    _finish(scheduler, "https://example.com/a")
+    _finish(scheduler, "https://example.com/b")
+    assert len(calls) == 1
+    assert scheduler.stats()['example.com']['crawl_delay'] == 0
+
+    clock[0] += politeness._ROBOTS_TTL
+    _finish(scheduler, "https://example.com/c")
+    assert len(calls) == 2
+    assert scheduler.stats()['example.com']['crawl_delay'] == 3
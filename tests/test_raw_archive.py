@@ -0,0 +1,79 @@
+import json
+import threading
+from datetime import date
+
+import pytest
+
+pytest.importorskip('zstandard')
+
+from src import raw_archive
+from src.models import Article, Transcript, TranscriptSegment
+from src.raw_archive import RawArchive, HTML, TRANSCRIPT
+from src.search_index import index_articles, load_articles
+
+
+def test_latest_record_wins(tmp_path):
+    archive = RawArchive(str(tmp_path))
+    archive.put('MIT News', 'https://news.mit.edu/a', '<p>first</p>')
+    archive.put('MIT News', 'https://news.mit.edu/a', '<p>second</p>')
+    archive.put('MIT News', 'abc123', '{"segments": []}', TRANSCRIPT)
+
+    assert archive.get('MIT News', 'https://news.mit.edu/a') == '<p>second</p>'
+    assert archive.get('MIT News', 'missing') is None
+    assert [e['key'] for e in archive.records('MIT News', HTML)] == ['https://news.mit.edu/a']
+    assert archive.stats()['mit-news']['records'] == 2
+    archive.close()
+
+
+def test_other_process_appends_are_visible(tmp_path):
+    reader, writer = RawArchive(str(tmp_path)), RawArchive(str(tmp_path))
+    assert reader.records('AI News') == []
+    writer.put('AI News', 'https://artificialintelligence-news.com/x', '<p>body</p>')
+
+    assert reader.get('AI News', 'https://artificialintelligence-news.com/x') == '<p>body</p>'
+    assert len(reader.records('AI News')) == 1
+    reader.close()
+    writer.close()
+
+
+def test_concurrent_puts_and_reads(tmp_path):
+    archive = RawArchive(str(tmp_path))
+    errors = []
+
+    def work(n):
+        try:
+            for i in range(20):
+                archive.put(f"Source {n % 2}", f"https://example.com/{n}/{i}", f"<p>{n} {i}</p>")
+                archive.records(f"Source {n % 2}")
+                archive.stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert {slug: info['records'] for slug, info in archive.stats().items()} == \
+        {'source-0': 60, 'source-1': 60}
+    assert archive.get('Source 1', 'https://example.com/5/19') == '<p>5 19</p>'
+    archive.close()
+
+
+def test_reextract_rebuilds_indexed_transcripts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = Article(title='Talk', link='https://www.youtube.com/watch?v=abc123XYZ_-',
+                    date=date(2025, 3, 12), source='Some Channel', content='stale')
+    index_articles([video])
+    transcript = Transcript(video_id='abc123XYZ_-', language='English', language_code='en',
+                            is_generated=False,
+                            segments=[TranscriptSegment('Hello and welcome.', 0.0, 1.5),
+                                      TranscriptSegment('Today: sparse attention.', 1.5, 2.0)])
+    archive = RawArchive('raw')
+    archive.put('youtube', 'abc123XYZ_-', json.dumps(transcript.to_dict()), TRANSCRIPT)
+    archive.close()
+
+    assert raw_archive.main(['--root', 'raw', 'reextract', '--since', '2025-03-10']) == 0
+    assert [a.content for a in load_articles()] == [transcript.text]
@@ -0,0 +1,38 @@
+import logging
+
+from scipy import sparse
+
+from src import relevance
+from src.models import Article
+
+
+def _articles():
+    return [Article(title="New language model beats GPT on reasoning benchmarks", link="a"),
+            Article(title="Cooking pasta at home", link="b"),
+            Article(title="Robot dance #shorts", link="c")]
+
+
+def test_term_matrix_is_sparse_counts():
+    matrix = relevance._term_matrix(["model model robot", ""])
+    assert sparse.issparse(matrix)
+    assert matrix.nnz == 2
+    assert sorted(matrix.data.tolist()) == [1.0, 2.0]
+
+
+def test_scores_favour_on_topic_text():
+    scores = relevance.score_texts(["machine learning model training", "pasta recipe tomato"])
+    assert scores[0] > 0.5
+    assert scores[1] == 0
+
+
+def test_default_threshold_keeps_everything_and_scores_it():
+    articles = _articles()
+    assert relevance.filter_relevant(articles) == articles
+    assert articles[0].relevance > articles[2].relevance > articles[1].relevance == 0
+
+
+def test_dropped_items_are_logged(caplog):
+    with caplog.at_level(logging.INFO, logger='ai_news_scraper.relevance'):
+        kept = relevance.filter_relevant(_articles(), min_score=0.05)
+    assert [a.link for a in kept] == ['a', 'c']
+    assert "Cooking pasta at home" in caplog.text
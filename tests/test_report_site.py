@@ -0,0 +1,76 @@
+import json
+import os
+from datetime import date
+
+from src import report_site
+from src.models import Article
+from src.report_site import update_site, build_site
+
+
+def _article(n, source='MIT News'):
+    return Article(title=f"Story {n}", link=f"https://example.com/{n}", date=date(2025, 3, 10),
+                   source=source, summary=f"Summary {n}", content='not published')
+
+
+def _page(root, relpath):
+    with open(os.path.join(root, relpath), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_only_changed_pages_are_rendered(tmp_path):
+    root = str(tmp_path)
+    first = update_site([_article(1)], '2025-03-10 to 2025-03-16', date(2025, 3, 16), root)
+    assert first == {'rendered': 4, 'unchanged': 0, 'removed': 0}
+    assert os.path.exists(os.path.join(root, 'weeks/2025-03-16/index.html.gz'))
+    assert 'not published' not in _page(root, '_data/2025-03-16.json')
+
+    assert build_site(root) == {'rendered': 0, 'unchanged': 4, 'removed': 0}
+
+    # A new week re-renders the index and the source archive, not the old week
+    second = update_site([_article(2)], '2025-03-17 to 2025-03-23', date(2025, 3, 23), root)
+    assert second == {'rendered': 4, 'unchanged': 2, 'removed': 0}
+
+    # A source leaving a week removes its week page
+    third = update_site([_article(3, 'AI News')], '2025-03-17 to 2025-03-23', date(2025, 3, 23), root)
+    assert third['removed'] == 1
+    assert not os.path.exists(os.path.join(root, 'weeks/2025-03-23/mit-news.html'))
+
+
+def test_colliding_source_names_get_their_own_pages(tmp_path):
+    root = str(tmp_path)
+    update_site([_article(1, 'AI News')], '2025-03-10 to 2025-03-16', date(2025, 3, 16), root)
+    assert os.path.exists(os.path.join(root, 'sources/ai-news.html'))
+
+    update_site([_article(1, 'AI News'), _article(2, 'AI-News')],
+                '2025-03-10 to 2025-03-16', date(2025, 3, 16), root)
+    pages = json.loads(_page(root, 'manifest.json'))['pages']
+    archives = sorted(p for p in pages if p.startswith('sources/'))
+    assert len(archives) == 2 and 'sources/ai-news.html' not in archives
+    assert not os.path.exists(os.path.join(root, 'sources/ai-news.html'))
+    for relpath in archives:
+        assert os.path.exists(os.path.join(root, relpath))
+    index = _page(root, 'index.html')
+    assert all(f'href="{p}"' in index for p in archives)
+    week = _page(root, 'weeks/2025-03-16/index.html')
+    assert all(f'href="{os.path.basename(p)}"' in week for p in archives)
+
+
+def test_old_stylesheets_are_removed(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    update_site([_article(1)], '2025-03-10 to 2025-03-16', date(2025, 3, 16), root)
+    old_css = json.loads(_page(root, 'manifest.json'))['css']
+
+    monkeypatch.setattr(report_site, 'STYLE', report_site.STYLE + '\nh2 { color: red; }')
+    stats = build_site(root)
+    new_css = json.loads(_page(root, 'manifest.json'))['css']
+    assert new_css != old_css and stats['rendered'] == 4
+    assert not os.path.exists(os.path.join(root, old_css))
+    assert new_css in _page(root, 'index.html')
+
+    # Also without a manifest to say which stylesheet was in use
+    monkeypatch.setattr(report_site, 'STYLE', report_site.STYLE + '\nh3 { color: blue; }')
+    os.remove(os.path.join(root, 'manifest.json'))
+    build_site(root)
+    css = json.loads(_page(root, 'manifest.json'))['css']
+    assert [n for n in os.listdir(os.path.join(root, 'assets')) if n.endswith('.css')] == \
+        [os.path.basename(css)]
@@ -0,0 +1,49 @@
+import time
+from datetime import date
+
+from src import run_budget
+from src.models import Article
+from src.run_budget import RunBudget, LLM, EXTRACTIVE, DEFERRED
+
+CONTENT = 'word ' * 4000
+
+
+def _articles(n):
+    return [Article(title=f"Story {i}", link=f"https://example.com/{i}", date=date(2025, 3, 10),
+                    source='MIT News', content=CONTENT) for i in range(n)]
+
+
+def test_paid_backend_degrades_past_the_token_budget():
+    budget = RunBudget(max_tokens=5000, backend='openai')
+    tiers = budget.plan(_articles(5))
+    assert tiers[LLM] and tiers[EXTRACTIVE]
+    budget.charge(LLM, tiers[LLM], 1.0)
+    assert 0 < budget.tokens_used <= 5000
+    assert budget.cost_used > 0
+
+
+def test_free_backend_spends_no_tokens_or_cost():
+    budget = RunBudget(max_tokens=5000, max_cost=0.01, backend='extractive')
+    tiers = budget.plan(_articles(5))
+    assert len(tiers[LLM]) == 5 and not tiers[EXTRACTIVE] and not tiers[DEFERRED]
+    budget.charge(LLM, tiers[LLM], 0.01)
+    assert budget.tokens_used == 0 and budget.cost_used == 0
+
+
+def test_free_backend_is_not_deferred_by_llm_time_estimates():
+    budget = RunBudget(deadline=time.monotonic() + 2, reserve_seconds=0, backend='extractive')
+    assert len(budget.plan(_articles(10))[LLM]) == 10
+
+
+def test_deferred_duplicates_are_cleared(tmp_path):
+    path = str(tmp_path / 'deferred.json')
+    carried, other = _articles(2)
+    run_budget.save_deferred([carried, other], path)
+
+    story = Article(title='Story', link='https://other.example/story', content=CONTENT,
+                    duplicates=[carried])
+    run_budget.clear_deferred([story], path)
+    assert [a.link for a in run_budget.load_deferred(path)] == [other.link]
+
+    run_budget.clear_deferred([other], path)
+    assert not (tmp_path / 'deferred.json').exists()
@@ -0,0 +1,76 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from src.models import Article
+from src.search_index import index_articles, search, load_articles, connect_index
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'index' / 'search.db')
+
+
+def _article(n, title, summary='', source='MIT News', day=10):
+    return Article(title=title, link=f"https://example.com/{n}", date=date(2025, 3, day),
+                   source=source, summary=summary, content=f"Body of story {n}")
+
+
+def _fts_rows(db_path):
+    conn = connect_index(db_path)
+    try:
+        return conn.execute("SELECT count(*) FROM items_fts").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_upsert_only_rewrites_changed_rows(db_path):
+    articles = [_article(1, 'Robots learn to fold laundry'), _article(2, 'New chip for inference')]
+    assert index_articles(articles, db_path) == 2
+    assert index_articles(articles, db_path) == 0
+
+    articles[0].summary = 'A household robot that folds towels'
+    assert index_articles(articles, db_path) == 1
+    assert _fts_rows(db_path) == 2
+    assert [r['link'] for r in search('towels', db_path=db_path)] == ['https://example.com/1']
+
+
+def test_triggers_keep_fts_in_sync(db_path):
+    index_articles([_article(1, 'Quantum error correction milestone')], db_path)
+    index_articles([_article(1, 'Protein folding with diffusion models')], db_path)
+
+    assert search('quantum', db_path=db_path) == []
+    assert len(search('protein', db_path=db_path)) == 1
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM items WHERE link = ?", ('https://example.com/1',))
+    conn.close()
+    assert search('protein', db_path=db_path) == []
+    assert _fts_rows(db_path) == 0
+
+
+def test_search_ranks_title_and_filters(db_path):
+    index_articles([
+        _article(1, 'Weekly roundup', summary='Also mentions transformers', day=10),
+        _article(2, 'Transformers for weather forecasting', source='AI News', day=12),
+        _article(3, 'Transformers in robotics', source='AI News', day=20),
+    ], db_path)
+
+    links = [r['link'] for r in search('transformers', db_path=db_path)]
+    assert links[-1] == 'https://example.com/1'
+    assert [r['link'] for r in search('transformers', sources=['AI News'],
+                                      end_date=date(2025, 3, 16), db_path=db_path)] == \
+        ['https://example.com/2']
+    assert '[' in search('weather', db_path=db_path)[0]['snippet']
+
+
+def test_load_articles_round_trip(db_path):
+    stored = [_article(1, 'First', summary='One', day=10), _article(2, 'Second', day=18)]
+    index_articles(stored, db_path)
+
+    loaded = load_articles(date(2025, 3, 10), date(2025, 3, 16), db_path)
+    assert [(a.link, a.date, a.summary, a.content) for a in loaded] == \
+        [('https://example.com/1', date(2025, 3, 10), 'One', 'Body of story 1')]
+    assert len(load_articles(db_path=db_path)) == 2
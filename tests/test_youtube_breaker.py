@@ -0,0 +1,61 @@
+import pytest
+import requests
+from youtube_transcript_api import VideoUnavailable, TranscriptsDisabled, YouTubeRequestFailed
+
+from src import youtube_scraper
+from src.politeness import HostScheduler, CLOSED, OPEN
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = HostScheduler(respect_robots=False, breaker_threshold=3, breaker_cooldown=60)
+    monkeypatch.setattr(youtube_scraper, 'scheduler', scheduler)
+    return scheduler
+
+
+def _circuit(scheduler):
+    return scheduler.stats()['www.youtube.com']['circuit']
+
+
+def _list_raising(monkeypatch, make_error):
+    def list_transcripts(video_id):
+        raise make_error(video_id)
+    monkeypatch.setattr(youtube_scraper.YouTubeTranscriptApi, 'list_transcripts', list_transcripts)
+
+
+def _http_failure(status):
+    def make_error(video_id):
+        response = requests.Response()
+        response.status_code = status
+        try:
+            raise requests.HTTPError(f"{status} error", response=response)
+        except requests.HTTPError as error:
+            # Raised while handling the HTTPError, as the library does
+            try:
+                raise YouTubeRequestFailed(error, video_id)
+            except YouTubeRequestFailed as wrapped:
+                return wrapped
+    return make_error
+
+
+@pytest.mark.parametrize('make_error', [VideoUnavailable, TranscriptsDisabled, _http_failure(403)])
+def test_video_errors_do_not_open_the_circuit(monkeypatch, scheduler, make_error):
+    _list_raising(monkeypatch, make_error)
+    for i in range(10):
+        assert youtube_scraper.fetch_transcript(f"video{i}") is None
+    assert _circuit(scheduler) == CLOSED
+
+
+@pytest.mark.parametrize('make_error', [
+    lambda video_id: requests.ConnectionError("connection reset"),
+    _http_failure(503),
+    _http_failure(429),
+])
+def test_host_errors_open_the_circuit(monkeypatch, scheduler, make_error):
+    _list_raising(monkeypatch, make_error)
+    clock = [1000.0]
+    monkeypatch.setattr('src.politeness.time.monotonic', lambda: clock[0])
+    for i in range(3):
+        assert youtube_scraper.fetch_transcript(f"video{i}") is None
+        clock[0] += 30  # past the backoff pause
+    assert _circuit(scheduler) == OPEN